@@ -0,0 +1,252 @@
+"""Reproducible, parallel ``bundle.zip`` builder.
+
+Members are handed to :class:`BundleBuilder` as the runner produces them and
+are compressed on a thread pool straight away (zlib releases the GIL), so by
+the time the evidence set is complete most of the compression work is done.
+:meth:`BundleBuilder.finish` then writes the archive in one sequential pass,
+hashing it as it goes: each member is written as soon as its compression is
+done and released straight after, so only the central-directory fields of
+written members stay in memory. Members read from disk at finish time are
+compressed at most a small window ahead of the writer, and compressed data
+larger than ``_SPOOL_LIMIT`` is spooled to a temporary file rather than held in
+memory.
+
+Reproducibility: members are written in the order given to ``finish`` (the
+runner passes ``sorted(out.rglob("*"))`` order), every member carries the same
+fixed timestamp and permissions, and the compressed bytes depend only on the
+member bytes and the compression policy, so the same evidence set and policy
+always produce the same archive bytes.
+
+Compression policy comes from the profile's ``evidence.bundle_compression``:
+
+- ``stored``: no compression (fastest; largest bundle)
+- ``fast``: deflate level 1
+- ``default``: zlib's default deflate level (used when the key is absent)
+- ``max``: deflate level 9
+
+Archives switch to ZIP64 records automatically when a member, the central
+directory or the member count exceeds the classic ZIP limits.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import struct
+import tempfile
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+# Fixed ZIP member timestamp (earliest representable) for reproducible bundles
+BUNDLE_MEMBER_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+MEMBER_MODE = 0o644
+
+COMPRESSION_LEVELS = {"stored": None, "fast": 1, "default": zlib.Z_DEFAULT_COMPRESSION, "max": 9}
+DEFAULT_COMPRESSION = "default"
+
+_ZIP64_LIMIT = 0xFFFFFFFF
+_ZIP_COUNT_LIMIT = 0xFFFF
+_STORED, _DEFLATED = 0, 8
+_CHUNK = 1 << 20
+_SPOOL_LIMIT = 8 << 20
+
+
+def bundle_compression(profile) -> str:
+    """The profile's ``evidence.bundle_compression`` policy, validated."""
+    policy = (profile.get("evidence") or {}).get("bundle_compression", DEFAULT_COMPRESSION)
+    if policy not in COMPRESSION_LEVELS:
+        raise SystemExit(f"evidence.bundle_compression must be one of {', '.join(COMPRESSION_LEVELS)} (got {policy!r})")
+    return policy
+
+
+def _dos_datetime(dt: tuple) -> tuple[int, int]:
+    year, month, day, hour, minute, second = dt
+    return (hour << 11) | (minute << 5) | (second // 2), ((year - 1980) << 9) | (month << 5) | day
+
+
+class _Member:
+    __slots__ = ("name", "crc", "size", "method", "data", "csize", "offset")
+
+    def __init__(self, name: str, crc: int, size: int, method: int, data, csize: int):
+        self.name, self.crc, self.size, self.method, self.data, self.csize = name, crc, size, method, data, csize
+        self.offset = 0
+
+
+def _compress(name: str, chunks, level: int | None) -> _Member:
+    crc, size = 0, 0
+    out = tempfile.SpooledTemporaryFile(max_size=_SPOOL_LIMIT)
+    comp = None if level is None else zlib.compressobj(level, zlib.DEFLATED, -15)
+    for chunk in chunks:
+        crc = zlib.crc32(chunk, crc)
+        size += len(chunk)
+        out.write(chunk if comp is None else comp.compress(chunk))
+    if comp is not None:
+        out.write(comp.flush())
+    csize = out.tell()
+    out.seek(0)
+    return _Member(name, crc, size, _STORED if comp is None else _DEFLATED, out, csize)
+
+
+def _release(future: Future) -> None:
+    if not future.cancelled() and future.exception() is None:
+        future.result().data.close()
+
+
+def _file_chunks(path: Path):
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            yield chunk
+
+
+class BundleBuilder:
+    """Collects bundle members as they are produced and writes a reproducible ZIP."""
+
+    def __init__(self, compression: str = DEFAULT_COMPRESSION, workers: int | None = None):
+        if compression not in COMPRESSION_LEVELS:
+            raise ValueError(f"unknown bundle compression policy: {compression}")
+        self.compression = compression
+        self._level = COMPRESSION_LEVELS[compression]
+        self._workers = workers or min(8, os.cpu_count() or 1)
+        self._pool = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="cts-bundle")
+        self._members: dict[str, Future] = {}
+        self._pending: deque[Future] = deque()
+
+    def _queue(self, name: str, chunks) -> None:
+        replaced = self._members.get(name)
+        self._members[name] = self._pool.submit(_compress, name, chunks, self._level)
+        if replaced is not None:
+            replaced.cancel()
+            replaced.add_done_callback(_release)
+
+    def add(self, name: str, data: bytes) -> None:
+        """Queue ``data`` for compression as member ``name``; the latest add for a name wins."""
+        self._queue(name, (memoryview(data)[i:i + _CHUNK] for i in range(0, len(data), _CHUNK)))
+
+    def add_file(self, name: str, path: Path) -> None:
+        self._queue(name, _file_chunks(path))
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._members
+
+    def finish(self, dest: Path, names: list[str], root: Path | None = None) -> tuple[str, int]:
+        """Write members ``names`` (in that order) to ``dest``; returns ``(sha256, size)``.
+
+        Names that were never added are read from ``root / name``.
+        """
+        if root is None:
+            for name in names:
+                if name not in self._members:
+                    raise ValueError(f"bundle member was never added: {name}")
+        try:
+            return _write_zip(Path(dest), self._in_order(names, root))
+        finally:
+            self.close()
+
+    def _in_order(self, names: list[str], root: Path | None):
+        """Yield compressed members in ``names`` order.
+
+        Members not added yet are submitted only when they come within
+        ``2 * workers`` of the writer, which bounds the compressed data waiting
+        to be written.
+        """
+        pending: deque[Future] = deque()
+        upcoming = iter(names)
+        self._pending = pending
+
+        def submit_next() -> None:
+            name = next(upcoming, None)
+            if name is not None:
+                future = self._members.pop(name, None)
+                if future is None:
+                    future = self._pool.submit(_compress, name, _file_chunks(Path(root) / name), self._level)
+                pending.append(future)
+
+        for _ in range(2 * self._workers):
+            submit_next()
+        while pending:
+            member = pending.popleft().result()
+            submit_next()
+            yield member
+
+    def close(self) -> None:
+        """Stop compressing and release every member that was not written."""
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        for future in [*self._members.values(), *self._pending]:
+            _release(future)
+        self._members.clear()
+        self._pending.clear()
+
+
+class _HashingFile:
+    def __init__(self, f):
+        self.f, self.h, self.size = f, hashlib.sha256(), 0
+
+    def write(self, b: bytes) -> None:
+        self.f.write(b)
+        self.h.update(b)
+        self.size += len(b)
+
+
+def _write_zip(dest: Path, members) -> tuple[str, int]:
+    """Write ``members`` (any iterable, consumed once) as a ZIP; returns ``(sha256, size)``."""
+    dos_time, dos_date = _dos_datetime(BUNDLE_MEMBER_DATE_TIME)
+    external_attr = MEMBER_MODE << 16
+    written: list[_Member] = []
+    with open(dest, "wb") as raw:
+        out = _HashingFile(raw)
+        for m in members:
+            m.offset = out.size
+            name = m.name.encode("utf-8")
+            flags = 0x800 if not m.name.isascii() else 0
+            zip64 = m.size >= _ZIP64_LIMIT or m.csize >= _ZIP64_LIMIT
+            extra = struct.pack("<HHQQ", 1, 16, m.size, m.csize) if zip64 else b""
+            out.write(struct.pack(
+                "<4s5H3L2H", b"PK\x03\x04", 45 if zip64 else 20, flags, m.method, dos_time, dos_date, m.crc,
+                _ZIP64_LIMIT if zip64 else m.csize, _ZIP64_LIMIT if zip64 else m.size, len(name), len(extra),
+            ))
+            out.write(name)
+            out.write(extra)
+            with m.data:
+                for chunk in iter(lambda: m.data.read(_CHUNK), b""):
+                    out.write(chunk)
+            m.data = None
+            written.append(m)
+
+        cd_offset = out.size
+        for m in written:
+            name = m.name.encode("utf-8")
+            flags = 0x800 if not m.name.isascii() else 0
+            fields = []
+            usize, csize, offset = m.size, m.csize, m.offset
+            if usize >= _ZIP64_LIMIT:
+                fields.append(usize)
+                usize = _ZIP64_LIMIT
+            if csize >= _ZIP64_LIMIT:
+                fields.append(csize)
+                csize = _ZIP64_LIMIT
+            if offset >= _ZIP64_LIMIT:
+                fields.append(offset)
+                offset = _ZIP64_LIMIT
+            extra = struct.pack(f"<HH{len(fields)}Q", 1, 8 * len(fields), *fields) if fields else b""
+            version = 45 if fields else 20
+            out.write(struct.pack(
+                "<4s4B4H3L5H2L", b"PK\x01\x02", version, 3, version, 0, flags, m.method, dos_time, dos_date,
+                m.crc, csize, usize, len(name), len(extra), 0, 0, 0, external_attr, offset,
+            ))
+            out.write(name)
+            out.write(extra)
+
+        cd_size = out.size - cd_offset
+        count = len(written)
+        if count > _ZIP_COUNT_LIMIT or cd_offset >= _ZIP64_LIMIT or cd_size >= _ZIP64_LIMIT:
+            eocd64_offset = out.size
+            out.write(struct.pack("<4sQ2H2L4Q", b"PK\x06\x06", 44, 45, 45, 0, 0, count, count, cd_size, cd_offset))
+            out.write(struct.pack("<4sLQL", b"PK\x06\x07", 0, eocd64_offset, 1))
+            out.write(struct.pack("<4s4H2LH", b"PK\x05\x06", 0, 0, min(count, _ZIP_COUNT_LIMIT),
+                                  min(count, _ZIP_COUNT_LIMIT), min(cd_size, _ZIP64_LIMIT),
+                                  min(cd_offset, _ZIP64_LIMIT), 0))
+        else:
+            out.write(struct.pack("<4s4H2LH", b"PK\x05\x06", 0, 0, count, count, cd_size, cd_offset, 0))
+    return out.h.hexdigest(), out.size
@@ -0,0 +1,106 @@
+"""Streaming canonical JSON encoding and hashing.
+
+The canonical form is compact JSON with lexicographically sorted object keys
+and UTF-8 text (``json.dumps(value, sort_keys=True, separators=(",", ":"),
+ensure_ascii=False)``), as recorded in the replay determinism policy. It is
+*not* RFC 8785 (JCS): keys sort by code point rather than UTF-16 unit, and
+numbers use Python's ``repr``. Changing either would change every recorded
+``semantic_sha256``.
+
+:func:`canonical_sha256` produces the same digest as hashing that string, but
+never builds it. Containers are streamed piece by piece, and any subtree of at
+most :data:`STREAM_NODE_BUDGET` elements is encoded in one call to the C
+encoder. Encoded text reaches SHA-256 in blocks of about a megabyte, so peak
+memory is bounded by the largest single string in the document rather than by
+the size of its encoding.
+
+The module depends only on the standard library, so the evidence and manifest
+code can use it without import cycles.
+
+Usage::
+
+    digest = canonical_sha256(projection)
+    for chunk in iter_canonical_json(projection):
+        out.write(chunk)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Iterator
+
+# Largest subtree (in dict/list elements) handed to the C encoder in one call.
+STREAM_NODE_BUDGET = 4096
+# Encoded characters buffered before each SHA-256 update.
+HASH_CHUNK_CHARS = 1 << 20
+
+_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+_encode_key = json.encoder.encode_basestring
+_CONTAINERS = (dict, list, tuple)
+
+
+def canonical_json(value: Any) -> str:
+    """Serialize JSON-compatible data using a stable representation."""
+    return _ENCODER.encode(value)
+
+
+def _within_budget(value, budget: int) -> bool:
+    """True if the container ``value`` holds at most ``budget`` elements in total."""
+    stack = [value]
+    while stack:
+        container = stack.pop()
+        budget -= len(container)
+        if budget < 0:
+            return False
+        stack.extend(child for child in (container.values() if isinstance(container, dict) else container)
+                     if isinstance(child, _CONTAINERS))
+    return True
+
+
+def _iter_encoded(value, budget: int, markers: set[int]) -> Iterator[str]:
+    if not isinstance(value, _CONTAINERS) or _within_budget(value, budget):
+        yield _ENCODER.encode(value)
+        return
+    if isinstance(value, dict) and not all(isinstance(key, str) for key in value):
+        yield _ENCODER.encode(value)  # json's key coercion rules; never seen in evidence
+        return
+    marker = id(value)
+    if marker in markers:
+        raise ValueError("Circular reference detected")
+    markers.add(marker)
+    if isinstance(value, dict):
+        yield "{"
+        for i, (key, child) in enumerate(sorted(value.items())):
+            yield f",{_encode_key(key)}:" if i else f"{_encode_key(key)}:"
+            yield from _iter_encoded(child, budget, markers)
+        yield "}"
+    else:
+        yield "["
+        for i, child in enumerate(value):
+            if i:
+                yield ","
+            yield from _iter_encoded(child, budget, markers)
+        yield "]"
+    markers.discard(marker)
+
+
+def iter_canonical_json(value: Any, node_budget: int = STREAM_NODE_BUDGET) -> Iterator[str]:
+    """The :func:`canonical_json` text of ``value``, as a sequence of chunks."""
+    return _iter_encoded(value, node_budget, set())
+
+
+def canonical_sha256(value: Any, node_budget: int = STREAM_NODE_BUDGET) -> str:
+    """SHA-256 of the UTF-8 :func:`canonical_json` text of ``value``, computed incrementally."""
+    h = hashlib.sha256()
+    pending: list[str] = []
+    pending_size = 0
+    for chunk in _iter_encoded(value, node_budget, set()):
+        pending.append(chunk)
+        pending_size += len(chunk)
+        if pending_size >= HASH_CHUNK_CHARS:
+            h.update("".join(pending).encode("utf-8"))
+            pending.clear()
+            pending_size = 0
+    h.update("".join(pending).encode("utf-8"))
+    return h.hexdigest()
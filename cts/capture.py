@@ -0,0 +1,155 @@
+"""Bounded-memory capture of SUT response bodies.
+
+Live runs stream every response body through a :class:`BodyCapture`. The body
+is hashed (SHA-256) as it arrives and kept in memory up to an inline limit;
+once it outgrows the limit, what has been buffered so far and everything
+after it is written to ``cases/<test case id>.body`` instead. Small bodies are
+recorded in the case file exactly as before (``response.text`` and
+``response.json``). Spilled bodies are referenced by path and digest::
+
+    "response": {
+      "status": 200,
+      "headers": {...},
+      "body_file": {"path": "cases/TC-LIFE-001.body", "sha256": "...", "size": 734003200}
+    }
+
+so a multi-gigabyte lifecycle feed is never held as bytes, text, parsed JSON
+and an indented case document at the same time. Assertions parse the body
+straight from the side file, and replay does the same after checking the
+digest.
+
+The limit comes from the profile's ``evidence.inline_response_bytes``
+(default 8 MiB; 0 spills every body).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from functools import cached_property
+from pathlib import Path
+
+DEFAULT_INLINE_LIMIT = 8 << 20
+CHUNK_SIZE = 64 << 10
+
+
+def inline_limit(profile) -> int:
+    """The profile's ``evidence.inline_response_bytes``, validated."""
+    limit = (profile.get("evidence") or {}).get("inline_response_bytes", DEFAULT_INLINE_LIMIT)
+    if isinstance(limit, bool) or not isinstance(limit, int) or limit < 0:
+        raise SystemExit(f"evidence.inline_response_bytes must be a non-negative integer (got {limit!r})")
+    return limit
+
+
+class BodyCapture:
+    """Sink for one response body: in memory up to ``limit`` bytes, then spilled to ``path``."""
+
+    def __init__(self, path: Path, rel: str, limit: int):
+        self.path = Path(path)
+        self.rel = rel
+        self.limit = limit
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._buffer = bytearray()
+        self._part = self.path.with_name(self.path.name + ".part")
+        self._file = None
+
+    @property
+    def spilled(self) -> bool:
+        return self._file is not None
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    def write(self, chunk: bytes) -> None:
+        self._hash.update(chunk)
+        self.size += len(chunk)
+        if self._file is None:
+            if len(self._buffer) + len(chunk) <= self.limit:
+                self._buffer += chunk
+                return
+            self._file = open(self._part, "wb")
+            self._file.write(self._buffer)
+            self._buffer = bytearray()
+        self._file.write(chunk)
+
+    def finish(self) -> None:
+        """Complete the capture; a spilled body is moved into place atomically."""
+        if self._file is not None:
+            self._file.close()
+            os.replace(self._part, self.path)
+        else:
+            # A body left by an earlier run into the same directory is stale now
+            self.path.unlink(missing_ok=True)
+
+    def abort(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._part.unlink(missing_ok=True)
+
+    def content(self) -> bytes:
+        """The body bytes of an inline (not spilled) capture."""
+        if self.spilled:
+            raise ValueError(f"body was spilled to {self.path}")
+        return bytes(self._buffer)
+
+    def reference(self) -> dict:
+        return {"path": self.rel, "sha256": self.sha256, "size": self.size}
+
+
+class ResponseCapture:
+    """Per-run capture policy: hands out a :class:`BodyCapture` per test case."""
+
+    def __init__(self, out: Path, limit: int = DEFAULT_INLINE_LIMIT):
+        self.out = Path(out)
+        self.limit = limit
+
+    def for_case(self, tc_id: str) -> BodyCapture:
+        rel = f"cases/{tc_id}.body"
+        return BodyCapture(self.out / rel, rel, self.limit)
+
+
+class CapturedResponse:
+    """Response whose body was spilled to disk by a :class:`BodyCapture`.
+
+    Exposes the subset of ``requests.Response`` the runner uses; ``text`` is
+    only decoded if something asks for it.
+    """
+
+    def __init__(self, status_code: int, headers, capture: BodyCapture, encoding: str | None):
+        self.status_code = status_code
+        self.headers = headers
+        self.capture = capture
+        self.encoding = encoding
+
+    @property
+    def body_file(self) -> dict:
+        return self.capture.reference()
+
+    @cached_property
+    def text(self) -> str:
+        return self.capture.path.read_bytes().decode(self.encoding or "utf-8", errors="replace")
+
+    def json(self):
+        with open(self.capture.path, "rb") as f:
+            return json.loads(f.read().decode(self.encoding or "utf-8"))
+
+
+def load_body_json(path: Path, reference: dict):
+    """Parse a spilled body for replay, after checking it against its recorded digest.
+
+    Returns None if the body is not valid JSON.
+    """
+    return parse_body_json(Path(path).read_bytes(), reference, str(path))
+
+
+def parse_body_json(data: bytes, reference: dict, label: str):
+    """:func:`load_body_json` for body bytes already read (e.g. from a bundle member)."""
+    if hashlib.sha256(data).hexdigest() != reference.get("sha256"):
+        raise SystemExit(f"Response body {label} does not match its recorded sha256")
+    try:
+        return json.loads(data)
+    except ValueError:
+        return None
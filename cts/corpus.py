@@ -0,0 +1,169 @@
+"""CTS corpus replay: re-evaluate an archive of past runs against the current suite.
+
+When ``tests/core_tests.yaml`` or a schema changes, corpus replay answers
+"which historical verdicts would flip?" for every archived evidence directory
+in one invocation. Runs (any directory with a ``cases/`` subdirectory, or an
+archived ``bundle.zip``, read in place) are found under the given paths or
+glob patterns and replayed in parallel worker processes. The compiled plan
+and schema validators are loaded once in the parent and shared with the
+workers.
+
+Each run's ``replay-report.json`` is written under ``--out/runs/``, mirroring
+the archive layout, and ``corpus-drift-report.json`` aggregates the verdict
+flips per test case and per target.
+
+Usage::
+
+    python cts/corpus.py --profile profiles/baseline.yaml \\
+        --out reports/drift 'archive/nightly/*' --workers 8
+
+Exit status is 0 when every run replayed and no verdict flipped, 1 otherwise.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from cts.plan import load_plan, process_pool, shared_plan
+from cts.run import now_iso, run_replay, tool_version
+from cts.source import discover_evidence, open_evidence
+
+CORPUS_REPORT_VERSION = "0.1.0"
+
+
+def _replay_dirs(runs: list[Path]) -> list[str]:
+    """Replay output paths mirroring the runs below their common root.
+
+    An archived ``<run>/bundle.zip`` replays into ``<run>``, any other archive
+    into its name without the ``.zip`` suffix.
+    """
+    runs = [(p.parent if p.name == "bundle.zip" else p.with_suffix("")) if p.is_file() else p for p in runs]
+    if len(runs) == 1:
+        return [runs[0].name or "run"]
+    common = Path(os.path.commonpath(runs))
+    return [p.relative_to(common).as_posix() for p in runs]
+
+
+def _replay_run(run_dir: str, replay_out: str, generated_at: str) -> dict:
+    """Worker entry point: replay one run and return its summary row."""
+    row = {"run_dir": run_dir, "replay_dir": replay_out}
+    try:
+        with open_evidence(Path(run_dir)) as source:
+            run = source.read_json("run.json") if source.exists("run.json") else {}
+    except ValueError as e:
+        return {**row, "status": "error", "error": f"unreadable run.json: {e}"}
+    except SystemExit as e:
+        return {**row, "status": "error", "error": str(e)}
+    row.update(run_id=run.get("test_run_id"), target_id=run.get("target_id"))
+    try:
+        # A replay with FAIL verdicts exits 1 after writing its report
+        run_replay(Path(run_dir), Path(replay_out), shared_plan(), generated_at)
+    except SystemExit as e:
+        if e.code not in (0, 1, None):
+            return {**row, "status": "error", "error": str(e)}
+    except Exception as e:
+        return {**row, "status": "error", "error": f"{type(e).__name__}: {e}"}
+    report = json.loads((Path(replay_out) / "replay-report.json").read_text(encoding="utf-8"))
+    return {**row, "status": "replayed", "summary": report["summary"], "verdict_diffs": report["verdict_diffs"]}
+
+
+def aggregate_drift(rows: list[dict]) -> dict:
+    """Verdict flips per test case and per target across replayed runs."""
+    by_test_case: dict = {}
+    by_target: dict = {}
+    for row in rows:
+        if row["status"] != "replayed":
+            continue
+        target = by_target.setdefault(row.get("target_id") or "unknown",
+                                      {"runs": 0, "runs_with_flips": 0, "verdict_flips": 0, "test_cases": {}})
+        target["runs"] += 1
+        target["runs_with_flips"] += bool(row["verdict_diffs"])
+        for diff in row["verdict_diffs"]:
+            tc_id = diff["test_case_id"]
+            transition = f"{diff['original_result']}->{diff['replay_result']}"
+            entry = by_test_case.setdefault(tc_id, {"verdict_flips": 0, "transitions": {}, "runs": []})
+            entry["verdict_flips"] += 1
+            entry["transitions"][transition] = entry["transitions"].get(transition, 0) + 1
+            entry["runs"].append(row["replay_dir"])
+            target["verdict_flips"] += 1
+            target["test_cases"][tc_id] = target["test_cases"].get(tc_id, 0) + 1
+    return {
+        "by_test_case": dict(sorted(by_test_case.items())),
+        "by_target": dict(sorted(by_target.items())),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="TRQP Conformance Suite corpus replay")
+    ap.add_argument("runs", nargs="+",
+                    help="Run directories, bundle.zip files, directory trees or glob patterns of archived "
+                         "evidence to replay")
+    ap.add_argument("--profile", required=True, help="Path to profile YAML")
+    ap.add_argument("--out", required=True,
+                    help="Output directory for corpus-drift-report.json and per-run replay reports")
+    ap.add_argument("--workers", type=int, default=None,
+                    help="Number of parallel worker processes (default: min(runs, CPU count))")
+    ap.add_argument("--generated-at", default=None,
+                    help="Pin generated_at for every replay report (default: corpus start time)")
+    ap.add_argument("--no-plan-cache", action="store_true",
+                    help="Compile the test plan without reading or writing the on-disk plan cache")
+    args = ap.parse_args(argv)
+
+    run_dirs = discover_evidence(args.runs)
+    if not run_dirs:
+        raise SystemExit("No run directories (with a cases/ subdirectory) or bundles found under: "
+                         + ", ".join(args.runs))
+
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    generated_at = args.generated_at or now_iso()
+    workers = args.workers or min(len(run_dirs), multiprocessing.cpu_count())
+    if workers < 1:
+        raise SystemExit("--workers must be >= 1")
+
+    plan = load_plan(Path(args.profile), use_cache=not args.no_plan_cache)
+    replay_outs = [str(out / "runs" / name) for name in _replay_dirs(run_dirs)]
+    with process_pool(workers, plan) as pool:
+        rows = list(pool.map(_replay_run, map(str, run_dirs), replay_outs, [generated_at] * len(run_dirs)))
+
+    for row in rows:
+        row["replay_dir"] = str(Path(row["replay_dir"]).relative_to(out))
+    replayed = [r for r in rows if r["status"] == "replayed"]
+    drift = aggregate_drift(rows)
+    report = {
+        "corpus_report_version": CORPUS_REPORT_VERSION,
+        "generated_at": generated_at,
+        "profile_id": plan.profile.get("id"),
+        "plan_sha256": plan.sha256,
+        "suite_version": tool_version(),
+        "tool": {"name": "trqp-cts", "version": tool_version()},
+        "totals": {
+            "runs": len(rows),
+            "replayed": len(replayed),
+            "errored": len(rows) - len(replayed),
+            "runs_with_flips": sum(1 for r in replayed if r["verdict_diffs"]),
+            "verdict_flips": sum(len(r["verdict_diffs"]) for r in replayed),
+            "stale_verdicts": sum(r["summary"]["STALE"] for r in replayed),
+        },
+        **drift,
+        "runs": rows,
+    }
+    (out / "corpus-drift-report.json").write_text(json.dumps(report, indent=2), encoding="utf-8")
+    totals = report["totals"]
+    print(f"Corpus replay complete: {totals['replayed']}/{totals['runs']} run(s) replayed, "
+          f"{totals['verdict_flips']} verdict flip(s) in {totals['runs_with_flips']} run(s), "
+          f"{totals['errored']} errored. Report: {out}/corpus-drift-report.json")
+    return 0 if totals["errored"] == 0 and totals["verdict_flips"] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,67 +4,213 @@ from __future__ import annotations
 
 import fnmatch
 import hashlib
-import json
+import marshal
+import re
 from typing import Any
 
-
-def canonical_json(value: Any) -> str:
-    """Serialize JSON-compatible data using a stable representation."""
-    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+from cts.canonical import canonical_json, canonical_sha256  # noqa: F401
 
 
 def semantic_sha256(value: Any) -> str:
-    return hashlib.sha256(canonical_json(value).encode("utf-8")).hexdigest()
+    """SHA-256 of the canonical JSON of ``value``, streamed (see :mod:`cts.canonical`)."""
+    return canonical_sha256(value)
 
 
 def _escape_pointer_token(token: str) -> str:
     return token.replace("~", "~0").replace("/", "~1")
 
 
-def diff_documents(original: Any, replay: Any, pointer: str = "") -> list[dict[str, Any]]:
-    """Return deterministic JSON-Pointer differences between two documents."""
-    diffs: list[dict[str, Any]] = []
-    if type(original) is not type(replay):
-        return [{"pointer": pointer or "/", "original": original, "replay": replay}]
-
-    if isinstance(original, dict):
-        for key in sorted(set(original) | set(replay)):
-            child = f"{pointer}/{_escape_pointer_token(str(key))}"
-            if key not in original:
-                diffs.append({"pointer": child, "original": None, "replay": replay[key]})
-            elif key not in replay:
-                diffs.append({"pointer": child, "original": original[key], "replay": None})
-            else:
-                diffs.extend(diff_documents(original[key], replay[key], child))
-        return diffs
-
-    if isinstance(original, list):
-        length = max(len(original), len(replay))
-        for idx in range(length):
-            child = f"{pointer}/{idx}"
-            if idx >= len(original):
-                diffs.append({"pointer": child, "original": None, "replay": replay[idx]})
-            elif idx >= len(replay):
-                diffs.append({"pointer": child, "original": original[idx], "replay": None})
+_MISSING = object()
+# A marshalled float whose exponent bits are all set (NaN, or infinity, which
+# is harmless to include). Never matches inside UTF-8 string data.
+_NONFINITE_FLOAT = re.compile(rb"g[\x00-\xff]{6}[\xf0-\xff][\x7f\xff]")
+
+
+class SubtreeDigests:
+    """Memoized digests of dict/list subtrees, used to skip identical subtrees.
+
+    A subtree's digest is the SHA-256 of its ``marshal`` (version 2)
+    encoding, produced in one C-level pass. That encoding records exact types
+    (``1``, ``1.0`` and ``True`` differ; subclasses are rejected) and has no
+    back-references, so equal digests mean equal content however the objects
+    are shared. Each container is digested at most once per instance.
+
+    A subtree is only *prunable* when its digest can stand in for a full
+    comparison: its values must be marshallable and it must hold no NaN (which
+    ``!=`` reports even against itself). Dicts with the same items in a
+    different insertion order get different digests and are simply compared
+    key by key. Documents must not be mutated while an instance holds them.
+    """
+
+    def __init__(self):
+        # id(container) -> (container, digest or None, may_hold_nan); the
+        # container reference keeps the id from being reused while memoized.
+        self._memo: dict[int, tuple[Any, bytes | None, bool]] = {}
+
+    def _info(self, value) -> tuple[Any, bytes | None, bool]:
+        entry = self._memo.get(id(value))
+        if entry is None:
+            try:
+                encoded = marshal.dumps(value, 2)
+            except ValueError:  # unmarshallable (e.g. a subclass): never prune
+                entry = (value, None, True)
             else:
-                diffs.extend(diff_documents(original[idx], replay[idx], child))
-        return diffs
-
-    if original != replay:
-        diffs.append({"pointer": pointer or "/", "original": original, "replay": replay})
+                entry = (value, hashlib.sha256(encoded).digest(), _NONFINITE_FLOAT.search(encoded) is not None)
+            self._memo[id(value)] = entry
+        return entry
+
+    def digest(self, value) -> bytes | None:
+        """Digest of a dict or list (None if it cannot be digested)."""
+        return self._info(value)[1]
+
+    def prunable(self, original, replay) -> bool:
+        """True if two same-typed containers are known to produce no differences."""
+        # ``!=`` runs in C and stops at the first difference, so differing
+        # subtrees are rejected without being encoded; equal ones still need
+        # the exact digest check (``==`` equates 1, 1.0 and True).
+        if original is not replay:
+            try:
+                if original != replay:
+                    return False
+            except RecursionError:  # deeper than C comparison allows: walk it
+                return False
+        _, digest, nan = self._info(original)
+        if digest is None or nan:
+            return False
+        return original is replay or self._info(replay)[1] == digest
+
+
+def diff_documents(original: Any, replay: Any, pointer: str = "",
+                   digests: SubtreeDigests | None = None) -> list[dict[str, Any]]:
+    """Return deterministic JSON-Pointer differences between two documents.
+
+    Identical subtrees are skipped by digest (see :class:`SubtreeDigests`;
+    pass ``digests`` to share them with later calls). Differences come out
+    in key/index order, depth first, and the walk uses an explicit stack, so
+    document depth is not bounded by the recursion limit.
+    """
+    digests = SubtreeDigests() if digests is None else digests
+    diffs: list[dict[str, Any]] = []
+    stack = [(pointer, original, replay)]
+    while stack:
+        pointer, original, replay = stack.pop()
+        if original is _MISSING:
+            diffs.append({"pointer": pointer, "original": None, "replay": replay})
+            continue
+        if replay is _MISSING:
+            diffs.append({"pointer": pointer, "original": original, "replay": None})
+            continue
+        if type(original) is not type(replay):
+            diffs.append({"pointer": pointer or "/", "original": original, "replay": replay})
+            continue
+
+        if isinstance(original, dict):
+            if digests.prunable(original, replay):
+                continue
+            children = [
+                (f"{pointer}/{_escape_pointer_token(str(key))}", original.get(key, _MISSING), replay.get(key, _MISSING))
+                for key in sorted(set(original) | set(replay))
+            ]
+            stack.extend(reversed(children))
+            continue
+
+        if isinstance(original, list):
+            if digests.prunable(original, replay):
+                continue
+            length = max(len(original), len(replay))
+            stack.extend(
+                (f"{pointer}/{idx}",
+                 original[idx] if idx < len(original) else _MISSING,
+                 replay[idx] if idx < len(replay) else _MISSING)
+                for idx in reversed(range(length))
+            )
+            continue
+
+        if original != replay:
+            diffs.append({"pointer": pointer or "/", "original": original, "replay": replay})
     return diffs
 
 
-def classify_differences(diffs: list[dict[str, Any]], policy: dict[str, Any]) -> list[dict[str, Any]]:
-    allowed_patterns = policy.get("allowed_difference_pointers", [])
+_WILDCARD = re.compile(r"[*?[]")
+
+
+class PointerMatcher:
+    """``allowed_difference_pointers`` compiled into a single matcher.
+
+    Patterns keep their ``fnmatch`` meaning (``*`` also matches ``/``), and
+    :meth:`match` returns the first pattern, in policy order, that matches a
+    pointer. Fully literal patterns are looked up in a dict. Every other
+    pattern is filed in a trie under the complete JSON-Pointer segments that
+    precede its first wildcard, and the patterns filed at one trie node are
+    joined into one regex whose alternatives are tried in policy order. A
+    pointer therefore only reaches the regexes on its own segment path instead
+    of every pattern in the policy.
+    """
+
+    def __init__(self, patterns: list[str]):
+        self.patterns = list(patterns)
+        self._literals: dict[str, int] = {}
+        # node: [children by segment, combined regex or None, [(index, pattern)]]
+        self._root: list = [{}, None, []]
+        for index, pattern in enumerate(self.patterns):
+            wildcard = _WILDCARD.search(pattern)
+            if wildcard is None:
+                self._literals.setdefault(pattern, index)
+                continue
+            node = self._root
+            for segment in pattern[:wildcard.start()].split("/")[:-1]:
+                node = node[0].setdefault(segment, [{}, None, []])
+            node[2].append((index, pattern))
+        self._compile(self._root)
+
+    def _compile(self, node: list) -> None:
+        if node[2]:
+            node[1] = re.compile("|".join(
+                f"(?P<r{index}>{fnmatch.translate(pattern)})" for index, pattern in node[2]))
+        for child in node[0].values():
+            self._compile(child)
+
+    def match_index(self, pointer: str) -> int | None:
+        """Policy index of the first pattern matching ``pointer``, or None."""
+        best = self._literals.get(pointer)
+        segments = iter(pointer.split("/"))
+        node = self._root
+        while node is not None:
+            if node[1] is not None:
+                m = node[1].match(pointer)
+                if m is not None:
+                    index = int(m.lastgroup[1:])
+                    best = index if best is None else min(best, index)
+            segment = next(segments, None)
+            node = None if segment is None else node[0].get(segment)
+        return best
+
+    def match(self, pointer: str) -> str | None:
+        """The first pattern matching ``pointer``, or None."""
+        index = self.match_index(pointer)
+        return None if index is None else self.patterns[index]
+
+
+def compile_policy(policy: dict[str, Any]) -> PointerMatcher:
+    return PointerMatcher(policy.get("allowed_difference_pointers", []))
+
+
+def classify_differences(
+    diffs: list[dict[str, Any]], policy: dict[str, Any], matcher: PointerMatcher | None = None
+) -> list[dict[str, Any]]:
+    """Classify each diff against the policy, recording the rule that permitted it.
+
+    Pass a ``matcher`` from :func:`compile_policy` to reuse it across calls.
+    """
+    matcher = compile_policy(policy) if matcher is None else matcher
     classified = []
     for diff in diffs:
-        pointer = diff["pointer"]
-        allowed = any(fnmatch.fnmatchcase(pointer, pattern) for pattern in allowed_patterns)
+        rule = matcher.match(diff["pointer"])
         classified.append({
             **diff,
-            "classification": "volatile" if allowed else "semantic",
-            "permitted": allowed,
+            "classification": "semantic" if rule is None else "volatile",
+            "permitted": rule is not None,
+            "matched_rule": rule,
         })
     return classified
 
@@ -0,0 +1,118 @@
+"""Hash-once evidence writer.
+
+Every evidence artifact the runner emits goes through :class:`EvidenceWriter`,
+which writes the bytes in chunks and feeds the same chunks to SHA-256. The
+resulting digest table is what ``manifest.json``, the bundle descriptor's
+``artifact_index``, ``checksums.json`` and the bundle member list are built
+from, so a run hashes each artifact exactly once instead of re-reading it for
+every index.
+
+When a :class:`cts.bundle.BundleBuilder` is attached, each artifact is also
+queued for bundle compression as it is written, so the bundle is built from
+the bytes already in memory rather than from a second read of the file.
+
+Operational files such as the run journal are passed as ``untracked`` and
+never appear in the digest table's file listing.
+
+Files already present under the output directory that this run did not write
+are hashed (in chunks) the first time the table is consulted, preserving the
+existing "everything under --out" semantics.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path, PurePosixPath
+
+CHUNK_SIZE = 1 << 20
+
+
+def sha256_file(p: Path) -> str:
+    """SHA-256 of a file, read in fixed-size chunks."""
+    h = hashlib.sha256()
+    with open(p, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def evidence_sort_key(rel: str) -> tuple:
+    # Same order as sorted(out.rglob("*")): path components, not raw strings
+    return PurePosixPath(rel).parts
+
+
+class EvidenceWriter:
+    """Writes artifacts under ``out`` and records ``{relative path: (sha256, size)}``."""
+
+    def __init__(self, out: Path, bundle=None, untracked: tuple[str, ...] = ()):
+        self.out = Path(out)
+        self.bundle = bundle
+        self.untracked = tuple(untracked)
+        self._table: dict[str, tuple[str, int]] = {}
+
+    def write_bytes(self, rel: str, data: bytes) -> str:
+        """Write ``data`` to ``out/rel``, hashing it in the same pass; returns the digest."""
+        path = self.out / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        h = hashlib.sha256()
+        view = memoryview(data)
+        with open(path, "wb") as f:
+            for start in range(0, len(view), CHUNK_SIZE):
+                chunk = view[start:start + CHUNK_SIZE]
+                h.update(chunk)
+                f.write(chunk)
+        digest = h.hexdigest()
+        self._table[rel] = (digest, len(data))
+        if self.bundle is not None and PurePosixPath(rel).name != "bundle.zip":
+            self.bundle.add(rel, data)
+        return digest
+
+    def write_text(self, rel: str, text: str) -> str:
+        return self.write_bytes(rel, text.encode("utf-8"))
+
+    def write_json(self, rel: str, doc, indent: int | None = 2) -> str:
+        return self.write_text(rel, json.dumps(doc, indent=indent))
+
+    def record(self, rel: str, digest: str | None = None, size: int | None = None) -> str:
+        """Add a file produced outside the writer to the table, hashing it unless the digest is known."""
+        if digest is None:
+            path = self.out / rel
+            digest, size = sha256_file(path), path.stat().st_size
+        self._table[rel] = (digest, size)
+        return digest
+
+    def finish_bundle(self, rel: str = "bundle.zip") -> str:
+        """Write the attached bundle over every file so far and record it; later writes are not bundled."""
+        bundle, self.bundle = self.bundle, None
+        digest, size = bundle.finish(self.out / rel, self.files(exclude_names=(PurePosixPath(rel).name,)), root=self.out)
+        return self.record(rel, digest, size)
+
+    def digest(self, rel: str) -> str | None:
+        """Digest for ``rel`` from the table, or None if the file does not exist."""
+        entry = self._table.get(rel)
+        if entry is None:
+            path = self.out / rel
+            if not path.is_file():
+                return None
+            return self.record(rel)
+        return entry[0]
+
+    def size(self, rel: str) -> int | None:
+        return self._table[rel][1] if self.digest(rel) is not None else None
+
+    def files(self, exclude_names: tuple[str, ...] = ()) -> list[str]:
+        """Every evidence file under ``out`` in rglob order, with digests resolved in the table.
+
+        Files named in ``untracked`` (operational state such as the run journal)
+        are never listed.
+        """
+        rels = {str(p.relative_to(self.out)) for p in self.out.rglob("*") if p.is_file()}
+        out = []
+        for rel in sorted(rels, key=evidence_sort_key):
+            name = PurePosixPath(rel).name
+            if name in exclude_names or name in self.untracked:
+                continue
+            self.digest(rel)
+            out.append(rel)
+        return out
@@ -0,0 +1,418 @@
+"""Incremental validation of large status feeds.
+
+Lifecycle, directory and GRID status feeds are a small envelope around one
+unbounded array (``entries`` or ``events``). A national directory feed can run
+to gigabytes, so instead of parsing the whole document and handing it to
+``jsonschema`` in one call, :class:`FeedValidator` reads the file in chunks,
+decodes the array one element at a time and validates each element against
+the array's ``items`` subschema as soon as it is complete. Only the current
+element (plus one read chunk) is in memory at any point.
+
+The envelope (every other top-level member) is validated against the feed
+schema once the document has been read, with the array itself checked for
+``minItems``/``maxItems`` by count. Errors are reported per entry with the
+entry's index and a JSON Pointer to the failing value, and the report
+includes entries/second and bytes/second throughput.
+
+:class:`FeedStream` is the underlying incremental reader and can be used on
+its own to walk a feed without validating it.
+
+Usage::
+
+    python scripts/validate_feed.py --kind lifecycle national-feed.json
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from cts.schemas import shared_registry
+
+# kind -> (schema path relative to the repository root, streamed array member)
+FEEDS = {
+    "lifecycle": ("schemas/lifecycle-status-feed.schema.json", "entries"),
+    "directory": ("schemas/directory-status-feed.schema.json", "events"),
+    "grid": ("schemas/grid-status-feed.schema.json", "entries"),
+}
+
+CHUNK_SIZE = 1 << 20
+DEFAULT_MAX_ERRORS = 1000
+
+# Array keywords that can be checked without holding the array
+_STREAMABLE_ARRAY_KEYWORDS = {"type", "items", "minItems", "maxItems", "title", "description"}
+_WHITESPACE = " \t\n\r"
+
+
+class FeedSyntaxError(ValueError):
+    """The feed is not well-formed JSON (or not a JSON object)."""
+
+
+@dataclass(frozen=True)
+class FeedError:
+    """One validation error. ``index`` is None for envelope errors."""
+
+    index: int | None
+    pointer: str
+    message: str
+
+    def to_json(self) -> dict:
+        return {"index": self.index, "pointer": self.pointer, "message": self.message}
+
+
+@dataclass
+class FeedReport:
+    kind: str | None
+    schema: str
+    array_key: str
+    entries: int = 0
+    invalid_entries: int = 0
+    error_count: int = 0
+    errors: list[FeedError] = field(default_factory=list)
+    bytes_read: int = 0
+    seconds: float = 0.0
+
+    @property
+    def valid(self) -> bool:
+        return self.error_count == 0
+
+    @property
+    def entries_per_second(self) -> float:
+        return self.entries / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_read / self.seconds if self.seconds > 0 else 0.0
+
+    def to_json(self) -> dict:
+        return {
+            "kind": self.kind,
+            "schema": self.schema,
+            "array_key": self.array_key,
+            "valid": self.valid,
+            "entries": self.entries,
+            "invalid_entries": self.invalid_entries,
+            "error_count": self.error_count,
+            "errors": [e.to_json() for e in self.errors],
+            "errors_truncated": self.error_count > len(self.errors),
+            "bytes_read": self.bytes_read,
+            "seconds": round(self.seconds, 6),
+            "entries_per_second": round(self.entries_per_second, 1),
+            "bytes_per_second": round(self.bytes_per_second, 1),
+        }
+
+
+class _Reader:
+    """Chunked UTF-8 reader with just enough JSON scanning to walk one object."""
+
+    def __init__(self, f, chunk_size: int):
+        self._f = f
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.bytes_read = 0
+        self._dropped = 0  # characters discarded from the front of buf
+
+    def offset(self) -> int:
+        return self._dropped + self.pos
+
+    def fill(self, want: int = 0) -> bool:
+        """Read at least one more chunk (or ``want`` bytes); False at end of input."""
+        if self.eof:
+            return False
+        data = self._f.read(max(self._chunk_size, want))
+        if not data:
+            self.buf += self._decoder.decode(b"", final=True)
+            self.eof = True
+            return False
+        # Only compact when more input arrives: callers that get False keep
+        # using offsets into the current buffer.
+        if self.pos > len(self.buf) // 2:
+            self._dropped += self.pos
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        self.bytes_read += len(data)
+        self.buf += self._decoder.decode(data)
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ("" at end of input)."""
+        while True:
+            buf, pos = self.buf, self.pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buf) or not self.fill():
+                return buf[pos] if pos < len(buf) else ""
+
+    def expect(self, chars: str) -> str:
+        c = self.peek()
+        if not c:
+            raise FeedSyntaxError(f"unexpected end of input at offset {self.offset()}")
+        if c not in chars:
+            expected = " or ".join(repr(ch) for ch in chars)
+            raise FeedSyntaxError(f"expected {expected} at offset {self.offset()}, found {c!r}")
+        self.pos += 1
+        return c
+
+    def value(self):
+        """Decode one JSON value, reading more input until it is complete."""
+        self.peek()
+        while True:
+            try:
+                obj, end = self._json.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                # A value cut off by the end of the buffer fails at (or just
+                # before) the end, or as an unterminated string; read more
+                # (doubling the window) and retry. Anything else is malformed.
+                truncated = e.pos >= len(self.buf) - 5 or e.msg.startswith("Unterminated string")
+                if truncated and self.fill(len(self.buf) - self.pos):
+                    continue
+                raise FeedSyntaxError(f"invalid JSON at offset {self._dropped + e.pos}: {e.msg}") from None
+            # A number may continue in the next chunk ("1.2" + "5", "1e" + "+3"):
+            # accept it only with enough lookahead to rule that out.
+            if (end == len(self.buf) or (isinstance(obj, (int, float)) and end + 3 > len(self.buf))) \
+                    and self.fill():
+                continue
+            self.pos = end
+            return obj
+
+
+class FeedStream:
+    """Iterates ``(index, element)`` over one array member of a JSON object read from binary file ``f``.
+
+    Every other top-level member is collected in :attr:`envelope`; the
+    streamed array itself is recorded there as an empty list.
+    """
+
+    def __init__(self, f, array_key: str, chunk_size: int = CHUNK_SIZE):
+        self.array_key = array_key
+        self.envelope: dict = {}
+        self._reader = _Reader(f, chunk_size)
+
+    @property
+    def bytes_read(self) -> int:
+        return self._reader.bytes_read
+
+    def __iter__(self):
+        r = self._reader
+        r.expect("{")
+        if r.peek() == "}":
+            r.pos += 1
+        else:
+            while True:
+                key = r.value()
+                if not isinstance(key, str):
+                    raise FeedSyntaxError(f"expected an object key at offset {r.offset()}")
+                r.expect(":")
+                if key == self.array_key and r.peek() == "[":
+                    r.pos += 1
+                    self.envelope[key] = []
+                    if r.peek() == "]":
+                        r.pos += 1
+                    else:
+                        index = 0
+                        while True:
+                            yield index, r.value()
+                            index += 1
+                            if r.expect(",]") == "]":
+                                break
+                else:
+                    self.envelope[key] = r.value()
+                if r.expect(",}") == "}":
+                    break
+        if r.peek():
+            raise FeedSyntaxError(f"unexpected data after the feed object at offset {r.offset()}")
+
+
+# Keywords the fast-path compiler understands. format/title/... are
+# annotations only: the registry's validators do not assert formats.
+_ANNOTATIONS = {"title", "description", "format", "$comment", "examples", "default", "deprecated"}
+_FAST_KEYWORDS = _ANNOTATIONS | {"type", "enum", "required", "properties", "additionalProperties",
+                                 "items", "minLength", "maxLength", "minItems", "maxItems"}
+_TYPE_CHECKS = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "integer": lambda v: (isinstance(v, int) and not isinstance(v, bool)) or (isinstance(v, float) and v.is_integer()),
+}
+
+
+def _compile_check(schema):
+    """Compile a plain-Python validity predicate for a simple subschema.
+
+    Returns None when the schema uses anything outside ``_FAST_KEYWORDS`` (or
+    a non-string ``enum``); callers then rely on jsonschema alone. The
+    predicate only answers valid/invalid; error messages always come from
+    jsonschema, so reports are identical either way.
+    """
+    if schema is True or schema == {}:
+        return lambda v: True
+    if schema is False:
+        return lambda v: False
+    if not isinstance(schema, dict) or set(schema) - _FAST_KEYWORDS:
+        return None
+    checks = []
+    if "type" in schema:
+        types = [schema["type"]] if isinstance(schema["type"], str) else schema["type"]
+        if not all(t in _TYPE_CHECKS for t in types):
+            return None
+        fns = [_TYPE_CHECKS[t] for t in types]
+        checks.append(fns[0] if len(fns) == 1 else (lambda v: any(f(v) for f in fns)))
+    if "enum" in schema:
+        if not all(isinstance(e, str) for e in schema["enum"]):
+            return None
+        allowed = frozenset(schema["enum"])
+        checks.append(lambda v: isinstance(v, str) and v in allowed)
+    if "minLength" in schema:
+        lo = schema["minLength"]
+        checks.append(lambda v: not isinstance(v, str) or len(v) >= lo)
+    if "maxLength" in schema:
+        hi = schema["maxLength"]
+        checks.append(lambda v: not isinstance(v, str) or len(v) <= hi)
+    if "required" in schema:
+        required = frozenset(schema["required"])
+        checks.append(lambda v: not isinstance(v, dict) or v.keys() >= required)
+    if "properties" in schema or "additionalProperties" in schema:
+        props = {}
+        for k, sub in (schema.get("properties") or {}).items():
+            props[k] = _compile_check(sub)
+            if props[k] is None:
+                return None
+        extra = _compile_check(schema.get("additionalProperties", True))
+        if extra is None:
+            return None
+
+        def check_object(v):
+            if not isinstance(v, dict):
+                return True
+            for k, x in v.items():
+                if not props.get(k, extra)(x):
+                    return False
+            return True
+        checks.append(check_object)
+    if "items" in schema:
+        item = _compile_check(schema["items"])
+        if item is None:
+            return None
+        checks.append(lambda v: not isinstance(v, list) or all(item(x) for x in v))
+    if "minItems" in schema:
+        lo_items = schema["minItems"]
+        checks.append(lambda v: not isinstance(v, list) or len(v) >= lo_items)
+    if "maxItems" in schema:
+        hi_items = schema["maxItems"]
+        checks.append(lambda v: not isinstance(v, list) or len(v) <= hi_items)
+    if len(checks) == 1:
+        return checks[0]
+    checks = tuple(checks)
+
+    def check_all(v):
+        for c in checks:
+            if not c(v):
+                return False
+        return True
+    return check_all
+
+
+def _pointer(parts) -> str:
+    return "".join("/" + str(p).replace("~", "~0").replace("/", "~1") for p in parts)
+
+
+class FeedValidator:
+    """Validates a feed's array element by element against its item subschema."""
+
+    def __init__(self, schema_path: str | Path, array_key: str, registry=None, kind: str | None = None):
+        registry = registry or shared_registry()
+        self.schema_path = str(schema_path)
+        self.array_key = array_key
+        self.kind = kind
+        schema = registry.schema(schema_path)
+        array_schema = (schema.get("properties") or {}).get(array_key)
+        if not isinstance(array_schema, dict):
+            raise ValueError(f"{schema_path} has no properties.{array_key} schema to stream")
+        unsupported = set(array_schema) - _STREAMABLE_ARRAY_KEYWORDS
+        if unsupported:
+            raise ValueError(f"cannot stream {array_key}: unsupported array keywords {sorted(unsupported)}")
+        self._array_schema = array_schema
+        root = registry.validator(schema_path)
+        # evolve() keeps the registry and base URI, so $refs inside items resolve
+        self._items = root.evolve(schema=array_schema.get("items", True))
+        # Most feed item schemas are flat objects of typed/enum fields; those
+        # are checked in plain Python and only failing entries go to jsonschema.
+        self._fast = _compile_check(array_schema.get("items", True))
+        placeholder = {k: v for k, v in array_schema.items() if k in ("type", "title", "description")}
+        self._envelope = root.evolve(schema={**schema, "properties": {**schema["properties"], array_key: placeholder}})
+
+    @classmethod
+    def for_kind(cls, kind: str, registry=None) -> "FeedValidator":
+        if kind not in FEEDS:
+            raise ValueError(f"unknown feed kind {kind!r} (expected one of {', '.join(FEEDS)})")
+        schema_path, array_key = FEEDS[kind]
+        return cls(schema_path, array_key, registry=registry, kind=kind)
+
+    def validate(self, path: str | Path, max_errors: int = DEFAULT_MAX_ERRORS,
+                 chunk_size: int = CHUNK_SIZE, on_progress=None) -> FeedReport:
+        """Stream-validate the feed at ``path``.
+
+        ``on_progress(report)`` (optional) is called every 100,000 entries.
+        Malformed JSON is reported as an envelope error and stops the scan.
+        """
+        report = FeedReport(kind=self.kind, schema=self.schema_path, array_key=self.array_key)
+
+        def add(index, parts, message):
+            report.error_count += 1
+            if len(report.errors) < max_errors:
+                report.errors.append(FeedError(index, _pointer(parts), message))
+
+        fast, items = self._fast, self._items
+        started = time.perf_counter()
+        well_formed = True
+        with open(path, "rb") as f:
+            stream = FeedStream(f, self.array_key, chunk_size)
+            try:
+                for index, item in stream:
+                    if fast is not None and fast(item):
+                        errors = ()
+                    else:
+                        errors = sorted(items.iter_errors(item), key=lambda e: list(map(str, e.absolute_path)))
+                    if errors:
+                        report.invalid_entries += 1
+                        for e in errors:
+                            add(index, [self.array_key, index, *e.absolute_path], e.message)
+                    report.entries = index + 1
+                    if on_progress is not None and report.entries % 100_000 == 0:
+                        report.seconds = time.perf_counter() - started
+                        report.bytes_read = stream.bytes_read
+                        on_progress(report)
+            except FeedSyntaxError as e:
+                well_formed = False
+                add(None, [], str(e))
+            report.bytes_read = stream.bytes_read
+
+        # A truncated envelope would only produce follow-on errors
+        envelope = stream.envelope
+        if well_formed:
+            for e in sorted(self._envelope.iter_errors(envelope), key=lambda e: list(map(str, e.absolute_path))):
+                add(None, list(e.absolute_path), e.message)
+        if well_formed and self.array_key in envelope:
+            lo, hi = self._array_schema.get("minItems"), self._array_schema.get("maxItems")
+            if lo is not None and report.entries < lo:
+                add(None, [self.array_key], f"{self.array_key} has {report.entries} items, fewer than minItems {lo}")
+            if hi is not None and report.entries > hi:
+                add(None, [self.array_key], f"{self.array_key} has {report.entries} items, more than maxItems {hi}")
+        report.seconds = time.perf_counter() - started
+        return report
+
+
+def validate_feed(path: str | Path, kind: str, max_errors: int = DEFAULT_MAX_ERRORS) -> FeedReport:
+    """Stream-validate a ``lifecycle``, ``directory`` or ``grid`` feed file."""
+    return FeedValidator.for_kind(kind).validate(path, max_errors=max_errors)
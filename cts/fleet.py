@@ -0,0 +1,170 @@
+"""CTS fleet mode: one invocation, many SUT targets in parallel.
+
+Runs a single profile against a list of SUT configs in parallel worker
+processes. The compiled test plan (profile and suite) is loaded once in the
+parent and inherited by the workers, so nightly certification of many
+registries pays interpreter startup and plan loading once instead of once
+per target.
+
+Each target gets its own evidence directory under ``--out`` (named after the
+SUT file stem) and ``fleet-summary.json`` indexes the outcome of every target.
+
+Usage::
+
+    python cts/fleet.py --profile profiles/baseline.yaml \\
+        --sut suts/registry-a.yaml --sut suts/registry-b.yaml \\
+        --out reports/nightly --workers 8 -- --concurrency 4
+
+``--resume`` re-runs a fleet into the same ``--out``: targets with a run
+journal pick up where they stopped, completed targets are reported from
+their existing evidence, and targets that never started run from scratch.
+
+Arguments after ``--`` (or any argument fleet mode does not recognise) are
+passed through to every per-target runner invocation.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from cts.plan import load_plan, process_pool, shared_plan
+from cts.run import build_arg_parser, execute_run, load_yaml, now_iso, tool_version, validate_args
+
+FLEET_SUMMARY_VERSION = "0.1.0"
+
+
+def _run_target(runner_argv: list[str], generated_at: str) -> dict:
+    """Worker entry point: execute one target and return its summary row."""
+    args = build_arg_parser().parse_args(runner_argv)
+    row = {"sut": args.sut, "out_dir": args.out}
+    try:
+        validate_args(args)
+        sut = load_yaml(Path(args.sut))
+        report = execute_run(args, shared_plan(), sut, generated_at)
+    except SystemExit as e:
+        return {**row, "status": "error", "error": str(e)}
+    except Exception as e:
+        return {**row, "status": "error", "error": f"{type(e).__name__}: {e}"}
+    return {
+        **row,
+        "status": "completed",
+        "run_id": report["run_id"],
+        "target_id": report["target_id"],
+        "summary": report["summary"],
+    }
+
+
+# Runner options fleet mode sets per target; they cannot be passed through.
+MANAGED_FLAGS = ("--profile", "--sut", "--out", "--generated-at", "--replay", "--list-tests", "--dry-run",
+                 "--target-id", "--resume")
+
+
+def _target_dirs(sut_paths: list[str]) -> list[str]:
+    """Stable, collision-free output directory names derived from SUT file stems.
+
+    A repeated stem gets the first free ``-2``, ``-3``, ... suffix, checked
+    against every name handed out so far (``sut-2`` may itself be a stem).
+    """
+    names, used = [], set()
+    for p in sut_paths:
+        stem = Path(p).stem.replace(".", "_") or "target"
+        name, n = stem, 1
+        while name in used:
+            n += 1
+            name = f"{stem}-{n}"
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def _names_flag(arg: str, flag: str) -> bool:
+    """Whether ``arg`` sets ``flag``: ``--flag``, ``--flag=value`` or an argparse abbreviation of either."""
+    name = arg.split("=", 1)[0]
+    return name.startswith("--") and len(name) > 2 and flag.startswith(name)
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="TRQP Conformance Suite fleet runner")
+    ap.add_argument("--profile", required=True, help="Path to profile YAML")
+    ap.add_argument("--sut", action="append", default=[], help="Path to a SUT config YAML (repeatable)")
+    ap.add_argument("--sut-list", default=None,
+                    help="Text file listing one SUT config path per line (blank lines and # comments ignored)")
+    ap.add_argument("--out", required=True, help="Fleet output directory; one evidence directory per target")
+    ap.add_argument("--workers", type=int, default=None,
+                    help="Number of parallel worker processes (default: min(targets, CPU count))")
+    ap.add_argument("--generated-at", default=None,
+                    help="Pin generated_at for every target (default: fleet start time)")
+    ap.add_argument("--resume", action="store_true",
+                    help="Resume an interrupted fleet in --out: journaled targets continue, completed "
+                         "targets are not re-run")
+    args, passthrough = ap.parse_known_args(argv)
+    passthrough = [a for a in passthrough if a != "--"]
+
+    sut_paths = list(args.sut)
+    if args.sut_list:
+        for line in Path(args.sut_list).read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                sut_paths.append(line)
+    if not sut_paths:
+        raise SystemExit("Provide at least one --sut or a --sut-list")
+    for flag in MANAGED_FLAGS:
+        if any(_names_flag(a, flag) for a in passthrough):
+            raise SystemExit(f"{flag} is managed by fleet mode and cannot be passed through")
+    if any(_names_flag(a, "--profile-runner") for a in passthrough):
+        raise SystemExit("--profile-runner profiles a single runner process and is not supported in fleet mode")
+
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    generated_at = args.generated_at or now_iso()
+    workers = args.workers or min(len(sut_paths), multiprocessing.cpu_count())
+    if workers < 1:
+        raise SystemExit("--workers must be >= 1")
+
+    jobs = [
+        ["--profile", args.profile, "--sut", sut_path, "--out", str(out / name), *passthrough]
+        + (["--resume", str(out / name)] if args.resume and (out / name).is_dir() else [])
+        for sut_path, name in zip(sut_paths, _target_dirs(sut_paths))
+    ]
+    # Validate the pass-through options once up front rather than once per target
+    runner_args = build_arg_parser().parse_args(jobs[0])
+    validate_args(runner_args)
+
+    plan = load_plan(Path(args.profile), use_cache=not runner_args.no_plan_cache)
+    with process_pool(workers, plan) as pool:
+        rows = list(pool.map(_run_target, jobs, [generated_at] * len(jobs)))
+
+    for row in rows:
+        row["out_dir"] = str(Path(row["out_dir"]).relative_to(out))
+    completed = [r for r in rows if r["status"] == "completed"]
+    summary = {
+        "fleet_summary_version": FLEET_SUMMARY_VERSION,
+        "generated_at": generated_at,
+        "profile_id": plan.profile.get("id"),
+        "suite_version": tool_version(),
+        "tool": {"name": "trqp-cts", "version": tool_version()},
+        "totals": {
+            "targets": len(rows),
+            "completed": len(completed),
+            "errored": len(rows) - len(completed),
+            "passing": sum(1 for r in completed if r["summary"]["exit_status"] == 0),
+        },
+        "targets": rows,
+    }
+    (out / "fleet-summary.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    totals = summary["totals"]
+    print(f"Fleet complete: {totals['completed']}/{totals['targets']} target(s) completed, "
+          f"{totals['passing']} passing, {totals['errored']} errored. Summary: {out}/fleet-summary.json")
+    return 0 if totals["errored"] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,322 @@
+"""CTS run history: a local SQLite index of archived runs for trend queries.
+
+``ingest`` reads run directories and ``bundle.zip`` archives (found the same
+way as corpus replay) and records, per run, the run metadata and summary
+counts, every verdict with its latency, HTTP method, path and status, and the
+artifact digests from ``manifest.json``. Ingest is incremental and idempotent:
+runs are keyed by ``test_run_id``, and a source whose path and modification
+time were already ingested is skipped without being opened. ``--force``
+re-reads every source and replaces the runs it holds.
+
+Queries then run against indexed tables instead of re-parsing every
+directory::
+
+    python cts/history.py ingest 'archive/nightly/*'
+    python cts/history.py last-pass --target https://sut.example.org --case TC-CTX-001
+    python cts/history.py trend --path /recognition
+    python cts/history.py regressions
+    python cts/history.py sql "SELECT target_id, COUNT(*) FROM runs GROUP BY 1"
+
+The database defaults to ``$CTS_HISTORY_DB`` or ``.cts-cache/history.sqlite``;
+every subcommand accepts ``--db``. Query subcommands print a table, or JSON
+rows with ``--json``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+import zipfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from cts.source import EvidenceSource, discover_evidence, open_evidence
+
+HISTORY_SCHEMA_VERSION = 1
+DEFAULT_DB = Path(".cts-cache") / "history.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    test_run_id TEXT PRIMARY KEY,
+    target_id TEXT,
+    profile_id TEXT,
+    started_at TEXT,
+    ended_at TEXT,
+    tool_version TEXT,
+    pass INTEGER, fail INTEGER, skip INTEGER, not_applicable INTEGER, error INTEGER, xfail INTEGER,
+    exit_status INTEGER,
+    source TEXT,
+    source_mtime_ns INTEGER,
+    ingested_at TEXT
+);
+CREATE TABLE IF NOT EXISTS verdicts (
+    test_run_id TEXT NOT NULL REFERENCES runs(test_run_id) ON DELETE CASCADE,
+    test_case_id TEXT NOT NULL,
+    result TEXT,
+    elapsed_ms REAL,
+    method TEXT,
+    path TEXT,
+    status INTEGER,
+    PRIMARY KEY (test_run_id, test_case_id)
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+    test_run_id TEXT NOT NULL REFERENCES runs(test_run_id) ON DELETE CASCADE,
+    path TEXT NOT NULL,
+    sha256 TEXT,
+    PRIMARY KEY (test_run_id, path)
+);
+CREATE INDEX IF NOT EXISTS runs_target_started ON runs (target_id, started_at);
+CREATE INDEX IF NOT EXISTS verdicts_case_result ON verdicts (test_case_id, result);
+CREATE INDEX IF NOT EXISTS verdicts_path ON verdicts (path);
+CREATE INDEX IF NOT EXISTS artifacts_sha256 ON artifacts (sha256);
+"""
+
+
+def default_db() -> Path:
+    return Path(os.environ.get("CTS_HISTORY_DB") or DEFAULT_DB)
+
+
+def connect(db: Path) -> sqlite3.Connection:
+    """Open (creating if needed) the history database at ``db``."""
+    db = Path(db)
+    db.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version not in (0, HISTORY_SCHEMA_VERSION):
+        raise SystemExit(f"{db}: history schema version {version} is not supported "
+                         f"(expected {HISTORY_SCHEMA_VERSION}); remove it and ingest again")
+    conn.executescript(_SCHEMA)
+    conn.execute(f"PRAGMA user_version={HISTORY_SCHEMA_VERSION}")
+    return conn
+
+
+def _read_run(source: EvidenceSource) -> tuple[dict, list[tuple], list[tuple]]:
+    """``(runs row, verdict rows, artifact rows)`` for one evidence set."""
+    run = source.read_json("run.json")
+    run_id = run["test_run_id"]
+    summary = source.read_json("cts-report.json").get("summary", {}) if source.exists("cts-report.json") else {}
+    verdicts = source.read_json("verdicts.json") if source.exists("verdicts.json") else []
+    row = {
+        "test_run_id": run_id,
+        "target_id": run.get("target_id"),
+        "profile_id": run.get("profile_id"),
+        "started_at": run.get("started_at"),
+        "ended_at": run.get("ended_at"),
+        "tool_version": (run.get("tool") or {}).get("version"),
+        "pass": summary.get("PASS"),
+        "fail": summary.get("FAIL"),
+        "skip": summary.get("SKIP"),
+        "not_applicable": summary.get("NOT_APPLICABLE"),
+        "error": summary.get("ERROR"),
+        "xfail": summary.get("XFAIL"),
+        "exit_status": summary.get("exit_status"),
+    }
+    verdict_rows = []
+    for verdict in verdicts:
+        tc_id = verdict["test_case_id"]
+        rel = f"cases/{tc_id}.json"
+        request, response = {}, {}
+        if source.exists(rel):
+            case = source.read_json(rel)
+            request, response = case.get("request") or {}, case.get("response") or {}
+        verdict_rows.append((run_id, tc_id, verdict.get("result"), verdict.get("elapsed_ms"),
+                             request.get("method"), request.get("path"), response.get("status")))
+    hashes = source.read_json("manifest.json").get("hashes", {}) if source.exists("manifest.json") else {}
+    artifact_rows = [(run_id, rel, digest) for rel, digest in hashes.items()]
+    return row, verdict_rows, artifact_rows
+
+
+def ingest(conn: sqlite3.Connection, paths: list[Path], force: bool = False) -> dict:
+    """Index each evidence set in ``paths``; returns ``{"ingested", "skipped", "errors"}``."""
+    stats = {"ingested": 0, "skipped": 0, "errors": []}
+    known = {} if force else {
+        source: mtime for source, mtime in conn.execute("SELECT source, source_mtime_ns FROM runs")}
+    ingested_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    for path in paths:
+        try:
+            mtime = path.stat().st_mtime_ns
+            if known.get(str(path)) == mtime:
+                stats["skipped"] += 1
+                continue
+            with open_evidence(path) as source:
+                row, verdict_rows, artifact_rows = _read_run(source)
+        except SystemExit as e:
+            stats["errors"].append(f"{path}: {e}")
+            continue
+        except (OSError, ValueError, KeyError, TypeError, zipfile.BadZipFile) as e:
+            stats["errors"].append(f"{path}: {type(e).__name__}: {e}")
+            continue
+        # One transaction per run: a failure later in the batch keeps the runs already indexed
+        with conn:
+            run_id = row["test_run_id"]
+            if not force and conn.execute("SELECT 1 FROM runs WHERE test_run_id = ?", (run_id,)).fetchone():
+                # Already indexed, from another copy or before this source was touched
+                conn.execute("UPDATE runs SET source_mtime_ns = ? WHERE test_run_id = ? AND source = ?",
+                             (mtime, run_id, str(path)))
+                stats["skipped"] += 1
+                continue
+            conn.execute("DELETE FROM runs WHERE test_run_id = ?", (run_id,))
+            row.update(source=str(path), source_mtime_ns=mtime, ingested_at=ingested_at)
+            conn.execute(f"INSERT INTO runs ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+                         tuple(row.values()))
+            conn.executemany("INSERT INTO verdicts VALUES (?, ?, ?, ?, ?, ?, ?)", verdict_rows)
+            conn.executemany("INSERT INTO artifacts VALUES (?, ?, ?)", artifact_rows)
+            stats["ingested"] += 1
+    return stats
+
+
+def last_pass(conn: sqlite3.Connection, test_case_id: str, target_id: str | None = None) -> list[sqlite3.Row]:
+    """The most recent passing run of ``test_case_id``, per target."""
+    return conn.execute("""
+        SELECT r.target_id, r.test_run_id, MAX(r.started_at) AS started_at, v.elapsed_ms
+        FROM verdicts v JOIN runs r USING (test_run_id)
+        WHERE v.test_case_id = ? AND v.result = 'PASS' AND (? IS NULL OR r.target_id = ?)
+        GROUP BY r.target_id ORDER BY r.target_id
+    """, (test_case_id, target_id, target_id)).fetchall()
+
+
+def latency_trend(conn: sqlite3.Connection, path: str, target_id: str | None = None,
+                  since: str | None = None) -> list[sqlite3.Row]:
+    """Per-run latency of the cases calling ``path``, oldest first."""
+    return conn.execute("""
+        SELECT r.started_at, r.target_id, r.test_run_id, COUNT(*) AS cases,
+               ROUND(AVG(v.elapsed_ms), 1) AS avg_ms, MIN(v.elapsed_ms) AS min_ms, MAX(v.elapsed_ms) AS max_ms
+        FROM verdicts v JOIN runs r USING (test_run_id)
+        WHERE v.path = ? AND v.elapsed_ms IS NOT NULL
+          AND (? IS NULL OR r.target_id = ?) AND (? IS NULL OR r.started_at >= ?)
+        GROUP BY r.test_run_id ORDER BY r.started_at, r.target_id
+    """, (path, target_id, target_id, since, since)).fetchall()
+
+
+def regressions(conn: sqlite3.Connection, target_id: str | None = None) -> list[sqlite3.Row]:
+    """Cases that passed in a target's previous run and fail (or error) in its latest run."""
+    return conn.execute("""
+        WITH ranked AS (
+            SELECT test_run_id, target_id, started_at,
+                   ROW_NUMBER() OVER (PARTITION BY target_id ORDER BY started_at DESC, test_run_id DESC) AS recency
+            FROM runs WHERE ? IS NULL OR target_id = ?
+        )
+        SELECT cur.target_id, vc.test_case_id, vp.result AS previous_result, vc.result,
+               prev.test_run_id AS previous_run_id, cur.test_run_id, cur.started_at
+        FROM ranked cur
+        JOIN ranked prev ON prev.target_id = cur.target_id AND prev.recency = 2
+        JOIN verdicts vc ON vc.test_run_id = cur.test_run_id
+        JOIN verdicts vp ON vp.test_run_id = prev.test_run_id AND vp.test_case_id = vc.test_case_id
+        WHERE cur.recency = 1 AND vp.result = 'PASS' AND vc.result IN ('FAIL', 'ERROR')
+        ORDER BY cur.target_id, vc.test_case_id
+    """, (target_id, target_id)).fetchall()
+
+
+def list_runs(conn: sqlite3.Connection, target_id: str | None = None, limit: int = 50) -> list[sqlite3.Row]:
+    return conn.execute("""
+        SELECT test_run_id, target_id, profile_id, started_at, pass, fail, error, exit_status
+        FROM runs WHERE ? IS NULL OR target_id = ? ORDER BY started_at DESC, test_run_id LIMIT ?
+    """, (target_id, target_id, limit)).fetchall()
+
+
+def print_rows(rows: list[sqlite3.Row], as_json: bool) -> None:
+    dicts = [dict(r) for r in rows]
+    if as_json:
+        print(json.dumps(dicts, indent=2))
+        return
+    if not dicts:
+        print("(no rows)")
+        return
+    columns = list(dicts[0])
+    cells = [[("" if d[c] is None else str(d[c])) for c in columns] for d in dicts]
+    widths = [max(len(c), *(len(row[i]) for row in cells)) for i, c in enumerate(columns)]
+    print("  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    for row in cells:
+        print("  ".join(v.ljust(w) for v, w in zip(row, widths)))
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="TRQP Conformance Suite run history index")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--db", type=Path, default=None,
+                        help="History database (default: $CTS_HISTORY_DB or .cts-cache/history.sqlite)")
+    query = argparse.ArgumentParser(add_help=False, parents=[common])
+    query.add_argument("--json", action="store_true", help="Print rows as JSON")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("ingest", parents=[common], help="Index run directories and bundles")
+    p.add_argument("runs", nargs="+", help="Run directories, bundle.zip files, directory trees or glob patterns")
+    p.add_argument("--force", action="store_true", help="Re-read every source and replace its indexed runs")
+
+    p = sub.add_parser("runs", parents=[query], help="List indexed runs, newest first")
+    p.add_argument("--target", default=None)
+    p.add_argument("--limit", type=int, default=50)
+
+    p = sub.add_parser("last-pass", parents=[query], help="When each target last passed a test case")
+    p.add_argument("--case", required=True, help="Test case id, e.g. TC-CTX-001")
+    p.add_argument("--target", default=None)
+
+    p = sub.add_parser("trend", parents=[query], help="Per-run latency of the cases calling an endpoint path")
+    p.add_argument("--path", required=True, help="Request path, e.g. /recognition")
+    p.add_argument("--target", default=None)
+    p.add_argument("--since", default=None, help="Only runs started at or after this ISO-8601 timestamp")
+
+    p = sub.add_parser("regressions", parents=[query], help="Cases that passed in each target's previous run and fail in its latest")
+    p.add_argument("--target", default=None)
+
+    p = sub.add_parser("sql", parents=[query], help="Run a read-only SQL query against the index")
+    p.add_argument("statement")
+
+    args = ap.parse_args(argv)
+    db = args.db or default_db()
+
+    if args.command == "ingest":
+        paths = discover_evidence(args.runs)
+        if not paths:
+            raise SystemExit("No run directories (with a cases/ subdirectory) or bundles found under: "
+                             + ", ".join(args.runs))
+        started = time.perf_counter()
+        conn = connect(db)
+        try:
+            stats = ingest(conn, paths, force=args.force)
+            total = conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+        finally:
+            conn.close()
+        for error in stats["errors"]:
+            print(f"[FAIL] {error}")
+        print(f"History ingest: {stats['ingested']} run(s) ingested, {stats['skipped']} unchanged, "
+              f"{len(stats['errors'])} failed in {time.perf_counter() - started:.2f} s; "
+              f"{total} run(s) indexed in {db}")
+        return 1 if stats["errors"] else 0
+
+    if not db.is_file():
+        raise SystemExit(f"No history database at {db}; run 'ingest' first")
+    conn = connect(db)
+    try:
+        if args.command == "runs":
+            rows = list_runs(conn, args.target, args.limit)
+        elif args.command == "last-pass":
+            rows = last_pass(conn, args.case, args.target)
+        elif args.command == "trend":
+            rows = latency_trend(conn, args.path, args.target, args.since)
+        elif args.command == "regressions":
+            rows = regressions(conn, args.target)
+        else:
+            conn.execute("PRAGMA query_only=ON")
+            try:
+                rows = conn.execute(args.statement).fetchall()
+            except sqlite3.Error as e:
+                raise SystemExit(f"SQL error: {e}") from None
+    finally:
+        conn.close()
+    print_rows(rows, args.json)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,113 @@
+"""Append-only run journal for crash-safe, resumable runs.
+
+While a run executes, ``journal.jsonl`` in the output directory records one
+JSON line per event and is flushed and fsynced after every line:
+
+- a ``run`` header (plan digest and the ``run.json`` metadata), written before
+  the first case executes;
+- one ``case`` record per finished case (case file path, SHA-256, size,
+  verdict, any spilled response body and, on live runs, the nanoseconds spent
+  writing the case file), appended after the case file is written.
+
+If the runner is killed (CI timeout, OOM, SUT outage), ``--resume <out>``
+reads the journal back, re-hashes every journaled case file, skips the cases
+whose files still match, executes the rest and then writes ``run.json``,
+``verdicts.json``, the manifest, signature, bundle and descriptor as usual.
+A torn final line (the process died mid-write) is ignored, and cut off
+before the resumed run appends to the journal.
+
+The journal is operational state, not evidence: it is never listed in the
+manifest, checksums or bundle, and it is removed once the evidence set is
+complete.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+JOURNAL_NAME = "journal.jsonl"
+JOURNAL_FORMAT = 1
+
+
+class RunJournal:
+    """Appends durable JSON lines to ``out/journal.jsonl``."""
+
+    def __init__(self, path: Path, mode: str = "a"):
+        self.path = Path(path)
+        self._f = open(self.path, mode, encoding="utf-8")
+
+    @classmethod
+    def create(cls, out: Path, plan_sha256: str, run: dict) -> "RunJournal":
+        """Start a new journal (replacing any stale one) with the run header."""
+        journal = cls(Path(out) / JOURNAL_NAME, mode="w")
+        journal.append({"type": "run", "journal_format": JOURNAL_FORMAT, "plan_sha256": plan_sha256, "run": run})
+        return journal
+
+    @classmethod
+    def resume(cls, out: Path) -> "RunJournal":
+        """Reopen an interrupted run's journal for appending, dropping a torn final line first."""
+        path = Path(out) / JOURNAL_NAME
+        with open(path, "r+b") as f:
+            data = f.read()
+            keep = data.rfind(b"\n") + 1
+            if keep < len(data):
+                f.truncate(keep)
+                f.flush()
+                os.fsync(f.fileno())
+        return cls(path)
+
+    def append(self, record: dict) -> None:
+        self._f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._f.flush()
+        os.fsync(self._f.fileno())
+
+    def case(self, rel: str, digest: str, size: int, verdict: dict, attachments: list[dict] = (),
+             evidence_write_ns: int | None = None) -> None:
+        """Record a finished case; ``attachments`` are side files (``path``/``sha256``/``size``) it references."""
+        record = {"type": "case", "test_case_id": verdict["test_case_id"], "path": rel,
+                  "sha256": digest, "size": size, "verdict": verdict}
+        if attachments:
+            record["attachments"] = list(attachments)
+        if evidence_write_ns is not None:
+            record["evidence_write_ns"] = evidence_write_ns
+        self.append(record)
+
+    def close(self) -> None:
+        self._f.close()
+
+    def remove(self) -> None:
+        """Close and delete the journal once the evidence set is complete."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+
+def read_journal(out: Path) -> tuple[dict, dict[str, dict]] | None:
+    """Return ``(header, {test_case_id: case record})`` for ``out``, or None if there is no journal.
+
+    Later records for the same case win; a torn trailing line is ignored.
+    """
+    path = Path(out) / JOURNAL_NAME
+    if not path.is_file():
+        return None
+    header, cases = None, {}
+    lines = path.read_text(encoding="utf-8").split("\n")
+    for lineno, line in enumerate(lines, start=1):
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            if lineno == len(lines):
+                break  # torn final write (no trailing newline)
+            raise SystemExit(f"Corrupt run journal {path} at line {lineno}")
+        if record.get("type") == "run":
+            header = record
+        elif record.get("type") == "case":
+            cases[record["test_case_id"]] = record
+    if header is None:
+        raise SystemExit(f"Run journal {path} has no run header")
+    if header.get("journal_format") != JOURNAL_FORMAT:
+        raise SystemExit(f"Unsupported run journal format in {path}: {header.get('journal_format')}")
+    return header, cases
@@ -0,0 +1,123 @@
+"""Compiled JSONPath-like accessors for CTS assertions.
+
+Path expressions are tokenized once into a :class:`JsonPath` and cached, so a
+sweep that evaluates the same ``json_path_*`` expectations against thousands
+of responses pays for parsing once per distinct path.
+
+Supported syntax (unchanged from the original runner accessor):
+
+- ``$.a.b.c``
+- ``$.a[0].b``
+- ``$["key.with.dots"].a``
+- wildcard array iteration: ``$.items[*].id`` (returns the list of matches)
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+_KEY, _INDEX, _WILDCARD = 0, 1, 2
+
+
+def _tokenize(path: str) -> list[tuple[int, object]]:
+    if not path.startswith("$"):
+        raise ValueError("Only supports paths starting with $")
+
+    i = 1
+    tokens = []
+    while i < len(path):
+        if path[i] == ".":
+            i += 1
+            j = i
+            while j < len(path) and path[j] not in ".[":
+                j += 1
+            tokens.append((_KEY, path[i:j]))
+            i = j
+        elif path[i] == "[":
+            j = path.find("]", i)
+            if j == -1:
+                raise ValueError(f"Unclosed [ in path: {path}")
+            inner = path[i+1:j]
+            if inner == "*":
+                tokens.append((_WILDCARD, None))
+            elif (inner.startswith('"') and inner.endswith('"')) or (inner.startswith("'") and inner.endswith("'")):
+                tokens.append((_KEY, inner[1:-1]))
+            else:
+                tokens.append((_INDEX, int(inner)))
+            i = j + 1
+        else:
+            raise ValueError(f"Unexpected character in path at {i}: {path[i]} ({path})")
+    return tokens
+
+
+def _walk(cur, steps: tuple):
+    for kind, val in steps:
+        if kind == _KEY:
+            if not isinstance(cur, dict):
+                return None
+            cur = cur.get(val)
+        elif kind == _INDEX:
+            if not isinstance(cur, list) or not 0 <= val < len(cur):
+                return None
+            cur = cur[val]
+        else:
+            # A wildcard after the first one yields a copy of the array itself;
+            # only the first wildcard in a path fans out.
+            if not isinstance(cur, list):
+                return None
+            cur = cur[:]
+        if cur is None:
+            return None
+    return cur
+
+
+class JsonPath:
+    """A path expression tokenized once and evaluated with :meth:`get`."""
+
+    __slots__ = ("path", "_head", "_tail", "_fan_out")
+
+    def __init__(self, path: str):
+        tokens = _tokenize(path)
+        self.path = path
+        split = next((n for n, (kind, _) in enumerate(tokens) if kind == _WILDCARD), None)
+        self._fan_out = split is not None
+        self._head = tuple(tokens if split is None else tokens[:split])
+        self._tail = () if split is None else tuple(tokens[split + 1:])
+
+    def get(self, doc):
+        cur = _walk(doc, self._head)
+        if not self._fan_out or cur is None:
+            return cur
+        if not isinstance(cur, list):
+            return None
+        tail = self._tail
+        if not tail:
+            return [item for item in cur if item is not None]
+        out = []
+        for item in cur:
+            c = _walk(item, tail)
+            if c is not None:
+                out.append(c)
+        return out
+
+    def __repr__(self) -> str:
+        return f"JsonPath({self.path!r})"
+
+
+@lru_cache(maxsize=4096)
+def compile_json_path(path: str) -> JsonPath:
+    """Return the compiled accessor for ``path`` (cached per process)."""
+    return JsonPath(path)
+
+
+def json_path_get(doc, path: str):
+    """
+    Minimal JSONPath-like accessor.
+
+    Supports:
+      - $.a.b.c
+      - $.a[0].b
+      - $["key.with.dots"].a
+      - wildcard array iteration: $.items[*].id  (returns list of matches)
+    """
+    return compile_json_path(path).get(doc)
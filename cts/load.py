@@ -0,0 +1,274 @@
+"""Load / soak mode for the CTS runner.
+
+Replays selected test cases against a live SUT for a fixed duration and
+summarises how the registry behaves under relying-party load:
+
+- **open loop** (``rps`` set): requests are released on a fixed schedule
+  regardless of how fast the SUT answers. Latency is measured from each
+  request's *intended* send time, which corrects for coordinated omission
+  (a stalled SUT cannot hide its backlog by slowing the load generator).
+  The blocking driver queues at most ``concurrency`` requests behind those
+  in flight; further releases wait for a slot, and the wait counts towards
+  their latency, so memory stays bounded however long the SUT stalls.
+- **closed loop** (``rps`` unset): ``concurrency`` workers each send the next
+  request as soon as the previous one completes.
+
+The result is written as ``load-report.json`` and becomes part of the signed
+evidence set (manifest, bundle descriptor, checksums).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+LOAD_REPORT_VERSION = "0.1.0"
+PERCENTILES = (("p50", 50.0), ("p90", 90.0), ("p99", 99.0), ("p99.9", 99.9))
+
+
+class LatencyHistogram:
+    """Log-linear latency histogram with three significant digits (microsecond base).
+
+    Memory is bounded by the value range rather than the sample count, so soak
+    runs of millions of requests stay cheap.
+    """
+
+    def __init__(self):
+        self.counts: dict[int, int] = {}
+        self.total = 0
+        self.sum_us = 0
+        self.min_us: int | None = None
+        self.max_us = 0
+
+    @staticmethod
+    def _bucket(us: int) -> int:
+        if us < 1000:
+            return us
+        scale = 10 ** (int(math.log10(us)) - 2)
+        return -(-us // scale) * scale  # round up to 3 significant digits
+
+    def record(self, seconds: float) -> None:
+        us = max(0, int(seconds * 1_000_000))
+        key = self._bucket(us)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.total += 1
+        self.sum_us += us
+        self.min_us = us if self.min_us is None else min(self.min_us, us)
+        self.max_us = max(self.max_us, us)
+
+    def percentile(self, pct: float) -> float | None:
+        if not self.total:
+            return None
+        rank = max(1, math.ceil(self.total * pct / 100.0))
+        seen = 0
+        for key in sorted(self.counts):
+            seen += self.counts[key]
+            if seen >= rank:
+                return min(key, self.max_us) / 1000.0
+        return self.max_us / 1000.0
+
+    def summary(self) -> dict:
+        if not self.total:
+            return {"count": 0}
+        out = {
+            "count": self.total,
+            "min": self.min_us / 1000.0,
+            "mean": round(self.sum_us / self.total / 1000.0, 3),
+            "max": self.max_us / 1000.0,
+        }
+        for name, pct in PERCENTILES:
+            out[name] = self.percentile(pct)
+        return out
+
+    def buckets(self) -> list[dict]:
+        return [{"le_ms": key / 1000.0, "count": self.counts[key]} for key in sorted(self.counts)]
+
+
+class _Recorder:
+    """Thread-safe accumulator for load samples."""
+
+    def __init__(self, started: float):
+        self.started = started
+        self.lock = threading.Lock()
+        self.overall = LatencyHistogram()
+        self.per_test: dict[str, LatencyHistogram] = {}
+        self.timeline: dict[int, dict] = {}
+        self.status_counts: dict[str, int] = {}
+        self.errors: dict[str, int] = {}
+        self.requests = 0
+        self.error_count = 0
+
+    def record(self, tc_id: str, intended: float, finished: float, status: int | None,
+               error: str | None, expected: bool) -> None:
+        latency = finished - intended
+        second = int(finished - self.started)
+        with self.lock:
+            self.requests += 1
+            self.overall.record(latency)
+            self.per_test.setdefault(tc_id, LatencyHistogram()).record(latency)
+            slot = self.timeline.setdefault(second, {"t": second, "completed": 0, "errors": 0})
+            slot["completed"] += 1
+            if status is not None:
+                self.status_counts[str(status)] = self.status_counts.get(str(status), 0) + 1
+            if error is not None:
+                self.errors[f"exception:{error}"] = self.errors.get(f"exception:{error}", 0) + 1
+            elif not expected:
+                self.errors[f"unexpected_status:{status}"] = self.errors.get(f"unexpected_status:{status}", 0) + 1
+            if error is not None or not expected:
+                self.error_count += 1
+                slot["errors"] += 1
+
+
+def _status_expected(tc: dict, status: int) -> bool:
+    exp = tc.get("expect", {})
+    if "status" in exp:
+        return status == exp["status"]
+    if "status_in" in exp:
+        return status in exp["status_in"]
+    return status < 500
+
+
+def select_load_tests(tests: list, profile: dict, ids: list[str] | None) -> list[dict]:
+    """Resolve the test cases to replay under load (default: every applicable non-serial case)."""
+    by_id = {tc["id"]: tc for tc in tests}
+    if ids:
+        unknown = [i for i in ids if i not in by_id]
+        if unknown:
+            raise SystemExit(f"--load-tests: unknown test case id(s): {', '.join(unknown)}")
+        selected = [by_id[i] for i in ids]
+    else:
+        selected = [tc for tc in tests if not tc.get("serial")]
+    applicable = []
+    for tc in selected:
+        profiles = tc.get("profiles")
+        if profiles and profile.get("id") not in profiles:
+            if ids:
+                raise SystemExit(f"--load-tests: {tc['id']} is not applicable to profile {profile.get('id')}")
+            continue
+        if tc.get("serial"):
+            raise SystemExit(f"--load-tests: {tc['id']} is marked serial and cannot be load-tested")
+        applicable.append(tc)
+    if not applicable:
+        raise SystemExit("--load: no applicable test cases selected")
+    return applicable
+
+
+def _sync_fire(tc: dict, ctx: dict, prepare: Callable, recorder: _Recorder, intended: float) -> None:
+    status, error, expected = None, None, False
+    try:
+        headers, body = prepare(tc, ctx)
+        resp, _ = ctx["transport"].request(ctx["base_url"], tc.get("method", "POST").upper(), tc["path"], headers, body)
+        status = resp.status_code
+        expected = _status_expected(tc, status)
+    except Exception as e:
+        error = type(e).__name__
+    recorder.record(tc["id"], intended, time.perf_counter(), status, error, expected)
+
+
+async def _async_fire(tc: dict, ctx: dict, prepare: Callable, recorder: _Recorder, intended: float) -> None:
+    status, error, expected = None, None, False
+    try:
+        headers, body = prepare(tc, ctx)
+        resp, _ = await ctx["transport"].request(ctx["base_url"], tc.get("method", "POST").upper(), tc["path"], headers, body)
+        status = resp.status_code
+        expected = _status_expected(tc, status)
+    except Exception as e:
+        error = type(e).__name__
+    recorder.record(tc["id"], intended, time.perf_counter(), status, error, expected)
+
+
+def run_load(tests: list, ctx: dict, prepare: Callable, duration: float, rps: float | None = None,
+             concurrency: int = 1) -> dict:
+    """Drive load over the blocking transport and return the load report."""
+    started = time.perf_counter()
+    recorder = _Recorder(started)
+    deadline = started + duration
+    if rps:
+        interval = 1.0 / rps
+        slots = threading.BoundedSemaphore(2 * concurrency)
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="cts-load") as pool:
+            for i in itertools.count():
+                intended = started + i * interval
+                if intended >= deadline:
+                    break
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                slots.acquire()
+                future = pool.submit(_sync_fire, tests[i % len(tests)], ctx, prepare, recorder, intended)
+                future.add_done_callback(lambda _: slots.release())
+    else:
+        counter = itertools.count()
+
+        def worker():
+            while time.perf_counter() < deadline:
+                tc = tests[next(counter) % len(tests)]
+                _sync_fire(tc, ctx, prepare, recorder, time.perf_counter())
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="cts-load") as pool:
+            for _ in range(concurrency):
+                pool.submit(worker)
+    return build_load_report(recorder, tests, duration, rps, concurrency, time.perf_counter() - started)
+
+
+async def run_load_async(tests: list, ctx: dict, prepare: Callable, duration: float, rps: float | None = None,
+                         concurrency: int = 1) -> dict:
+    """Drive load over the asyncio transport; the transport bounds requests in flight."""
+    started = time.perf_counter()
+    recorder = _Recorder(started)
+    deadline = started + duration
+    if rps:
+        interval = 1.0 / rps
+        tasks: set[asyncio.Task] = set()  # only unfinished requests; completed tasks drop out
+        for i in itertools.count():
+            intended = started + i * interval
+            if intended >= deadline:
+                break
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            task = asyncio.create_task(_async_fire(tests[i % len(tests)], ctx, prepare, recorder, intended))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        await asyncio.gather(*tasks)
+    else:
+        counter = itertools.count()
+
+        async def worker():
+            while time.perf_counter() < deadline:
+                tc = tests[next(counter) % len(tests)]
+                await _async_fire(tc, ctx, prepare, recorder, time.perf_counter())
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return build_load_report(recorder, tests, duration, rps, concurrency, time.perf_counter() - started)
+
+
+def build_load_report(recorder: _Recorder, tests: list, duration: float, rps: float | None,
+                      concurrency: int, wall_seconds: float) -> dict:
+    return {
+        "load_report_version": LOAD_REPORT_VERSION,
+        "mode": "open_loop" if rps else "closed_loop",
+        "target_rps": rps,
+        "concurrency": concurrency,
+        "duration_s": duration,
+        "wall_time_s": round(wall_seconds, 3),
+        "coordinated_omission_corrected": bool(rps),
+        "test_case_ids": [tc["id"] for tc in tests],
+        "summary": {
+            "requests": recorder.requests,
+            "errors": recorder.error_count,
+            "error_rate": round(recorder.error_count / recorder.requests, 6) if recorder.requests else 0.0,
+            "achieved_rps": round(recorder.requests / wall_seconds, 3) if wall_seconds > 0 else 0.0,
+        },
+        "latency_ms": recorder.overall.summary(),
+        "per_test": {tc_id: {"latency_ms": h.summary()} for tc_id, h in sorted(recorder.per_test.items())},
+        "histogram_ms": recorder.overall.buckets(),
+        "throughput_timeline": [recorder.timeline[k] for k in sorted(recorder.timeline)],
+        "status_counts": dict(sorted(recorder.status_counts.items())),
+        "error_breakdown": dict(sorted(recorder.errors.items())),
+    }
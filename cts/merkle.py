@@ -0,0 +1,137 @@
+"""Merkle-tree manifests: a signed root and per-artifact inclusion proofs.
+
+With ``evidence.manifest_mode: merkle`` in the profile, the run writes two
+artifacts next to the flat ``manifest.json``:
+
+- ``manifest-merkle.json``: the tree size and root hash over every artifact
+  that ``manifest.json`` lists at that point (signed as ``manifest-merkle.sig``
+  when ``sign_manifest`` is set). It is a few hundred bytes however many cases
+  the run has.
+- ``manifest-proofs.jsonl``: one line per artifact, in manifest order, with its
+  path, SHA-256, leaf index and inclusion proof.
+
+The tree follows RFC 9162 (Certificate Transparency v2) section 2.1: leaves
+are ``SHA-256(0x00 || leaf)``, interior nodes ``SHA-256(0x01 || left ||
+right)``, and an unbalanced tree splits at the largest power of two below its
+size. A leaf binds an artifact's path to its digest:
+``path (UTF-8) || 0x00 || sha256 (32 raw bytes)``.
+
+Proving one ``cases/<id>.json`` authentic therefore takes the root document,
+that artifact's proof line and ``log2(n)`` hashes, instead of the complete
+manifest (see :func:`cts.verify.verify_artifact`).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+
+MERKLE_VERSION = "0.1.0"
+MANIFEST_MODES = ("flat", "merkle")
+ROOT_NAME = "manifest-merkle.json"
+ROOT_SIG_NAME = "manifest-merkle.sig"
+PROOFS_NAME = "manifest-proofs.jsonl"
+LEAF_ENCODING = "sha256(0x00 || utf8(path) || 0x00 || sha256(artifact))"
+
+
+def manifest_mode(profile) -> str:
+    """The profile's ``evidence.manifest_mode``, validated."""
+    mode = (profile.get("evidence") or {}).get("manifest_mode", "flat")
+    if mode not in MANIFEST_MODES:
+        raise SystemExit(f"evidence.manifest_mode must be one of {', '.join(MANIFEST_MODES)} (got {mode!r})")
+    return mode
+
+
+def leaf_hash(path: str, sha256_hex: str) -> bytes:
+    return hashlib.sha256(b"\x00" + path.encode("utf-8") + b"\x00" + bytes.fromhex(sha256_hex)).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+class MerkleTree:
+    """All levels of the tree over ``leaves`` (leaf hashes), built bottom-up.
+
+    Pairing nodes level by level and carrying an unpaired last node up
+    unchanged yields the same tree as RFC 9162's recursive definition.
+    """
+
+    def __init__(self, leaves: list[bytes]):
+        self.size = len(leaves)
+        self.levels = [list(leaves)]
+        level = self.levels[0]
+        while len(level) > 1:
+            level = [node_hash(level[i], level[i + 1]) if i + 1 < len(level) else level[i]
+                     for i in range(0, len(level), 2)]
+            self.levels.append(level)
+
+    @property
+    def root(self) -> bytes:
+        return self.levels[-1][0] if self.size else hashlib.sha256(b"").digest()
+
+    def proof(self, index: int) -> list[bytes]:
+        """Inclusion proof (audit path, leaf to root) for the leaf at ``index``."""
+        if not 0 <= index < self.size:
+            raise IndexError(f"leaf index {index} out of range for tree size {self.size}")
+        path = []
+        for level in self.levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                path.append(level[sibling])
+            index >>= 1
+        return path
+
+
+def root_from_proof(leaf: bytes, index: int, size: int, proof: list[bytes]) -> bytes | None:
+    """Root implied by an inclusion proof (RFC 9162 section 2.1.3.2), or None if the proof is malformed."""
+    if not 0 <= index < size:
+        return None
+    fn, sn, r = index, size - 1, leaf
+    for p in proof:
+        if sn == 0:
+            return None
+        if fn & 1 or fn == sn:
+            r = node_hash(p, r)
+            while not fn & 1 and fn != 0:
+                fn >>= 1
+                sn >>= 1
+        else:
+            r = node_hash(r, p)
+        fn >>= 1
+        sn >>= 1
+    return r if sn == 0 else None
+
+
+def build_merkle_manifest(generated_at: str, hashes: dict[str, str]) -> tuple[bytes, bytes]:
+    """``(manifest-merkle.json bytes, manifest-proofs.jsonl bytes)`` over ``{path: sha256}`` in order."""
+    paths = list(hashes)
+    tree = MerkleTree([leaf_hash(rel, hashes[rel]) for rel in paths])
+    root_doc = {
+        "merkle_version": MERKLE_VERSION,
+        "generated_at": generated_at,
+        "hash_alg": "sha256",
+        "tree": "rfc9162",
+        "leaf_encoding": LEAF_ENCODING,
+        "tree_size": tree.size,
+        "root": tree.root.hex(),
+        "proofs": PROOFS_NAME,
+    }
+    lines = [
+        json.dumps({"index": index, "path": rel, "sha256": hashes[rel],
+                    "proof": [h.hex() for h in tree.proof(index)]}, separators=(",", ":"))
+        for index, rel in enumerate(paths)
+    ]
+    proofs = ("\n".join(lines) + "\n" if lines else "").encode("utf-8")
+    return json.dumps(root_doc, indent=2).encode("utf-8"), proofs
+
+
+def find_proof(lines, rel: str) -> dict | None:
+    """The entry for ``rel`` among ``manifest-proofs.jsonl`` lines (bytes), or None."""
+    needle = json.dumps(rel).encode("utf-8")
+    for line in lines:
+        if needle in line:
+            entry = json.loads(line)
+            if entry.get("path") == rel:
+                return entry
+    return None
@@ -0,0 +1,322 @@
+"""Compiled, immutable execution plans for the CTS runner.
+
+A plan is the suite (``tests/core_tests.yaml``) resolved against one profile:
+profile gating is decided, every ``expect`` block is interpreted into an
+:class:`Expectations` record with precompiled JSONPath accessors, and (once
+bound to a SUT) request bodies carry the SUT identifier overrides.
+
+Compiled plans are cached on disk as JSON, keyed by the SHA-256 of the suite
+file, the profile file and this compiler, so repeat invocations skip YAML
+parsing and expect-block interpretation. The cache lives in ``.cts-cache/``
+at the repository root (override with ``CTS_PLAN_CACHE_DIR``) and can be
+bypassed with ``--no-plan-cache``. A stale or unreadable cache entry is simply
+recompiled.
+
+:func:`process_pool` hands a plan to worker processes (fleet targets, corpus
+runs, parallel replay): workers read it back with :func:`shared_plan`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections.abc import Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from functools import cached_property
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+
+from cts.jsonpath import JsonPath, compile_json_path
+
+ROOT = Path(__file__).resolve().parent.parent
+SUITE_PATH = ROOT / "tests/core_tests.yaml"
+PLAN_FORMAT = 1
+CACHE_DIR_ENV = "CTS_PLAN_CACHE_DIR"
+DEFAULT_CACHE_DIR = ROOT / ".cts-cache"
+
+
+def apply_identifier_overrides(body: dict | None, identifiers: Mapping) -> dict | None:
+    """Replace placeholder identifier values in a request body with SUT-specific overrides."""
+    if body is None:
+        return body
+    result = dict(body)
+    for field in ("authority_id", "entity_id", "subject_authority_id", "action"):
+        if field in result:
+            result[field] = identifiers[field]
+    return result
+
+
+@dataclass(frozen=True)
+class Expectations:
+    """An interpreted ``expect`` block.
+
+    ``has_status``/``has_status_in`` record key presence separately from the
+    value so assertion output matches the raw-dict semantics exactly.
+    """
+
+    has_status: bool = False
+    status: Any = None
+    has_status_in: bool = False
+    status_in: Any = None
+    needs_json: bool = False
+    header_contains: tuple[tuple[str, Any], ...] = ()
+    schema: str | None = None
+    json_path_exists: tuple[JsonPath, ...] = ()
+    json_path_equals: tuple[tuple[JsonPath, Any], ...] = ()
+    json_path_in: tuple[tuple[JsonPath, Any], ...] = ()
+
+    @classmethod
+    def compile(cls, exp: Mapping) -> "Expectations":
+        return cls(
+            has_status="status" in exp,
+            status=exp.get("status"),
+            has_status_in="status_in" in exp,
+            status_in=exp.get("status_in"),
+            needs_json=bool(any(k in exp for k in ["schema", "json_path_exists", "json_path_equals"])
+                            or exp.get("response_json")),
+            header_contains=tuple((exp.get("response_header_contains") or {}).items()),
+            schema=exp.get("schema") or None,
+            json_path_exists=tuple(compile_json_path(p) for p in exp.get("json_path_exists") or ()),
+            json_path_equals=tuple((compile_json_path(p), v) for p, v in exp.get("json_path_equals") or ()),
+            json_path_in=tuple((compile_json_path(p), v) for p, v in exp.get("json_path_in") or ()),
+        )
+
+    def to_json(self) -> dict:
+        return {
+            "has_status": self.has_status,
+            "status": self.status,
+            "has_status_in": self.has_status_in,
+            "status_in": self.status_in,
+            "needs_json": self.needs_json,
+            "header_contains": [list(pair) for pair in self.header_contains],
+            "schema": self.schema,
+            "json_path_exists": [p.path for p in self.json_path_exists],
+            "json_path_equals": [[p.path, v] for p, v in self.json_path_equals],
+            "json_path_in": [[p.path, v] for p, v in self.json_path_in],
+        }
+
+    @classmethod
+    def from_json(cls, doc: dict) -> "Expectations":
+        return cls(
+            has_status=doc["has_status"],
+            status=doc["status"],
+            has_status_in=doc["has_status_in"],
+            status_in=doc["status_in"],
+            needs_json=doc["needs_json"],
+            header_contains=tuple((k, v) for k, v in doc["header_contains"]),
+            schema=doc["schema"],
+            json_path_exists=tuple(compile_json_path(p) for p in doc["json_path_exists"]),
+            json_path_equals=tuple((compile_json_path(p), v) for p, v in doc["json_path_equals"]),
+            json_path_in=tuple((compile_json_path(p), v) for p, v in doc["json_path_in"]),
+        )
+
+
+@dataclass(frozen=True, eq=False)
+class PlannedCase(Mapping):
+    """One suite entry resolved for a profile.
+
+    Also behaves as a read-only mapping over the suite definition, so code
+    written against raw test dicts (``tc["id"]``, ``tc.get("serial")``) works
+    unchanged.
+    """
+
+    definition: Mapping
+    applicable: bool
+    expectations: Expectations
+    body: Any = None
+
+    @property
+    def id(self) -> str:
+        return self.definition["id"]
+
+    def __getitem__(self, key):
+        return self.definition[key]
+
+    def __iter__(self):
+        return iter(self.definition)
+
+    def __len__(self) -> int:
+        return len(self.definition)
+
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """The suite compiled against one profile (and optionally bound to a SUT)."""
+
+    profile: Mapping
+    cases: tuple[PlannedCase, ...]
+    sha256: str
+    identifiers: Mapping | None = None
+
+    @cached_property
+    def by_id(self) -> Mapping[str, PlannedCase]:
+        return MappingProxyType({case.id: case for case in self.cases})
+
+    def with_identifiers(self, identifiers: Mapping) -> "ExecutionPlan":
+        """Bind SUT identifier overrides into every request body."""
+        cases = tuple(
+            replace(case, body=apply_identifier_overrides(case.definition.get("request", {}).get("body", None), identifiers))
+            for case in self.cases
+        )
+        return replace(self, cases=cases, identifiers=MappingProxyType(dict(identifiers)))
+
+    def to_json(self) -> dict:
+        return {
+            "plan_format": PLAN_FORMAT,
+            "plan_sha256": self.sha256,
+            "profile": dict(self.profile),
+            "cases": [
+                {"definition": dict(c.definition), "applicable": c.applicable, "expectations": c.expectations.to_json()}
+                for c in self.cases
+            ],
+        }
+
+    @classmethod
+    def from_json(cls, doc: dict) -> "ExecutionPlan":
+        if doc.get("plan_format") != PLAN_FORMAT:
+            raise ValueError(f"unsupported plan_format: {doc.get('plan_format')}")
+        cases = tuple(
+            PlannedCase(
+                definition=MappingProxyType(c["definition"]),
+                applicable=c["applicable"],
+                expectations=Expectations.from_json(c["expectations"]),
+                body=c["definition"].get("request", {}).get("body", None),
+            )
+            for c in doc["cases"]
+        )
+        return cls(profile=MappingProxyType(doc["profile"]), cases=cases, sha256=doc["plan_sha256"])
+
+
+def compile_plan(tests: list, profile: Mapping, sha256: str | None = None) -> ExecutionPlan:
+    """Compile suite entries against ``profile`` into an (unbound) execution plan."""
+    profile_id = profile.get("id")
+    cases = []
+    for tc in tests:
+        profiles = tc.get("profiles")
+        cases.append(PlannedCase(
+            definition=MappingProxyType(dict(tc)),
+            applicable=not profiles or profile_id in profiles,
+            expectations=Expectations.compile(tc.get("expect", {})),
+            body=tc.get("request", {}).get("body", None),
+        ))
+    if sha256 is None:
+        blob = json.dumps({"tests": tests, "profile": dict(profile)}, sort_keys=True, default=str)
+        sha256 = hashlib.sha256(blob.encode("utf-8")).hexdigest()
+    return ExecutionPlan(profile=MappingProxyType(dict(profile)), cases=tuple(cases), sha256=sha256)
+
+
+def plan_cache_dir() -> Path:
+    return Path(os.environ.get(CACHE_DIR_ENV) or DEFAULT_CACHE_DIR)
+
+
+def plan_key(suite_bytes: bytes, profile_bytes: bytes) -> str:
+    """SHA-256 over the plan inputs and the compiler itself."""
+    h = hashlib.sha256()
+    for part in (str(PLAN_FORMAT).encode("ascii"), Path(__file__).read_bytes(), suite_bytes, profile_bytes):
+        h.update(len(part).to_bytes(8, "big"))
+        h.update(part)
+    return h.hexdigest()
+
+
+def load_plan(profile_path: Path, suite_path: Path = SUITE_PATH, use_cache: bool = True) -> ExecutionPlan:
+    """Load the compiled plan for a profile, compiling (and caching) it on a miss."""
+    suite_bytes = Path(suite_path).read_bytes()
+    profile_bytes = Path(profile_path).read_bytes()
+    key = plan_key(suite_bytes, profile_bytes)
+    cache_file = plan_cache_dir() / f"plan-{key}.json"
+
+    if use_cache and cache_file.is_file():
+        try:
+            return ExecutionPlan.from_json(json.loads(cache_file.read_text(encoding="utf-8")))
+        except (OSError, ValueError, KeyError, TypeError):
+            pass  # unreadable or stale entry: recompile and overwrite
+
+    import yaml
+
+    tests = yaml.safe_load(suite_bytes.decode("utf-8"))["tests"]
+    profile = yaml.safe_load(profile_bytes.decode("utf-8"))
+    plan = compile_plan(tests, profile, sha256=key)
+
+    blob = _cacheable_json(plan) if use_cache else None
+    if blob is not None:
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+            tmp.write_text(blob, encoding="utf-8")
+            os.replace(tmp, cache_file)
+        except OSError:
+            pass  # the cache is an optimisation; a read-only tree still runs
+    return plan
+
+
+def _cacheable_json(plan: ExecutionPlan) -> str | None:
+    """The plan as JSON, or None if a cache hit would not reproduce it exactly.
+
+    YAML can produce values JSON cannot hold (timestamps, non-string keys); such
+    plans are compiled on every run instead of being cached in a lossy form.
+    """
+    doc = plan.to_json()
+    try:
+        blob = json.dumps(doc)
+        return blob if json.loads(blob) == doc else None
+    except (TypeError, ValueError):
+        return None
+
+
+# The plan handed to process_pool workers: set in the parent before the pool
+# starts (inherited on fork) or by _init_pool_worker on spawn-only platforms.
+_SHARED: dict = {}
+
+
+def shared_plan() -> ExecutionPlan:
+    """The plan of the :func:`process_pool` this worker belongs to."""
+    return _SHARED["plan"]
+
+
+def _init_pool_worker(plan_doc: dict | None, initializer, initargs: tuple) -> None:
+    if plan_doc is not None:
+        from cts.schemas import shared_registry
+
+        _SHARED["plan"] = ExecutionPlan.from_json(plan_doc)
+        shared_registry().compile_all()
+    if initializer is not None:
+        initializer(*initargs)
+
+
+@contextmanager
+def process_pool(workers: int, plan: ExecutionPlan | None = None, initializer=None, initargs: tuple = ()):
+    """A ``ProcessPoolExecutor`` whose workers see ``plan`` as :func:`shared_plan`.
+
+    Workers are forked where the platform allows it, so they inherit the plan
+    and the compiled schema validators instead of rebuilding them; elsewhere
+    each worker rebuilds both once. ``initializer(*initargs)`` then runs in
+    every worker.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    plan_doc = None
+    previous = _SHARED.get("plan")
+    if plan is not None:
+        from cts.schemas import shared_registry
+
+        # Compile every schema validator once; forked workers inherit the cache.
+        shared_registry().compile_all()
+        _SHARED["plan"] = plan
+    if "fork" in multiprocessing.get_all_start_methods():
+        mp_context = multiprocessing.get_context("fork")
+    else:
+        mp_context = multiprocessing.get_context()
+        plan_doc = plan.to_json() if plan is not None else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context, initializer=_init_pool_worker,
+                                 initargs=(plan_doc, initializer, initargs)) as pool:
+            yield pool
+    finally:
+        if previous is None:
+            _SHARED.pop("plan", None)
+        else:
+            _SHARED["plan"] = previous
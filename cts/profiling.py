@@ -0,0 +1,179 @@
+"""Runner self-profiling for ``--profile-runner``.
+
+Profiles where the runner itself spends its time and resources, as opposed to
+what the SUT does (that is ``timings_ns`` in the case files). The runner marks
+its phases (plan load, case execution, report writing, hashing into the
+manifest, bundle compression, ...) with :func:`phase`; while a
+:class:`RunnerProfiler` is active, each phase records:
+
+- wall-clock and CPU time (all threads of the runner process),
+- bytes written by the process (``wchar`` from ``/proc/self/io``; null where
+  that is unavailable), which covers evidence files, the bundle and stdout,
+- peak RSS at the end of the phase (the process high-water mark, so the phase
+  that raises it is the one that allocated).
+
+:meth:`RunnerProfiler.write` then stores three side artifacts in the profile
+directory, which is always outside the run's ``--out`` so that none of them
+enter the manifest, bundle or signatures:
+
+- ``runner.pstats``: the cProfile CPU profile of the main thread (load it with
+  ``python -m pstats`` or snakeviz). With ``--concurrency`` > 1 case work on
+  worker threads appears only as waiting time in the main thread.
+- ``runner-trace.json``: the phase timeline in Chrome trace-event format, for
+  ``chrome://tracing`` or https://ui.perfetto.dev, with an RSS counter track.
+- ``runner-resources.json``: the per-phase numbers above plus totals.
+
+Without an active profiler :func:`phase` is a shared no-op context manager, so
+the markers cost nothing on ordinary runs and in fleet workers.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+PROFILE_VERSION = "0.1.0"
+PSTATS_NAME = "runner.pstats"
+TRACE_NAME = "runner-trace.json"
+RESOURCES_NAME = "runner-resources.json"
+
+_NO_PHASE = nullcontext()
+_active: "RunnerProfiler | None" = None
+
+
+def default_profile_dir(out: Path) -> Path:
+    """``<out>.runner-profile``, next to the evidence directory rather than inside it."""
+    return out.parent / f"{out.name}.runner-profile"
+
+
+def profile_dir(value: str, out: Path) -> Path:
+    """Resolve the ``--profile-runner`` directory, refusing one inside ``out``."""
+    path = Path(value) if value else default_profile_dir(out)
+    resolved, out_resolved = path.resolve(), out.resolve()
+    if resolved == out_resolved or out_resolved in resolved.parents:
+        raise SystemExit("--profile-runner directory must be outside --out so that profiles never enter "
+                         "the signed evidence set")
+    return path
+
+
+def _bytes_written() -> int | None:
+    try:
+        with open("/proc/self/io", "rb") as f:
+            for line in f:
+                if line.startswith(b"wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _peak_rss() -> int | None:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _sample() -> tuple[int, int, int | None]:
+    return time.perf_counter_ns(), time.process_time_ns(), _bytes_written()
+
+
+class RunnerProfiler:
+    """Collects a cProfile profile and per-phase resource usage for one runner process."""
+
+    def __init__(self, directory: Path):
+        import cProfile
+
+        self.directory = Path(directory)
+        self.phases: list[dict] = []
+        self._profile = cProfile.Profile()
+        self._lock = threading.Lock()
+        self._started = self._ended = None
+
+    def start(self) -> None:
+        global _active
+        self._started = _sample()
+        _active = self
+        self._profile.enable()
+
+    def stop(self) -> None:
+        global _active
+        self._profile.disable()
+        self._ended = _sample()
+        _active = None
+
+    @contextmanager
+    def phase(self, name: str):
+        wall, cpu, written = _sample()
+        try:
+            yield
+        finally:
+            end_wall, end_cpu, end_written = _sample()
+            record = {
+                "name": name,
+                "start_ns": wall - self._started[0],
+                "wall_ns": end_wall - wall,
+                "cpu_ns": end_cpu - cpu,
+                "bytes_written": end_written - written if written is not None else None,
+                "peak_rss_bytes": _peak_rss(),
+                "tid": threading.get_ident(),
+            }
+            with self._lock:
+                self.phases.append(record)
+
+    def _totals(self) -> dict:
+        wall, cpu, written = self._started
+        end_wall, end_cpu, end_written = self._ended
+        return {
+            "wall_ns": end_wall - wall,
+            "cpu_ns": end_cpu - cpu,
+            "bytes_written": end_written - written if written is not None else None,
+            "peak_rss_bytes": _peak_rss(),
+        }
+
+    def trace_events(self) -> dict:
+        """The phase timeline as a Chrome trace-event document (timestamps in microseconds)."""
+        pid = os.getpid()
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": "trqp-cts runner"}}]
+        for p in sorted(self.phases, key=lambda p: p["start_ns"]):
+            end_us = (p["start_ns"] + p["wall_ns"]) / 1000
+            events.append({
+                "name": p["name"], "cat": "phase", "ph": "X", "pid": pid, "tid": p["tid"],
+                "ts": p["start_ns"] / 1000, "dur": p["wall_ns"] / 1000,
+                "args": {"cpu_ms": p["cpu_ns"] / 1e6, "bytes_written": p["bytes_written"]},
+            })
+            if p["peak_rss_bytes"] is not None:
+                events.append({"name": "peak_rss", "ph": "C", "pid": pid, "ts": end_us,
+                               "args": {"MiB": round(p["peak_rss_bytes"] / (1 << 20), 1)}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, argv: list[str] | None = None) -> list[Path]:
+        """Write the three profile artifacts; returns their paths."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        pstats_path = self.directory / PSTATS_NAME
+        self._profile.dump_stats(pstats_path)
+        trace_path = self.directory / TRACE_NAME
+        trace_path.write_text(json.dumps(self.trace_events()), encoding="utf-8")
+        resources_path = self.directory / RESOURCES_NAME
+        resources_path.write_text(json.dumps({
+            "profile_version": PROFILE_VERSION,
+            "argv": list(sys.argv[1:] if argv is None else argv),
+            "cpu_count": os.cpu_count(),
+            "total": self._totals(),
+            "phases": [{k: v for k, v in p.items() if k != "tid"} for p in self.phases],
+        }, indent=2), encoding="utf-8")
+        return [pstats_path, trace_path, resources_path]
+
+
+def phase(name: str):
+    """Context manager marking a runner phase; a no-op unless ``--profile-runner`` is active."""
+    profiler = _active
+    return profiler.phase(name) if profiler is not None else _NO_PHASE
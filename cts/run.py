@@ -8,22 +8,61 @@ Operator notes:
 - Use --generated-at to pin timestamps for reproducible output.
 - Use --fixture-set to run against canned responses instead of a live SUT.
 - Use --replay to re-evaluate assertion logic over a prior run directory.
+  --replay-workers N spreads the case files over N worker processes.
+- Use --concurrency N to execute independent test cases in parallel; evidence
+  is still emitted in suite order and matches a serial run byte for byte.
+- Use --transport async (optionally --http2) to drive large sweeps from one
+  asyncio event loop; --concurrency then bounds requests in flight. Needs
+  the optional httpx (cts/requirements-async.txt).
+- Use --load (with --load-duration, --load-rps, --load-tests) to replay cases
+  under open- or closed-loop load and record load-report.json as evidence.
+- The suite and profile are compiled into a test plan that is cached on disk
+  (keyed by the SHA-256 of its inputs); --no-plan-cache bypasses the cache.
+- Each finished case is written and recorded in an append-only journal.jsonl;
+  --resume <out> continues an interrupted run instead of starting over.
+- Response bodies above the profile's evidence.inline_response_bytes are
+  streamed to cases/<id>.body and referenced from the case file by digest.
+- --profile-runner [DIR] profiles the runner itself (cProfile, a Chrome trace
+  of its phases, CPU time, bytes written and peak RSS per phase) into DIR,
+  default <out>.runner-profile, outside the signed evidence set.
 - Outputs are written under the configured output directory with stable naming.
 
 This docstring exists to make the runner easier to maintain and safer to adapt.
 """
 
-import argparse, json, time, hashlib, zipfile, uuid
+# Heavy dependencies (yaml, requests/httpx, jsonschema, nacl, asyncio)
+# are imported on the code paths that need them so that --list-tests, --dry-run,
+# fixture and replay runs start fast; tests/test_startup.py guards this.
+import argparse, json, os, sys, time, hashlib, uuid
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime, timezone
-import yaml
-import requests
-from jsonschema import validate as js_validate
-from nacl.signing import SigningKey
-from nacl.encoding import Base64Encoder
 
 ROOT = Path(__file__).resolve().parent.parent
-VERSION = (ROOT / "VERSION").read_text(encoding="utf-8").strip()
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from cts.bundle import BundleBuilder, bundle_compression
+from cts.capture import ResponseCapture, inline_limit, parse_body_json
+from cts.evidence import EvidenceWriter, sha256_file
+from cts.journal import JOURNAL_NAME, RunJournal, read_journal
+from cts.merkle import PROOFS_NAME, ROOT_NAME, ROOT_SIG_NAME, build_merkle_manifest, manifest_mode
+from cts.plan import ExecutionPlan, load_plan, process_pool, shared_plan
+from cts.profiling import RunnerProfiler, phase, profile_dir
+from cts.schemas import shared_registry
+from cts.source import EvidenceSource, is_bundle, open_evidence
+
+
+@lru_cache(maxsize=None)
+def tool_version() -> str:
+    return (ROOT / "VERSION").read_text(encoding="utf-8").strip()
+
+
+def __getattr__(name):
+    # cts.run.VERSION predates tool_version(); resolve it on first access
+    if name == "VERSION":
+        return tool_version()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def now_iso():
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
@@ -31,13 +70,12 @@ def now_iso():
 def sha256_bytes(b: bytes) -> str:
     return hashlib.sha256(b).hexdigest()
 
-def sha256_file(p: Path) -> str:
-    return sha256_bytes(p.read_bytes())
-
 def guess_media_type(p: Path) -> str | None:
     suf = p.suffix.lower()
     if suf == ".json":
         return "application/json"
+    if suf == ".jsonl":
+        return "application/jsonl"
     if suf == ".zip":
         return "application/zip"
     if suf in [".txt", ".log"]:
@@ -47,94 +85,30 @@ def guess_media_type(p: Path) -> str | None:
     return None
 
 def load_yaml(p: Path):
+    import yaml
     return yaml.safe_load(p.read_text(encoding="utf-8"))
 
 def load_json(p: Path):
     return json.loads(p.read_text(encoding="utf-8"))
 
-def json_path_get(doc, path: str):
-    """
-    Minimal JSONPath-like accessor.
-
-    Supports:
-      - $.a.b.c
-      - $.a[0].b
-      - $["key.with.dots"].a
-      - wildcard array iteration: $.items[*].id  (returns list of matches)
-    """
-    if not path.startswith("$"):
-        raise ValueError("Only supports paths starting with $")
-
-    i = 1
-    tokens = []
-    while i < len(path):
-        if path[i] == ".":
-            i += 1
-            j = i
-            while j < len(path) and path[j] not in ".[":
-                j += 1
-            tokens.append(("key", path[i:j]))
-            i = j
-        elif path[i] == "[":
-            j = path.find("]", i)
-            if j == -1:
-                raise ValueError(f"Unclosed [ in path: {path}")
-            inner = path[i+1:j]
-            if inner == "*":
-                tokens.append(("wildcard", None))
-            elif (inner.startswith('"') and inner.endswith('"')) or (inner.startswith("'") and inner.endswith("'")):
-                tokens.append(("key", inner[1:-1]))
-            else:
-                tokens.append(("index", int(inner)))
-            i = j + 1
-        else:
-            raise ValueError(f"Unexpected character in path at {i}: {path[i]} ({path})")
-
-    def step(cur, tok):
-        kind, val = tok
-        if kind == "key":
-            return cur.get(val) if isinstance(cur, dict) else None
-        if kind == "index":
-            if isinstance(cur, list) and 0 <= val < len(cur):
-                return cur[val]
-            return None
-        if kind == "wildcard":
-            if isinstance(cur, list):
-                return cur[:]
-            return None
-        raise ValueError("unknown token")
-
-    cur = doc
-    for idx, tok in enumerate(tokens):
-        if tok[0] == "wildcard":
-            remainder = tokens[idx + 1:]
-            arr = step(cur, tok)
-            if arr is None:
-                return None
-            out = []
-            for item in arr:
-                c = item
-                for rt in remainder:
-                    c = step(c, rt)
-                    if c is None:
-                        break
-                if c is not None:
-                    out.append(c)
-            return out
-        else:
-            cur = step(cur, tok)
-            if cur is None:
-                return None
-    return cur
-
 def ensure_dirs(out: Path):
     out.mkdir(parents=True, exist_ok=True)
     (out/"cases").mkdir(exist_ok=True)
 
-def http_request(base_url: str, tc: dict, headers: dict, body):
-    url = base_url.rstrip("/") + tc["path"]
+def http_request(transport, base_url: str, tc: dict, headers: dict, body, capture=None):
+    """Send a test case request over the pooled transport; returns (response, connection_info)."""
     method = tc.get("method", "POST").upper()
-    return requests.request(method, url, headers=headers, json=body, timeout=20)
+    return transport.request(base_url, method, tc["path"], headers, body, **_capture_kwargs(capture))
+
+
+def _body_capture(tc: dict, ctx: dict):
+    capture = ctx.get("capture")
+    return capture.for_case(tc["id"]) if capture is not None else None
+
+
+def _capture_kwargs(capture) -> dict:
+    # Only pass capture= when streaming, so transports without it keep working
+    return {"capture": capture} if capture is not None else {}
 
 def add_ha_headers(headers: dict, sut: dict, nonce: str, ts: str):
     headers["X-Auth-Mode"] = "high_assurance"
@@ -156,26 +130,12 @@ def resolve_identifiers(sut: dict) -> dict:
     overrides = sut.get("identifiers", {}) or {}
     return {**defaults, **overrides}
 
-def apply_identifier_overrides(body: dict | None, identifiers: dict) -> dict | None:
-    """Replace placeholder identifier values in a request body with SUT-specific overrides."""
-    if body is None:
-        return body
-    result = dict(body)
-    for field in ("authority_id", "entity_id", "subject_authority_id", "action"):
-        if field in result:
-            result[field] = identifiers[field]
-    return result
-
 def list_tests(tests: list, profile: dict) -> None:
     """Print test IDs and names applicable to the given profile."""
     profile_id = profile.get("id")
     print(f"Tests applicable to profile '{profile_id}':\n")
     for tc in tests:
-        applicable_profiles = tc.get("profiles")
-        if applicable_profiles and profile_id not in applicable_profiles:
-            status = "NOT_APPLICABLE"
-        else:
-            status = "applicable"
+        status = "applicable" if tc.applicable else "NOT_APPLICABLE"
         print(f"  [{status}] {tc['id']}: {tc.get('name', '')}")
     print()
 
@@ -237,24 +197,23 @@ def _evaluate_assertions(tc: dict, resp_status, resp_headers: dict, resp_json, r
     """Run all expect-block assertions against response data. Returns (ok, assertions)."""
     ok = True
     assertions = []
-    exp = tc.get("expect", {})
+    exp = tc.expectations
 
-    if "status" in exp and "status_in" in exp:
+    if exp.has_status and exp.has_status_in:
         ok = False
         assertions.append({"type": "expect_config", "error": "expect.status and expect.status_in are mutually exclusive", "pass": False})
 
-    if "status" in exp:
-        passed = resp_status == exp["status"]
+    if exp.has_status:
+        passed = resp_status == exp.status
         ok &= passed
-        assertions.append({"type": "status", "expected": exp["status"], "actual": resp_status, "pass": passed})
+        assertions.append({"type": "status", "expected": exp.status, "actual": resp_status, "pass": passed})
 
-    if "status_in" in exp:
-        passed = resp_status in exp["status_in"]
+    if exp.has_status_in:
+        passed = resp_status in exp.status_in
         ok &= passed
-        assertions.append({"type": "status_in", "expected": exp["status_in"], "actual": resp_status, "pass": passed})
+        assertions.append({"type": "status_in", "expected": exp.status_in, "actual": resp_status, "pass": passed})
 
-    needs_json = any(k in exp for k in ["schema", "json_path_exists", "json_path_equals"]) or exp.get("response_json")
-    if needs_json:
+    if exp.needs_json:
         if resp_json is not None:
             assertions.append({"type": "json_parse", "pass": True})
         else:
@@ -268,121 +227,488 @@ def _evaluate_assertions(tc: dict, resp_status, resp_headers: dict, resp_json, r
             if not parse_ok:
                 ok = False
 
-    if "response_header_contains" in exp:
-        for k, v in exp["response_header_contains"].items():
+    if exp.header_contains:
+        for k, v in exp.header_contains:
             actual = resp_headers.get(k)
             passed = (actual is not None and v in actual) if k.lower() == "content-type" else (actual == v)
             ok &= passed
             assertions.append({"type": "header_contains", "header": k, "expected": v, "actual": actual, "pass": passed})
 
-    if exp.get("schema") and resp_json is not None:
-        schema = load_json(ROOT / exp["schema"])
+    if exp.schema and resp_json is not None:
         try:
-            js_validate(instance=resp_json, schema=schema)
-            assertions.append({"type": "schema", "schema": exp["schema"], "pass": True})
+            shared_registry().validate(resp_json, exp.schema)
+            assertions.append({"type": "schema", "schema": exp.schema, "pass": True})
         except Exception as e:
             ok = False
-            assertions.append({"type": "schema", "schema": exp["schema"], "pass": False, "error": str(e)})
+            assertions.append({"type": "schema", "schema": exp.schema, "pass": False, "error": str(e)})
 
-    if exp.get("json_path_exists") and resp_json is not None:
-        for p in exp["json_path_exists"]:
-            v = json_path_get(resp_json, p)
+    if exp.json_path_exists and resp_json is not None:
+        for p in exp.json_path_exists:
+            v = p.get(resp_json)
             passed = (v is not None) and (v != [])
             ok &= passed
-            assertions.append({"type": "json_path_exists", "path": p, "pass": passed})
+            assertions.append({"type": "json_path_exists", "path": p.path, "pass": passed})
 
-    if exp.get("json_path_equals") and resp_json is not None:
-        for p, expected in exp["json_path_equals"]:
-            actual = json_path_get(resp_json, p)
+    if exp.json_path_equals and resp_json is not None:
+        for p, expected in exp.json_path_equals:
+            actual = p.get(resp_json)
             passed = (actual == expected)
             ok &= passed
-            assertions.append({"type": "json_path_equals", "path": p, "expected": expected, "actual": actual, "pass": passed})
+            assertions.append({"type": "json_path_equals", "path": p.path, "expected": expected, "actual": actual, "pass": passed})
 
-    if exp.get("json_path_in") and resp_json is not None:
-        for p, allowed in exp["json_path_in"]:
-            actual = json_path_get(resp_json, p)
+    if exp.json_path_in and resp_json is not None:
+        for p, allowed in exp.json_path_in:
+            actual = p.get(resp_json)
             passed = actual in allowed
             ok &= passed
-            assertions.append({"type": "json_path_in", "path": p, "allowed": allowed, "actual": actual, "pass": passed})
+            assertions.append({"type": "json_path_in", "path": p.path, "allowed": allowed, "actual": actual, "pass": passed})
 
     return ok, assertions
 
 
 # ---------------------------------------------------------------------------
-# Replay mode
+# Case execution
 # ---------------------------------------------------------------------------
 
-def run_replay(replay_dir: Path, out: Path, profile: dict, generated_at: str) -> None:
-    """Re-evaluate assertion logic over a prior run directory without hitting a SUT.
+def _not_applicable_case(tc: dict, profile: dict) -> tuple[dict, dict] | None:
+    """Return the NOT_APPLICABLE outcome when tc is gated out of the profile."""
+    if tc.applicable:
+        return None
+    tc_id = tc["id"]
+    applicable_profiles = tc.get("profiles")
+    case = {
+        "test_case_id": tc_id,
+        "name": tc.get("name"),
+        "request": {"method": tc.get("method","POST"), "path": tc["path"], "headers": {}, "body": None},
+        "response": {"status": None, "headers": {}, "text": ""},
+        "elapsed_ms": 0,
+        "assertions": [{"type": "profile_gate", "profiles": applicable_profiles, "profile_id": profile.get("id"), "pass": True}],
+        "skipped": True
+    }
+    return case, {"test_case_id": tc_id, "result": "NOT_APPLICABLE", "reason": f"not applicable to profile {profile.get('id')}", "elapsed_ms": 0}
+
+
+def _prepare_request(tc: dict, ctx: dict) -> tuple[dict, dict | None]:
+    """Build the request headers and body for tc."""
+    profile = ctx["profile"]
+    sut = ctx["sut"]
+    headers = dict(sut.get("default_headers", {}))
+    headers.update(tc.get("request", {}).get("headers", {}) or {})
+    body = tc.body
+
+    if profile["id"] == "high_assurance" and tc["id"] != "TC-SEC-001":
+        nonce = "nonce-" + str(uuid.uuid4())
+        ts = ctx["generated_at"]
+        add_ha_headers(headers, sut, nonce, ts)
+    return headers, body
+
+
+def _fixture_missing_case(tc: dict, headers: dict, body) -> tuple[dict, dict]:
+    tc_id = tc["id"]
+    case = {
+        "id": tc_id,
+        "name": tc.get("name"),
+        "request": {"method": tc.get("method", "POST"), "path": tc["path"], "headers": headers, "body": body},
+        "response": {"status": None, "headers": {}, "text": ""},
+        "elapsed_ms": 0,
+        "assertions": [{"type": "fixture_missing", "pass": False,
+                        "note": f"No fixture entry for {tc_id} in fixture set"}],
+    }
+    return case, {"test_case_id": tc_id, "result": "SKIP", "reason": "no fixture entry", "elapsed_ms": 0}
 
-    Reads case files from ``replay_dir/cases/*.json``, re-runs all assertion
-    checks against the captured response, and emits a ``replay-report.json``
-    with per-assertion diffs against the original verdicts.
-    """
-    cases_dir = replay_dir / "cases"
-    if not cases_dir.exists():
-        raise SystemExit(f"Replay directory has no cases/ subdirectory: {replay_dir}")
 
-    orig_verdicts_path = replay_dir / "verdicts.json"
-    if orig_verdicts_path.exists():
-        orig_verdicts = {v["test_case_id"]: v for v in json.loads(orig_verdicts_path.read_text(encoding="utf-8"))}
+def _sends_twice(tc: dict, ctx: dict) -> bool:
+    """Special replay test for HA: the same nonce is sent twice to trigger 409."""
+    return tc["id"] == "TC-SEC-002" and ctx["profile"]["id"] == "high_assurance" and ctx["fixture_set"] is None
+
+
+def _elapsed_ms(started_ns: int) -> int:
+    return (time.perf_counter_ns() - started_ns) // 1_000_000
+
+
+def _complete_case(tc: dict, headers: dict, body, resp, connection: dict | None, round_trip_ns: int,
+                   resp2=None) -> tuple[dict, dict]:
+    """Evaluate assertions over the captured response(s) and build the case record.
+
+    A body spilled to disk by the capture is referenced by path and digest
+    rather than copied into the case record. Live cases (those with
+    ``connection`` info) also record ``timings_ns``: the transport's per-phase
+    timings plus the round trip, JSON parse and assertion evaluation. Fixture
+    cases leave them out so fixture evidence stays reproducible.
+    """
+    elapsed_ms = round_trip_ns // 1_000_000
+    timings = None
+    if connection is not None:
+        connection = dict(connection)
+        timings = connection.pop("timings_ns", {})
+    tc_id = tc["id"]
+    body_file = getattr(resp, "body_file", None)
+    resp_text = resp.text if body_file is None else ""
+    response = {"status": resp.status_code, "headers": dict(resp.headers)}
+    if body_file is None:
+        response["text"] = resp_text
     else:
-        orig_verdicts = {}
+        response["body_file"] = body_file
+    case = {
+        "id": tc_id,
+        "name": tc.get("name"),
+        "request": {"method": tc.get("method","POST"), "path": tc["path"], "headers": headers, "body": body},
+        "response": response,
+        "elapsed_ms": elapsed_ms,
+        "assertions": []
+    }
+    if connection is not None:
+        case["connection"] = connection
 
-    orig_run_path = replay_dir / "run.json"
-    orig_run_id = None
-    if orig_run_path.exists():
-        orig_run = json.loads(orig_run_path.read_text(encoding="utf-8"))
-        orig_run_id = orig_run.get("test_run_id")
+    resp_json = None
+    exp = tc.expectations
 
-    out.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter_ns()
+    if exp.needs_json:
+        try:
+            resp_json = resp.json()
+            if body_file is None:
+                case["response"]["json"] = resp_json
+        except Exception:
+            pass
+    parsed = time.perf_counter_ns()
+
+    ok, assertions = _evaluate_assertions(
+        tc,
+        resp.status_code,
+        dict(resp.headers),
+        resp_json,
+        resp_text,
+    )
+    case["assertions"] = assertions
+
+    if resp2 is not None:
+        passed = resp2.status_code == exp.status
+        ok &= passed
+        case["assertions"].append({"type":"replay","expected":exp.status,"actual":resp2.status_code,"pass":passed})
+
+    if timings is not None:
+        case["timings_ns"] = {**timings, "json_parse": parsed - started,
+                              "assertions": time.perf_counter_ns() - parsed, "round_trip": round_trip_ns}
+    return case, {"test_case_id": tc_id, "result": "PASS" if ok else "FAIL", "elapsed_ms": elapsed_ms}
+
+
+def _error_case(tc: dict, headers: dict | None, body, elapsed_ms: int, error: Exception) -> tuple[dict, dict]:
+    tc_id = tc["id"]
+    case = {
+        "id": tc_id,
+        "name": tc.get("name"),
+        "request": {"method": tc.get("method","POST"), "path": tc.get("path"), "headers": headers if headers is not None else {}, "body": body},
+        "response": {"status": None, "headers": {}, "text": ""},
+        "elapsed_ms": elapsed_ms,
+        "assertions": [{"type": "exception", "pass": False, "error": str(error)}],
+    }
+    return case, {"test_case_id": tc_id, "result": "ERROR", "elapsed_ms": elapsed_ms}
 
-    replay_id = str(uuid.uuid4())
-    tests = load_yaml(ROOT / "tests/core_tests.yaml")["tests"]
-    tests_by_id = {tc["id"]: tc for tc in tests}
 
-    replay_verdicts = []
-    diffs = []
+def execute_case(tc: dict, ctx: dict) -> tuple[dict, dict]:
+    """Execute a single test case against the SUT (or fixture set).
 
-    for case_file in sorted(cases_dir.glob("*.json")):
-        tc_id = case_file.stem
-        case = json.loads(case_file.read_text(encoding="utf-8"))
-        tc = tests_by_id.get(tc_id)
-
-        if case.get("skipped"):
-            replay_verdicts.append({"test_case_id": tc_id, "result": "NOT_APPLICABLE", "source": "replay"})
-            continue
-
-        if tc is None:
-            replay_verdicts.append({
-                "test_case_id": tc_id,
-                "result": "STALE",
-                "reason": "test case not found in current suite",
-                "source": "replay",
-            })
-            continue
+    Returns ``(case, verdict)``. Nothing is written to disk here so that cases
+    can run on worker threads while evidence is still emitted in suite order.
+    """
+    gated = _not_applicable_case(tc, ctx["profile"])
+    if gated is not None:
+        return gated
+    headers, body, started = None, None, None
+    try:
+        headers, body = _prepare_request(tc, ctx)
+        started = time.perf_counter_ns()
+
+        # Use fixture set if provided, else make a live HTTP request
+        resp2 = None
+        if ctx["fixture_set"] is not None:
+            resp, connection = fixture_request(ctx["fixture_set"], tc["id"]), None
+            if resp is None:
+                return _fixture_missing_case(tc, headers, body)
+        else:
+            resp, connection = http_request(ctx["transport"], ctx["base_url"], tc, headers, body, _body_capture(tc, ctx))
+        round_trip_ns = time.perf_counter_ns() - started
+        if _sends_twice(tc, ctx):
+            resp2, _ = http_request(ctx["transport"], ctx["base_url"], tc, headers, body)
+
+        return _complete_case(tc, headers, body, resp, connection, round_trip_ns, resp2)
+    except Exception as e:
+        return _error_case(tc, headers, body, _elapsed_ms(started) if started is not None else 0, e)
+
+
+async def execute_case_async(tc: dict, ctx: dict) -> tuple[dict, dict]:
+    """asyncio counterpart of :func:`execute_case` for ``--transport async``."""
+    gated = _not_applicable_case(tc, ctx["profile"])
+    if gated is not None:
+        return gated
+    if ctx["fixture_set"] is not None:
+        return execute_case(tc, ctx)
+    headers, body, started = None, None, None
+    try:
+        headers, body = _prepare_request(tc, ctx)
+        method = tc.get("method", "POST").upper()
+        transport = ctx["transport"]
+        started = time.perf_counter_ns()
+        resp, connection = await transport.request(ctx["base_url"], method, tc["path"], headers, body,
+                                                   **_capture_kwargs(_body_capture(tc, ctx)))
+        round_trip_ns = time.perf_counter_ns() - started
+        resp2 = None
+        if _sends_twice(tc, ctx):
+            resp2, _ = await transport.request(ctx["base_url"], method, tc["path"], headers, body)
+        return _complete_case(tc, headers, body, resp, connection, round_trip_ns, resp2)
+    except Exception as e:
+        return _error_case(tc, headers, body, _elapsed_ms(started) if started is not None else 0, e)
+
+
+def _collector(results: list, on_result):
+    def collect(idx: int, result: tuple[dict, dict]) -> None:
+        results[idx] = result
+        if on_result is not None:
+            on_result(idx, result)
+    return collect
+
+
+def run_cases(tests: list, ctx: dict, concurrency: int = 1, on_result=None) -> list[tuple[dict, dict]]:
+    """Execute ``tests`` and return ``(case, verdict)`` pairs in suite order.
+
+    With ``concurrency > 1`` independent cases are dispatched to a thread pool.
+    Cases marked ``serial: true`` in the suite (e.g. the TC-SEC-002 nonce
+    double-send) act as barriers: every earlier case finishes first and the
+    serial case runs with no other request in flight. Results are always
+    returned in suite order, so evidence is identical to a serial run.
+
+    ``on_result(index, (case, verdict))`` is called on the calling thread as
+    each case finishes (in completion order), so results can be persisted
+    before the whole suite is done.
+    """
+    results: list = [None] * len(tests)
+    collect = _collector(results, on_result)
+    if concurrency <= 1:
+        for idx, tc in enumerate(tests):
+            collect(idx, execute_case(tc, ctx))
+        return results
+
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="cts-case") as pool:
+        pending = {}
+        for idx, tc in enumerate(tests):
+            if tc.get("serial"):
+                for fut in as_completed(pending):
+                    collect(pending[fut], fut.result())
+                pending = {}
+                collect(idx, execute_case(tc, ctx))
+            else:
+                pending[pool.submit(execute_case, tc, ctx)] = idx
+        for fut in as_completed(pending):
+            collect(pending[fut], fut.result())
+    return results
+
+
+async def run_cases_async(tests: list, ctx: dict, on_result=None) -> list[tuple[dict, dict]]:
+    """asyncio counterpart of :func:`run_cases`.
 
-        resp_status = case.get("response", {}).get("status")
-        resp_headers = case.get("response", {}).get("headers", {})
-        resp_json = case.get("response", {}).get("json")
-        resp_text = case.get("response", {}).get("text", "")
+    All independent cases are scheduled at once; the transport's in-flight
+    bound limits how many requests are actually outstanding. ``serial: true``
+    cases keep their barrier semantics. ``on_result`` is called on the event
+    loop as each case finishes. The caller owns (and closes) the transport.
+    """
+    import asyncio
+    results: list = [None] * len(tests)
+    collect = _collector(results, on_result)
+
+    async def one(idx: int, tc) -> None:
+        collect(idx, await execute_case_async(tc, ctx))
+
+    pending = []
+    for idx, tc in enumerate(tests):
+        if tc.get("serial"):
+            await asyncio.gather(*pending)
+            pending = []
+            await one(idx, tc)
+        else:
+            pending.append(one(idx, tc))
+    await asyncio.gather(*pending)
+    return results
 
-        ok, assertions = _evaluate_assertions(tc, resp_status, resp_headers, resp_json, resp_text)
 
-        result = "PASS" if ok else "FAIL"
-        replay_verdicts.append({
+def run_live(tests: list, ctx: dict, concurrency: int, load_tests: list | None = None,
+             load_options: dict | None = None, on_result=None) -> tuple[list, dict | None, dict | None]:
+    """Run the conformance cases, then the optional load phase, over one transport.
+
+    Returns ``(results, transport_info, load_report)``. Transport counters are
+    captured before the load phase so they describe the conformance cases only.
+    ``on_result`` is passed to :func:`run_cases` / :func:`run_cases_async`.
+    """
+    transport = ctx["transport"]
+    if getattr(transport, "is_async", False):
+        import asyncio
+        from cts.load import run_load_async
+
+        async def live():
+            try:
+                with phase("cases"):
+                    results = await run_cases_async(tests, ctx, on_result)
+                info = transport.describe()
+                load_report = None
+                if load_tests:
+                    with phase("load"):
+                        load_report = await run_load_async(load_tests, ctx, _prepare_request, concurrency=concurrency, **load_options)
+                return results, info, load_report
+            finally:
+                await transport.aclose()
+
+        return asyncio.run(live())
+
+    try:
+        with phase("cases"):
+            results = run_cases(tests, ctx, concurrency, on_result)
+        info = transport.describe() if transport is not None else None
+        load_report = None
+        if load_tests:
+            from cts.load import run_load
+            with phase("load"):
+                load_report = run_load(load_tests, ctx, _prepare_request, concurrency=concurrency, **load_options)
+        return results, info, load_report
+    finally:
+        if transport is not None:
+            transport.close()
+
+
+# ---------------------------------------------------------------------------
+# Replay mode
+# ---------------------------------------------------------------------------
+
+REPLAY_BATCH_SIZE = 256
+
+# Worker state for parallel replay; the plan comes from process_pool. Each
+# worker opens its own evidence source (a bundle's file handle must not be
+# shared across processes).
+_REPLAY: dict = {}
+
+
+def _init_replay_worker(replay_dir: str) -> None:
+    _REPLAY["source"] = open_evidence(Path(replay_dir))
+
+
+def _replay_case(source: EvidenceSource, rel: str, tests_by_id, timings: dict) -> dict:
+    """Re-evaluate one case file; adds to ``timings['read']`` and ``timings['evaluate']``."""
+    t0 = time.perf_counter()
+    tc_id = Path(rel).stem
+    case = source.read_json(rel)
+    tc = tests_by_id.get(tc_id)
+
+    if case.get("skipped"):
+        timings["read"] += time.perf_counter() - t0
+        return {"test_case_id": tc_id, "result": "NOT_APPLICABLE", "source": "replay"}
+
+    if tc is None:
+        timings["read"] += time.perf_counter() - t0
+        return {
             "test_case_id": tc_id,
-            "result": result,
-            "assertions": assertions,
+            "result": "STALE",
+            "reason": "test case not found in current suite",
             "source": "replay",
-        })
+        }
 
-        orig = orig_verdicts.get(tc_id)
-        if orig and orig.get("result") != result:
+    resp_status = case.get("response", {}).get("status")
+    resp_headers = case.get("response", {}).get("headers", {})
+    resp_json = case.get("response", {}).get("json")
+    resp_text = case.get("response", {}).get("text", "")
+    body_file = case.get("response", {}).get("body_file")
+    if body_file is not None and tc.expectations.needs_json:
+        resp_json = parse_body_json(source.read_bytes(body_file["path"]), body_file,
+                                    source.describe(body_file["path"]))
+    t1 = time.perf_counter()
+
+    ok, assertions = _evaluate_assertions(tc, resp_status, resp_headers, resp_json, resp_text)
+    timings["read"] += t1 - t0
+    timings["evaluate"] += time.perf_counter() - t1
+
+    return {
+        "test_case_id": tc_id,
+        "result": "PASS" if ok else "FAIL",
+        "assertions": assertions,
+        "source": "replay",
+    }
+
+
+def _replay_batch(rels: list[str]) -> tuple[list[dict], dict]:
+    """Worker entry point: re-evaluate a batch of case files in order."""
+    timings = {"read": 0.0, "evaluate": 0.0}
+    tests_by_id = shared_plan().by_id
+    verdicts = [_replay_case(_REPLAY["source"], rel, tests_by_id, timings) for rel in rels]
+    return verdicts, timings
+
+
+def _replay_parallel(replay_dir: Path, case_files: list[str], plan: ExecutionPlan,
+                     workers: int, timings: dict) -> list[dict]:
+    # Several batches per worker keep the pool busy when case costs vary
+    size = max(1, min(REPLAY_BATCH_SIZE, -(-len(case_files) // (workers * 4))))
+    batches = [case_files[i:i + size] for i in range(0, len(case_files), size)]
+    verdicts = []
+    with process_pool(min(workers, len(batches)), plan,
+                      initializer=_init_replay_worker, initargs=(str(replay_dir),)) as pool:
+        # map() yields batches in submission order, so verdicts keep case-file order
+        for batch_verdicts, batch_timings in pool.map(_replay_batch, batches):
+            verdicts.extend(batch_verdicts)
+            for phase, seconds in batch_timings.items():
+                timings[phase] += seconds
+    return verdicts
+
+
+def run_replay(replay_dir: Path, out: Path, plan: ExecutionPlan, generated_at: str, workers: int = 1) -> None:
+    """Re-evaluate assertion logic over a prior run directory without hitting a SUT.
+
+    Reads case files from ``replay_dir/cases/*.json``, re-runs all assertion
+    checks against the captured response, and emits a ``replay-report.json``
+    with per-assertion diffs against the original verdicts. ``replay_dir``
+    may also be a ``bundle.zip``, whose members are read in place.
+
+    With ``workers > 1`` case files are evaluated in batches on a process
+    pool; the report is identical to a serial replay. Per-phase timings are
+    printed and written to ``replay-timings.json`` (never to the report).
+    """
+    started = time.perf_counter()
+    timings = {"discover": 0.0, "read": 0.0, "evaluate": 0.0, "report": 0.0}
+    replay_id = str(uuid.uuid4())
+    profile = plan.profile
+    tests_by_id = plan.by_id
+
+    with open_evidence(replay_dir) as source:
+        if not source.has_dir("cases"):
+            raise SystemExit(f"Replay evidence has no cases/ subdirectory: {replay_dir}")
+
+        if source.exists("verdicts.json"):
+            orig_verdicts = {v["test_case_id"]: v for v in source.read_json("verdicts.json")}
+        else:
+            orig_verdicts = {}
+
+        orig_run_id = None
+        if source.exists("run.json"):
+            orig_run_id = source.read_json("run.json").get("test_run_id")
+
+        out.mkdir(parents=True, exist_ok=True)
+
+        case_files = source.list("cases", ".json")
+        timings["discover"] = time.perf_counter() - started
+
+        cases_started = time.perf_counter()
+        if workers > 1 and len(case_files) > 1:
+            replay_verdicts = _replay_parallel(replay_dir, case_files, plan, workers, timings)
+        else:
+            workers = 1
+            replay_verdicts = [_replay_case(source, rel, tests_by_id, timings) for rel in case_files]
+    cases_seconds = time.perf_counter() - cases_started
+
+    diffs = []
+    for verdict in replay_verdicts:
+        orig = orig_verdicts.get(verdict["test_case_id"])
+        if verdict["result"] in ("PASS", "FAIL") and orig and orig.get("result") != verdict["result"]:
             diffs.append({
-                "test_case_id": tc_id,
+                "test_case_id": verdict["test_case_id"],
                 "original_result": orig.get("result"),
-                "replay_result": result,
+                "replay_result": verdict["result"],
             })
 
     pass_count = sum(1 for v in replay_verdicts if v["result"] == "PASS")
@@ -395,7 +721,7 @@ def run_replay(replay_dir: Path, out: Path, profile: dict, generated_at: str) ->
         "replay_of_run_id": orig_run_id,
         "replay_dir": str(replay_dir),
         "profile_id": profile.get("id"),
-        "suite_version": VERSION,
+        "suite_version": tool_version(),
         "generated_at": generated_at,
         "summary": {
             "PASS": pass_count,
@@ -409,8 +735,24 @@ def run_replay(replay_dir: Path, out: Path, profile: dict, generated_at: str) ->
         "verdicts": replay_verdicts,
     }
 
+    report_started = time.perf_counter()
     (out / "replay-report.json").write_text(json.dumps(replay_report, indent=2), encoding="utf-8")
+    timings["report"] = time.perf_counter() - report_started
+
+    # read/evaluate are summed across workers; cases_seconds is wall-clock
+    replay_timings = {
+        "replay_run_id": replay_id,
+        "workers": workers,
+        "cases": len(case_files),
+        "phases_seconds": {phase: round(seconds, 6) for phase, seconds in timings.items()},
+        "cases_wall_seconds": round(cases_seconds, 6),
+        "total_seconds": round(time.perf_counter() - started, 6),
+    }
+    (out / "replay-timings.json").write_text(json.dumps(replay_timings, indent=2), encoding="utf-8")
     print(f"Replay complete: {pass_count} PASS, {fail_count} FAIL, {len(diffs)} verdict diff(s). Report: {out}/replay-report.json")
+    print(f"Replay timings ({workers} worker(s), {len(case_files)} case(s)): "
+          + ", ".join(f"{phase} {seconds:.3f}s" for phase, seconds in timings.items())
+          + f"; cases wall-clock {cases_seconds:.3f}s")
     if fail_count > 0:
         raise SystemExit(1)
 
@@ -419,11 +761,11 @@ def run_replay(replay_dir: Path, out: Path, profile: dict, generated_at: str) ->
 # Main entry point
 # ---------------------------------------------------------------------------
 
-def main():
+def build_arg_parser() -> argparse.ArgumentParser:
     ap = argparse.ArgumentParser(description="TRQP Conformance Suite runner")
     ap.add_argument("--profile", required=True, help="Path to profile YAML")
     ap.add_argument("--sut", required=True, help="Path to SUT config YAML")
-    ap.add_argument("--out", required=True, help="Output directory for evidence artifacts")
+    ap.add_argument("--out", default=None, help="Output directory for evidence artifacts (required unless --resume)")
     ap.add_argument("--run-id", default=None, help="Optional shared run identifier for Operational Stack workflows")
     ap.add_argument("--target-id", default=None, help="Optional stable target identifier for Operational Stack workflows")
     ap.add_argument("--dry-run", action="store_true",
@@ -437,328 +779,468 @@ def main():
                     help="Path to a fixture-set JSON file. When provided, canned responses are used "
                          "instead of live HTTP requests, enabling fully deterministic CI runs.")
     ap.add_argument("--replay", default=None,
-                    help="Path to a prior run output directory. Re-evaluates assertion logic "
+                    help="Path to a prior run output directory or its bundle.zip. Re-evaluates assertion logic "
                          "against captured case files without hitting a live SUT. "
                          "Emits replay-report.json in --out with per-assertion diffs.")
-    args = ap.parse_args()
+    ap.add_argument("--replay-workers", type=int, default=1,
+                    help="With --replay, evaluate case files on N worker processes (0: one per CPU; "
+                         "default: 1, serial). replay-report.json is identical to a serial replay.")
+    ap.add_argument("--concurrency", type=int, default=1,
+                    help="Number of test cases to execute in parallel (default: 1, serial). "
+                         "Evidence is emitted in suite order and is identical to a serial run.")
+    ap.add_argument("--transport", choices=["requests", "async"], default="requests",
+                    help="HTTP transport for live runs: 'requests' (blocking, thread per in-flight case) "
+                         "or 'async' (asyncio/httpx; --concurrency bounds in-flight requests).")
+    ap.add_argument("--http2", action="store_true",
+                    help="With --transport async, negotiate HTTP/2 and multiplex requests per connection "
+                         "(requires httpx[http2]).")
+    ap.add_argument("--load", action="store_true",
+                    help="After the conformance cases, replay selected cases under load and emit "
+                         "load-report.json (latency histograms, throughput timeline, error breakdown).")
+    ap.add_argument("--load-tests", default=None, type=lambda v: [i.strip() for i in v.split(",") if i.strip()],
+                    help="Comma-separated test case ids to replay under --load "
+                         "(default: every applicable case not marked serial).")
+    ap.add_argument("--load-duration", type=float, default=30.0,
+                    help="Duration of the --load phase in seconds (default: 30).")
+    ap.add_argument("--load-rps", type=float, default=None,
+                    help="Open-loop target request rate for --load, with latency measured from the intended "
+                         "send time (coordinated-omission corrected). When omitted, --load runs closed-loop "
+                         "with --concurrency workers.")
+    ap.add_argument("--no-plan-cache", action="store_true",
+                    help="Compile the test plan from tests/core_tests.yaml and the profile without reading "
+                         "or writing the on-disk plan cache (.cts-cache/, or $CTS_PLAN_CACHE_DIR).")
+    ap.add_argument("--resume", default=None, metavar="OUT",
+                    help="Resume an interrupted run in OUT from its journal.jsonl: journaled cases whose "
+                         "files still hash correctly are kept, the rest are executed, and the manifest, "
+                         "signature and bundle are then written. --profile, --sut and --fixture-set must "
+                         "match the interrupted run.")
+    ap.add_argument("--profile-runner", nargs="?", const="", default=None, metavar="DIR",
+                    help="Profile the runner itself: write a cProfile profile (runner.pstats), a Chrome "
+                         "trace of its phases (runner-trace.json) and per-phase CPU time, bytes written and "
+                         "peak RSS (runner-resources.json) to DIR (default: <out>.runner-profile). DIR must "
+                         "be outside --out; nothing is added to the evidence set.")
+    return ap
+
+
+def validate_args(args: argparse.Namespace) -> None:
+    if args.resume:
+        if args.out and Path(args.out).resolve() != Path(args.resume).resolve():
+            raise SystemExit("--out and --resume must name the same directory")
+        if args.replay:
+            raise SystemExit("--resume cannot be combined with --replay")
+        args.out = args.resume
+    if not args.out:
+        raise SystemExit("--out is required (or --resume <out>)")
+    if args.concurrency < 1:
+        raise SystemExit("--concurrency must be >= 1")
+    if args.replay_workers < 0:
+        raise SystemExit("--replay-workers must be >= 0")
+    if args.http2 and args.transport != "async":
+        raise SystemExit("--http2 requires --transport async")
+    if args.load and args.fixture_set:
+        raise SystemExit("--load requires a live SUT and cannot be combined with --fixture-set")
+    if args.load and (args.load_duration <= 0 or (args.load_rps is not None and args.load_rps <= 0)):
+        raise SystemExit("--load-duration and --load-rps must be positive")
+    if args.profile_runner is not None:
+        profile_dir(args.profile_runner, Path(args.out))
+
+
+def main(argv: list[str] | None = None):
+    args = build_arg_parser().parse_args(argv)
+    validate_args(args)
+    if args.profile_runner is None:
+        return run_main(args)
+
+    profiler = RunnerProfiler(profile_dir(args.profile_runner, Path(args.out)))
+    profiler.start()
+    try:
+        return run_main(args)
+    finally:
+        profiler.stop()
+        profiler.write(argv)
+        print(f"Runner profile written to {profiler.directory}: "
+              + ", ".join(f"{p['name']} {p['wall_ns'] / 1e9:.3f}s" for p in profiler.phases))
+
+
+def run_main(args: argparse.Namespace):
+    """Everything :func:`main` does after argument validation."""
+    with phase("load_plan"):
+        plan = load_plan(Path(args.profile), use_cache=not args.no_plan_cache)
+    profile = plan.profile
+
+    if args.list_tests:
+        list_tests(plan.cases, profile)
+        return
 
-    profile = load_yaml(Path(args.profile))
-    sut = load_yaml(Path(args.sut))
+    with phase("load_sut"):
+        sut = load_yaml(Path(args.sut))
     out = Path(args.out)
 
     # Resolve the timestamp to use throughout this run
     generated_at = args.generated_at or now_iso()
 
-    tests = load_yaml(ROOT/"tests/core_tests.yaml")["tests"]
-    identifiers = resolve_identifiers(sut)
-
-    if args.list_tests:
-        list_tests(tests, profile)
-        return
-
     if args.dry_run:
         print(f"Dry run: profile='{profile.get('id')}', sut base_url='{sut.get('base_url')}'")
-        list_tests(tests, profile)
+        list_tests(plan.cases, profile)
         print("Dry run complete — no HTTP requests were made.")
         return
 
     # --replay: re-evaluate over a prior run directory
     if args.replay:
         replay_dir = Path(args.replay)
-        if not replay_dir.is_dir():
-            raise SystemExit(f"--replay path does not exist or is not a directory: {replay_dir}")
-        run_replay(replay_dir, out, profile, generated_at)
+        if not replay_dir.is_dir() and not is_bundle(replay_dir):
+            raise SystemExit(f"--replay path is not a run directory or bundle.zip: {replay_dir}")
+        workers = args.replay_workers or os.cpu_count() or 1
+        with phase("replay"):
+            run_replay(replay_dir, out, plan, generated_at, workers=workers)
         return
 
+    execute_run(args, plan, sut, generated_at)
+
+
+def execute_run(args: argparse.Namespace, plan: ExecutionPlan, sut: dict, generated_at: str) -> dict:
+    """Execute a live or fixture-backed run and write the evidence set under ``args.out``.
+
+    Returns the ``cts-report.json`` document. Shared by the CLI and fleet mode.
+    """
+    out = Path(args.out)
+    profile = plan.profile
+    plan = plan.with_identifiers(resolve_identifiers(sut))
+    tests = plan.cases
+
     # Load fixture set if provided
     fixture_set = None
     fixture_set_sha256 = None
     if args.fixture_set:
         fixture_path = Path(args.fixture_set)
-        fixture_set = load_fixture_set(fixture_path)
-        fixture_set_sha256 = sha256_file(fixture_path)
+        with phase("load_fixture_set"):
+            fixture_set = load_fixture_set(fixture_path)
+            fixture_set_sha256 = sha256_file(fixture_path)
 
     ensure_dirs(out)
 
     if profile.get("gates", {}).get("require_state_reference") and not sut.get("state_reference"):
         raise SystemExit("Gate failed: sut.state_reference required for this profile.")
+    compression = bundle_compression(profile)
+    body_limit = inline_limit(profile)
+    merkle = manifest_mode(profile) == "merkle"
+
+    journaled = None
+    if args.resume:
+        journaled = read_journal(out)
+        if journaled is None:
+            if (out / "cts-report.json").is_file() and (out / "checksums.json").is_file():
+                print(f"Nothing to resume: {out} already holds a completed run.")
+                return load_json(out / "cts-report.json")
+            print(f"No run journal in {out}; starting a new run.")
 
-    run_id = args.run_id or str(uuid.uuid4())
     base_url = sut["base_url"]
-    target_id = args.target_id or sut.get("target_id") or base_url
-    run = {
-        "test_run_id": run_id,
-        "profile_id": profile["id"],
-        "out_dir_label": out.name,
-        "sut": {k:v for k,v in sut.items() if k != "signing_key_b64"},
-        "target_id": target_id,
-        "started_at": generated_at,
-        "tool": {"name": "trqp-cts", "version": VERSION},
-    }
-
-    # Embed fixture set provenance when fixture mode is active
-    if fixture_set is not None:
-        run["fixture_set"] = {
-            "path": args.fixture_set,
-            "sha256": fixture_set_sha256,
-            "fixture_set_id": fixture_set.get("fixture_set_id"),
+    if journaled is not None:
+        # Resume: keep the interrupted run's identity and timestamp, provided
+        # it was started from the same plan, SUT and fixture set.
+        header, journal_cases = journaled
+        run = header["run"]
+        if header.get("plan_sha256") != plan.sha256:
+            raise SystemExit("--resume: the profile or test suite changed since the interrupted run")
+        if run.get("sut") != json.loads(json.dumps({k:v for k,v in sut.items() if k != "signing_key_b64"})):
+            raise SystemExit("--resume: the SUT config differs from the interrupted run")
+        if (run.get("fixture_set") or {}).get("sha256") != fixture_set_sha256:
+            raise SystemExit("--resume: the fixture set differs from the interrupted run")
+        run_id, target_id, generated_at = run["test_run_id"], run["target_id"], run["started_at"]
+    else:
+        journal_cases = {}
+        run_id = args.run_id or str(uuid.uuid4())
+        target_id = args.target_id or sut.get("target_id") or base_url
+        run = {
+            "test_run_id": run_id,
+            "profile_id": profile["id"],
+            "out_dir_label": out.name,
+            "sut": {k:v for k,v in sut.items() if k != "signing_key_b64"},
+            "target_id": target_id,
+            "started_at": generated_at,
+            "tool": {"name": "trqp-cts", "version": tool_version()},
         }
 
-    # Embed state reference when declared
-    state_ref = sut.get("state_reference")
-    if state_ref:
-        run["state_reference"] = state_ref
-
-    verdicts = []
+        # Embed fixture set provenance when fixture mode is active
+        if fixture_set is not None:
+            run["fixture_set"] = {
+                "path": args.fixture_set,
+                "sha256": fixture_set_sha256,
+                "fixture_set_id": fixture_set.get("fixture_set_id"),
+            }
 
+        # Embed state reference when declared
+        state_ref = sut.get("state_reference")
+        if state_ref:
+            run["state_reference"] = state_ref
+
+    # Every artifact is hashed as it is written (and queued for bundle
+    # compression); the manifest, artifact index, checksums and bundle all
+    # read from this one digest table. The journal is not evidence.
+    bundle = BundleBuilder(compression) if profile.get("evidence", {}).get("bundle", True) else None
+    evidence = EvidenceWriter(out, bundle=bundle, untracked=(JOURNAL_NAME,))
+
+    # Journaled cases are kept only if their case file (and any spilled
+    # response body) still hashes to the journaled digest; anything else is
+    # executed again.
+    done, write_ns = {}, {}
     for tc in tests:
-        _verdict_override = None
-        tc_id = tc["id"]
-
-        applicable_profiles = tc.get("profiles")
-        if applicable_profiles and profile.get("id") not in applicable_profiles:
-            case = {
-                "test_case_id": tc_id,
-                "name": tc.get("name"),
-                "request": {"method": tc.get("method","POST"), "path": tc["path"], "headers": {}, "body": None},
-                "response": {"status": None, "headers": {}, "text": ""},
-                "elapsed_ms": 0,
-                "assertions": [{"type": "profile_gate", "profiles": applicable_profiles, "profile_id": profile.get("id"), "pass": True}],
-                "skipped": True
-            }
-            case_path = out/"cases"/f"{tc_id}.json"
-            case_path.write_text(json.dumps(case, indent=2), encoding="utf-8")
-            verdicts.append({"test_case_id": tc_id, "result": "NOT_APPLICABLE", "reason": f"not applicable to profile {profile.get('id')}", "elapsed_ms": 0})
-            continue
-        try:
-            headers = dict(sut.get("default_headers", {}))
-            headers.update(tc.get("request", {}).get("headers", {}) or {})
-            body = tc.get("request", {}).get("body", None)
-            body = apply_identifier_overrides(body, identifiers)
-
-            if profile["id"] == "high_assurance" and tc_id != "TC-SEC-001":
-                nonce = "nonce-" + str(uuid.uuid4())
-                ts = generated_at
-                add_ha_headers(headers, sut, nonce, ts)
-
-            started = time.time()
-
-            # Use fixture set if provided, else make a live HTTP request
-            if fixture_set is not None:
-                resp = fixture_request(fixture_set, tc_id)
-                if resp is None:
-                    elapsed_ms = 0
-                    case = {
-                        "id": tc_id,
-                        "name": tc.get("name"),
-                        "request": {"method": tc.get("method", "POST"), "path": tc["path"], "headers": headers, "body": body},
-                        "response": {"status": None, "headers": {}, "text": ""},
-                        "elapsed_ms": 0,
-                        "assertions": [{"type": "fixture_missing", "pass": False,
-                                        "note": f"No fixture entry for {tc_id} in fixture set"}],
-                    }
-                    case_path = out/"cases"/f"{tc_id}.json"
-                    case_path.write_text(json.dumps(case, indent=2), encoding="utf-8")
-                    verdicts.append({"test_case_id": tc_id, "result": "SKIP",
-                                     "reason": "no fixture entry", "elapsed_ms": 0})
-                    continue
+        entry = journal_cases.get(tc["id"])
+        rel = f"cases/{tc['id']}.json"
+        if entry is not None and entry["path"] == rel and all(
+            (out / f["path"]).is_file() and evidence.record(f["path"]) == f["sha256"]
+            for f in [entry, *entry.get("attachments", [])]
+        ):
+            done[tc["id"]] = entry["verdict"]
+            if "evidence_write_ns" in entry:
+                write_ns[rel] = entry["evidence_write_ns"]
+    pending = [tc for tc in tests if tc["id"] not in done]
+    if journaled is not None:
+        journal = RunJournal.resume(out)
+        print(f"Resuming run {run_id}: {len(done)} case(s) verified from the journal, {len(pending)} to execute.")
+    else:
+        journal = RunJournal.create(out, plan.sha256, run)
+
+    # The journal stays on disk if the run fails, for --resume; only its handle is released.
+    try:
+        # Live runs share one pooled keep-alive session (or async client) per SUT base_url
+        transport = None
+        if fixture_set is None:
+            from cts.transport import AsyncHttpTransport, HttpTransport, connection_settings
+            settings = connection_settings(sut, min_pool_size=args.concurrency)
+            if args.transport == "async":
+                transport = AsyncHttpTransport(settings, max_in_flight=args.concurrency, http2=args.http2)
             else:
-                resp = http_request(base_url, tc, headers, body)
-
-            elapsed_ms = int((time.time() - started) * 1000)
+                transport = HttpTransport(settings)
+
+        ctx = {
+            "profile": profile,
+            "sut": sut,
+            "base_url": base_url,
+            "fixture_set": fixture_set,
+            "transport": transport,
+            "capture": ResponseCapture(out, body_limit) if transport is not None else None,
+            "generated_at": generated_at,
+        }
 
-            case = {
-                "id": tc_id,
-                "name": tc.get("name"),
-                "request": {"method": tc.get("method","POST"), "path": tc["path"], "headers": headers, "body": body},
-                "response": {"status": resp.status_code, "headers": dict(resp.headers), "text": resp.text},
-                "elapsed_ms": elapsed_ms,
-                "assertions": []
+        load_tests = None
+        if args.load:
+            from cts.load import select_load_tests
+            load_tests = select_load_tests(tests, profile, args.load_tests)
+        load_options = {"duration": args.load_duration, "rps": args.load_rps}
+
+        # Case files are written and journaled as each case finishes, so an
+        # interrupted run loses at most the cases still in flight.
+        def record_case(idx: int, result: tuple[dict, dict]) -> None:
+            case, verdict = result
+            rel = f"cases/{pending[idx]['id']}.json"
+            attachments = []
+            body_file = case["response"].get("body_file")
+            if body_file is not None:
+                # Hashed while streaming; no need to read the body back
+                evidence.record(body_file["path"], body_file["sha256"], body_file["size"])
+                attachments.append(body_file)
+            started = time.perf_counter_ns()
+            digest = evidence.write_json(rel, case)
+            if "timings_ns" in case:
+                # Cannot be part of the case file it measures; kept out of the
+                # verdicts and report, and indexed with the case file instead
+                write_ns[rel] = time.perf_counter_ns() - started
+            journal.case(rel, digest, evidence.size(rel), verdict, attachments, evidence_write_ns=write_ns.get(rel))
+
+        results, transport_info, load_report = run_live(pending, ctx, args.concurrency, load_tests, load_options,
+                                                        on_result=record_case)
+        for tc, (_, verdict) in zip(pending, results):
+            done[tc["id"]] = verdict
+        verdicts = [done[tc["id"]] for tc in tests]
+
+        with phase("reports"):
+            if transport_info is not None:
+                run["transport"] = transport_info
+            if load_report is not None:
+                evidence.write_json("load-report.json", load_report)
+            run["ended_at"] = generated_at
+            evidence.write_json("run.json", run)
+            evidence.write_json("verdicts.json", verdicts)
+
+            pass_count = sum(1 for v in verdicts if v["result"] == "PASS")
+            fail_count = sum(1 for v in verdicts if v["result"] == "FAIL")
+            skip_count = sum(1 for v in verdicts if v["result"] == "SKIP")
+            na_count = sum(1 for v in verdicts if v["result"] == "NOT_APPLICABLE")
+            error_count = sum(1 for v in verdicts if v["result"] == "ERROR")
+            xfail_count = sum(1 for v in verdicts if v["result"] == "XFAIL")
+            applicable = len(verdicts) - na_count
+            evaluated = pass_count + fail_count + error_count + xfail_count
+            coverage_index = round((evaluated / applicable) * 100.0, 2) if applicable else 100.0
+            evidence_completeness = round(((pass_count + skip_count) / applicable) * 100.0, 2) if applicable else 100.0
+            summary_counts = {
+                "PASS": pass_count,
+                "FAIL": fail_count,
+                "SKIP": skip_count,
+                "NOT_APPLICABLE": na_count,
+                "ERROR": error_count,
+                "XFAIL": xfail_count,
+                "coverage_index": coverage_index,
+                "evidence_completeness": evidence_completeness,
+                "exit_status": 0 if all(v["result"] in ["PASS", "NOT_APPLICABLE"] for v in verdicts) else 1,
             }
-
-            resp_json = None
-            exp = tc.get("expect", {})
-
-            needs_json = any(k in exp for k in ["schema","json_path_exists","json_path_equals"]) or exp.get("response_json")
-            if needs_json:
-                try:
-                    resp_json = resp.json()
-                    case["response"]["json"] = resp_json
-                except Exception:
-                    pass
-
-            ok, assertions = _evaluate_assertions(
-                tc,
-                resp.status_code,
-                dict(resp.headers),
-                resp_json,
-                resp.text,
-            )
-            case["assertions"] = assertions
-
-            # Special replay test for HA: send the same nonce twice to trigger 409
-            if tc_id == "TC-SEC-002" and profile["id"] == "high_assurance" and fixture_set is None:
-                resp2 = http_request(base_url, tc, headers, body)
-                passed = resp2.status_code == exp.get("status")
-                ok &= passed
-                case["assertions"].append({"type":"replay","expected":exp.get("status"),"actual":resp2.status_code,"pass":passed})
-
-        except Exception as e:
-            elapsed_ms = int((time.time() - started) * 1000) if 'started' in locals() else 0
-            case = {
-                "id": tc_id,
-                "name": tc.get("name"),
-                "request": {"method": tc.get("method","POST"), "path": tc.get("path"), "headers": headers if 'headers' in locals() else {}, "body": body if 'body' in locals() else None},
-                "response": {"status": None, "headers": {}, "text": ""},
-                "elapsed_ms": elapsed_ms,
-                "assertions": [{"type": "exception", "pass": False, "error": str(e)}],
+            cts_report = {
+                "run_id": run_id,
+                "target_id": target_id,
+                "generated_at": generated_at,
+                "profile": profile["id"],
+                "profile_id": profile["id"],
+                "suite_version": tool_version(),
+                "tool": {"name": "trqp-cts", "version": tool_version()},
+                "summary": summary_counts,
+                "results": verdicts,
+            }
+            evidence.write_json("cts-report.json", cts_report)
+
+        signing_key = None
+        if profile.get("evidence", {}).get("sign_manifest"):
+            key_b64 = sut.get("signing_key_b64")
+            if not key_b64:
+                raise SystemExit("sign_manifest enabled but sut.signing_key_b64 missing")
+            from nacl.encoding import Base64Encoder
+            from nacl.signing import SigningKey
+            signing_key = SigningKey(key_b64.encode("utf-8"), encoder=Base64Encoder)
+
+        unlisted = ("bundle.zip", "manifest.sig", ROOT_SIG_NAME)
+        if merkle:
+            with phase("merkle"):
+                # Root and inclusion proofs over every artifact so far; the flat
+                # manifest below lists these two files as well.
+                leaves = {rel: evidence.digest(rel) for rel in evidence.files(exclude_names=unlisted)}
+                root_bytes, proofs_bytes = build_merkle_manifest(generated_at, leaves)
+                evidence.write_bytes(PROOFS_NAME, proofs_bytes)
+                evidence.write_bytes(ROOT_NAME, root_bytes)
+                if signing_key is not None:
+                    evidence.write_bytes(ROOT_SIG_NAME, signing_key.sign(root_bytes).signature)
+
+        with phase("manifest"):
+            manifest = {"generated_at": generated_at, "hashes": {}}
+            for rel in evidence.files(exclude_names=unlisted):
+                manifest["hashes"][rel] = evidence.digest(rel)
+
+            manifest_bytes = json.dumps(manifest, indent=2).encode("utf-8")
+            evidence.write_bytes("manifest.json", manifest_bytes)
+            if signing_key is not None:
+                evidence.write_bytes("manifest.sig", signing_key.sign(manifest_bytes).signature)
+
+        if bundle is not None:
+            # Members in rglob order with pinned metadata: identical evidence yields an identical bundle
+            with phase("bundle"):
+                evidence.finish_bundle("bundle.zip")
+
+        descriptor = {
+            "bundle_version": "0.1.0",
+            "run": run,
+            "artifacts": {
+                "run_json": "run.json",
+                "verdicts": "verdicts.json",
+                "manifest": "manifest.json",
+                "cases_dir": "cases"
             }
-            ok = False
-            _verdict_override = "ERROR"
-        case_path = out/"cases"/f"{tc_id}.json"
-        case_path.write_text(json.dumps(case, indent=2), encoding="utf-8")
-        verdicts.append({"test_case_id": tc_id, "result": (_verdict_override if _verdict_override else ("PASS" if ok else "FAIL")), "elapsed_ms": elapsed_ms})
-
-    run["ended_at"] = generated_at
-    (out/"run.json").write_text(json.dumps(run, indent=2), encoding="utf-8")
-    (out/"verdicts.json").write_text(json.dumps(verdicts, indent=2), encoding="utf-8")
-
-    pass_count = sum(1 for v in verdicts if v["result"] == "PASS")
-    fail_count = sum(1 for v in verdicts if v["result"] == "FAIL")
-    skip_count = sum(1 for v in verdicts if v["result"] == "SKIP")
-    na_count = sum(1 for v in verdicts if v["result"] == "NOT_APPLICABLE")
-    error_count = sum(1 for v in verdicts if v["result"] == "ERROR")
-    xfail_count = sum(1 for v in verdicts if v["result"] == "XFAIL")
-    applicable = len(verdicts) - na_count
-    evaluated = pass_count + fail_count + error_count + xfail_count
-    coverage_index = round((evaluated / applicable) * 100.0, 2) if applicable else 100.0
-    evidence_completeness = round(((pass_count + skip_count) / applicable) * 100.0, 2) if applicable else 100.0
-    summary_counts = {
-        "PASS": pass_count,
-        "FAIL": fail_count,
-        "SKIP": skip_count,
-        "NOT_APPLICABLE": na_count,
-        "ERROR": error_count,
-        "XFAIL": xfail_count,
-        "coverage_index": coverage_index,
-        "evidence_completeness": evidence_completeness,
-        "exit_status": 0 if all(v["result"] in ["PASS", "NOT_APPLICABLE"] for v in verdicts) else 1,
-    }
-    cts_report = {
-        "run_id": run_id,
-        "target_id": target_id,
-        "generated_at": generated_at,
-        "profile": profile["id"],
-        "profile_id": profile["id"],
-        "suite_version": VERSION,
-        "tool": {"name": "trqp-cts", "version": VERSION},
-        "summary": summary_counts,
-        "results": verdicts,
-    }
-    (out/"cts-report.json").write_text(json.dumps(cts_report, indent=2), encoding="utf-8")
-
-    manifest = {"generated_at": generated_at, "hashes": {}}
-    for p in sorted(out.rglob("*")):
-        if p.is_file() and p.name not in ["bundle.zip","manifest.sig"]:
-            manifest["hashes"][str(p.relative_to(out))] = sha256_file(p)
-
-    manifest_path = out/"manifest.json"
-    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
-
-    if profile.get("evidence", {}).get("sign_manifest"):
-        key_b64 = sut.get("signing_key_b64")
-        if not key_b64:
-            raise SystemExit("sign_manifest enabled but sut.signing_key_b64 missing")
-        sk = SigningKey(key_b64.encode("utf-8"), encoder=Base64Encoder)
-        sig = sk.sign(manifest_path.read_bytes()).signature
-        (out/"manifest.sig").write_bytes(sig)
-
-    if profile.get("evidence", {}).get("bundle", True):
-        bundle = out/"bundle.zip"
-        with zipfile.ZipFile(bundle, "w", compression=zipfile.ZIP_DEFLATED) as z:
-            for p in sorted(out.rglob("*")):
-                if p.is_file() and p.name != "bundle.zip":
-                    z.write(p, arcname=str(p.relative_to(out)))
-
-    descriptor = {
-        "bundle_version": "0.1.0",
-        "run": run,
-        "artifacts": {
-            "run_json": "run.json",
-            "verdicts": "verdicts.json",
-            "manifest": "manifest.json",
-            "cases_dir": "cases"
         }
-    }
-    if (out/"manifest.sig").exists():
-        descriptor["artifacts"]["signature"] = "manifest.sig"
-
-    artifact_index = []
-
-    ARTIFACT_KIND_MAP = {
-        "cts_run_json": "conformance_run_metadata",
-        "cts_verdicts": "conformance_verdicts",
-        "cts_manifest": "conformance_manifest",
-        "cts_manifest_sig": "conformance_manifest_signature",
-        "cts_case_file": "conformance_case_artifact",
-        "cts_bundle_zip": "conformance_evidence_bundle_zip",
-        "cts_bundle_descriptor": "conformance_evidence_bundle_descriptor",
-        "cts_checksums": "evidence_bundle_checksums",
-        "cts_report": "conformance_report",
-    }
+        if evidence.digest("manifest.sig") is not None:
+            descriptor["artifacts"]["signature"] = "manifest.sig"
+        if merkle:
+            descriptor["artifacts"]["merkle_root"] = ROOT_NAME
+            descriptor["artifacts"]["merkle_proofs"] = PROOFS_NAME
+            if evidence.digest(ROOT_SIG_NAME) is not None:
+                descriptor["artifacts"]["merkle_root_signature"] = ROOT_SIG_NAME
+
+        artifact_index = []
+
+        ARTIFACT_KIND_MAP = {
+            "cts_run_json": "conformance_run_metadata",
+            "cts_verdicts": "conformance_verdicts",
+            "cts_manifest": "conformance_manifest",
+            "cts_manifest_sig": "conformance_manifest_signature",
+            "cts_merkle_root": "conformance_manifest_merkle_root",
+            "cts_merkle_root_sig": "conformance_manifest_merkle_root_signature",
+            "cts_merkle_proofs": "conformance_manifest_inclusion_proofs",
+            "cts_case_file": "conformance_case_artifact",
+            "cts_case_body": "conformance_case_response_body",
+            "cts_bundle_zip": "conformance_evidence_bundle_zip",
+            "cts_bundle_descriptor": "conformance_evidence_bundle_descriptor",
+            "cts_checksums": "evidence_bundle_checksums",
+            "cts_report": "conformance_report",
+            "cts_load_report": "conformance_load_report",
+        }
 
-    def add_idx(kind: str, rel_path: str, notes: str | None = None):
-        p = out/rel_path
-        entry = {
-            "kind": kind,
-            "artifact_kind": ARTIFACT_KIND_MAP.get(kind),
-            "path": rel_path,
-            "produced_by": "trqp-cts",
+        def add_idx(kind: str, rel_path: str, notes: str | None = None):
+            entry = {
+                "kind": kind,
+                "artifact_kind": ARTIFACT_KIND_MAP.get(kind),
+                "path": rel_path,
+                "produced_by": "trqp-cts",
+            }
+            digest = evidence.digest(rel_path)
+            if digest is not None:
+                entry["sha256"] = digest
+                mt = guess_media_type(Path(rel_path))
+                if mt:
+                    entry["media_type"] = mt
+            if notes:
+                entry["notes"] = notes
+            artifact_index.append(entry)
+
+        add_idx("cts_run_json", "run.json")
+        add_idx("cts_report", "cts-report.json", notes="Operational Stack conformance report.")
+        add_idx("cts_verdicts", "verdicts.json")
+        add_idx("cts_manifest", "manifest.json")
+        if evidence.digest("manifest.sig") is not None:
+            add_idx("cts_manifest_sig", "manifest.sig", notes="Signature over manifest.json (high-assurance profiles).")
+        if merkle:
+            add_idx("cts_merkle_root", ROOT_NAME, notes="RFC 9162 Merkle root over the manifest artifacts.")
+            if evidence.digest(ROOT_SIG_NAME) is not None:
+                add_idx("cts_merkle_root_sig", ROOT_SIG_NAME, notes="Signature over manifest-merkle.json.")
+            add_idx("cts_merkle_proofs", PROOFS_NAME, notes="Per-artifact inclusion proofs, one JSON object per line.")
+
+        if evidence.digest("load-report.json") is not None:
+            descriptor["artifacts"]["load_report"] = "load-report.json"
+            add_idx("cts_load_report", "load-report.json", notes="Load/soak latency histograms, throughput timeline and error breakdown.")
+
+        cases_dir = out/"cases"
+        if cases_dir.exists():
+            for p in sorted(cases_dir.glob("*.json")):
+                add_idx("cts_case_file", str(p.relative_to(out)))
+                if f"cases/{p.name}" in write_ns:
+                    artifact_index[-1]["evidence_write_ns"] = write_ns[f"cases/{p.name}"]
+            for p in sorted(cases_dir.glob("*.body")):
+                add_idx("cts_case_body", str(p.relative_to(out)), notes="Response body spilled from the case file (body_file).")
+
+        if evidence.digest("bundle.zip") is not None:
+            descriptor["artifacts"]["bundle_zip"] = "bundle.zip"
+            add_idx("cts_bundle_zip", "bundle.zip")
+
+        descriptor["artifact_index"] = artifact_index
+        evidence.write_json("bundle_descriptor.json", descriptor)
+        add_idx("cts_bundle_descriptor", "bundle_descriptor.json")
+
+        checksums = []
+        for a in artifact_index:
+            if a.get("sha256") and a.get("path"):
+                checksums.append({"path": a["path"], "sha256": a["sha256"]})
+        checksums_obj = {
+            "checksums_version": "0.1.0",
+            "algorithm": "sha256",
+            "generated_by": "trqp-cts",
+            "generated_at": generated_at,
+            "entries": sorted(checksums, key=lambda e: e["path"]),
         }
-        if p.exists() and p.is_file():
-            entry["sha256"] = sha256_file(p)
-            mt = guess_media_type(p)
-            if mt:
-                entry["media_type"] = mt
-        if notes:
-            entry["notes"] = notes
-        artifact_index.append(entry)
-
-    add_idx("cts_run_json", "run.json")
-    add_idx("cts_report", "cts-report.json", notes="Operational Stack conformance report.")
-    add_idx("cts_verdicts", "verdicts.json")
-    add_idx("cts_manifest", "manifest.json")
-    if (out/"manifest.sig").exists():
-        add_idx("cts_manifest_sig", "manifest.sig", notes="Signature over manifest.json (high-assurance profiles).")
-
-    cases_dir = out/"cases"
-    if cases_dir.exists():
-        for p in sorted(cases_dir.glob("*.json")):
-            add_idx("cts_case_file", str(p.relative_to(out)))
-
-    if (out/"bundle.zip").exists():
-        descriptor["artifacts"]["bundle_zip"] = "bundle.zip"
-        add_idx("cts_bundle_zip", "bundle.zip")
-
-    descriptor["artifact_index"] = artifact_index
-    (out/"bundle_descriptor.json").write_text(json.dumps(descriptor, indent=2), encoding="utf-8")
-    add_idx("cts_bundle_descriptor", "bundle_descriptor.json")
-
-    checksums = []
-    for a in artifact_index:
-        if a.get("sha256") and a.get("path"):
-            checksums.append({"path": a["path"], "sha256": a["sha256"]})
-    checksums_obj = {
-        "checksums_version": "0.1.0",
-        "algorithm": "sha256",
-        "generated_by": "trqp-cts",
-        "generated_at": generated_at,
-        "entries": sorted(checksums, key=lambda e: e["path"]),
-    }
-    (out/"checksums.json").write_text(json.dumps(checksums_obj, indent=2), encoding="utf-8")
-    add_idx("cts_checksums", "checksums.json")
+        evidence.write_json("checksums.json", checksums_obj)
+        add_idx("cts_checksums", "checksums.json")
+        journal.remove()
+    finally:
+        journal.close()
+        if bundle is not None:
+            bundle.close()
 
     print(f"OK: evidence written to {out}")
+    return cts_report
 
 if __name__ == "__main__":
     main()
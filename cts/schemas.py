@@ -0,0 +1,147 @@
+"""Process-wide JSON Schema registry.
+
+Every schema under ``schemas/`` (including ``schemas/core`` and the other
+``$ref`` targets) is read and parsed once, registered for ``$ref`` resolution,
+and compiled into a reusable validator on first use. The runner, replay, fleet
+workers and the ``scripts/validate_*`` tools share one registry per process, so
+a schema assertion costs a validation pass rather than a file read, a parse
+and a metaschema check.
+
+Each schema is registered under its file URI and, when present, its ``$id``,
+and is compiled with its ``$id`` made absolute against its file URI (a schema
+without one gets the file URI itself). Relative ``$ref`` values therefore
+resolve against the schema's location on disk
+(``"$ref": "./core/error.schema.json"``) as well as against its ``$id``.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from urllib.parse import urljoin
+
+ROOT = Path(__file__).resolve().parent.parent
+SCHEMAS_DIR = ROOT / "schemas"
+
+
+def _resource(contents: dict):
+    from referencing.jsonschema import DRAFT202012, specification_with
+    return specification_with(contents.get("$schema", ""), default=DRAFT202012).create_resource(contents)
+
+
+def _base_uri(path: Path, schema: dict) -> str:
+    uri = path.as_uri()
+    sid = schema.get("$id") if isinstance(schema, dict) else None
+    return urljoin(uri, sid) if isinstance(sid, str) and sid else uri
+
+
+class SchemaRegistry:
+    """Loads a schema tree once and hands out compiled, cached validators."""
+
+    def __init__(self, schemas_dir: Path = SCHEMAS_DIR):
+        self.schemas_dir = Path(schemas_dir).resolve()
+        self._lock = threading.RLock()
+        self._documents: dict[Path, dict] | None = None
+        self._registry = None
+        self._validators: dict[Path, object] = {}
+
+    def _resolve_path(self, schema_path: str | Path) -> Path:
+        p = Path(schema_path)
+        return (p if p.is_absolute() else ROOT / p).resolve()
+
+    def _load(self) -> None:
+        # jsonschema/referencing are imported here, not at module import, so
+        # runner paths that never validate (e.g. --list-tests) stay light.
+        from referencing import Registry
+
+        documents, resources = {}, []
+        for path in sorted(self.schemas_dir.rglob("*.json")):
+            path = path.resolve()
+            contents = json.loads(path.read_text(encoding="utf-8"))
+            documents[path] = contents
+            resource = _resource(contents)
+            resources.append((path.as_uri(), resource))
+            base = _base_uri(path, contents)
+            if base != path.as_uri():
+                resources.append((base, resource))
+        self._documents = documents
+        self._registry = Registry().with_resources(resources)
+
+    def _ensure_loaded(self) -> None:
+        if self._documents is None:
+            with self._lock:
+                if self._documents is None:
+                    self._load()
+
+    def schema(self, schema_path: str | Path) -> dict:
+        """Return the parsed schema document (loaded from disk at most once)."""
+        self._ensure_loaded()
+        path = self._resolve_path(schema_path)
+        doc = self._documents.get(path)
+        if doc is None:
+            with self._lock:
+                doc = self._documents.get(path)
+                if doc is None:
+                    # Schemas outside the registry root are loaded on demand and
+                    # registered so that later $refs to them resolve too.
+                    doc = json.loads(path.read_text(encoding="utf-8"))
+                    self._registry = self._registry.with_resource(path.as_uri(), _resource(doc))
+                    self._documents[path] = doc
+        return doc
+
+    def validator(self, schema_path: str | Path):
+        """Return the compiled validator for a schema, checking the metaschema once."""
+        path = self._resolve_path(schema_path)
+        compiled = self._validators.get(path)
+        if compiled is not None:
+            return compiled
+        schema = self.schema(path)
+        with self._lock:
+            compiled = self._validators.get(path)
+            if compiled is None:
+                from jsonschema.validators import validator_for
+                cls = validator_for(schema)
+                cls.check_schema(schema)
+                # Resolve relative $refs against the schema's own location rather
+                # than the empty base URI jsonschema assumes for in-memory schemas.
+                base = _base_uri(path, schema)
+                root = schema if schema.get("$id") == base else {**schema, "$id": base}
+                compiled = cls(root, registry=self._registry)
+                self._validators[path] = compiled
+        return compiled
+
+    def compile_all(self) -> int:
+        """Compile every schema under the registry root; returns the number compiled."""
+        self._ensure_loaded()
+        for path in list(self._documents):
+            self.validator(path)
+        return len(self._validators)
+
+    def validate(self, instance, schema_path: str | Path) -> None:
+        """Validate like ``jsonschema.validate``: raise the best-matching ValidationError."""
+        from jsonschema.exceptions import best_match
+        error = best_match(self.validator(schema_path).iter_errors(instance))
+        if error is not None:
+            raise error
+
+    def iter_errors(self, instance, schema_path: str | Path):
+        return self.validator(schema_path).iter_errors(instance)
+
+
+_shared: SchemaRegistry | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_registry() -> SchemaRegistry:
+    """The process-wide registry over ``schemas/``."""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = SchemaRegistry()
+    return _shared
+
+
+def validate(instance, schema_path: str | Path) -> None:
+    shared_registry().validate(instance, schema_path)
@@ -0,0 +1,191 @@
+"""Read-only access to an evidence set, unpacked or as ``bundle.zip``.
+
+Replay, determinism reporting and evidence verification read evidence through
+an :class:`EvidenceSource` instead of touching the filesystem directly, so
+archived bundles can be audited in place:
+
+- :class:`DirectorySource` reads a run output directory.
+- :class:`BundleSource` reads members of a ``bundle.zip`` through its central
+  directory. Members are decompressed as they are read and hashed in chunks;
+  nothing is extracted to disk.
+
+Paths are always POSIX-style and relative to the evidence root
+(``cases/TC-LIFE-001.json``), matching the names in ``manifest.json``.
+
+Usage::
+
+    with open_evidence(Path("archive/2026-01-15/bundle.zip")) as source:
+        run = source.read_json("run.json")
+        for rel in source.list("cases", ".json"):
+            digest, size = source.hash(rel)
+"""
+
+from __future__ import annotations
+
+import abc
+import glob
+import hashlib
+import json
+import mmap
+import os
+import zipfile
+from pathlib import Path, PurePosixPath
+
+from cts.evidence import CHUNK_SIZE, evidence_sort_key
+
+
+class EvidenceSource(abc.ABC):
+    """Common interface of the evidence readers; see the module docstring."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        pass
+
+    @abc.abstractmethod
+    def names(self) -> list[str]:
+        """Every file in the evidence set, in manifest (path component) order."""
+
+    @abc.abstractmethod
+    def exists(self, rel: str) -> bool:
+        """Whether ``rel`` is a file in the evidence set."""
+
+    @abc.abstractmethod
+    def open(self, rel: str):
+        """Binary file object for ``rel``; raises FileNotFoundError if it is absent."""
+
+    @abc.abstractmethod
+    def describe(self, rel: str) -> str:
+        """Human-readable location of ``rel`` for error messages."""
+
+    def has_dir(self, rel: str) -> bool:
+        prefix = rel.rstrip("/") + "/"
+        return any(name.startswith(prefix) for name in self.names())
+
+    def list(self, directory: str, suffix: str = "") -> list[str]:
+        """Files directly inside ``directory`` ending in ``suffix``, sorted by name."""
+        parent = PurePosixPath(directory)
+        return [name for name in self.names()
+                if PurePosixPath(name).parent == parent and name.endswith(suffix)]
+
+    def read_bytes(self, rel: str) -> bytes:
+        with self.open(rel) as f:
+            return f.read()
+
+    def read_json(self, rel: str):
+        return json.loads(self.read_bytes(rel).decode("utf-8"))
+
+    def hash(self, rel: str) -> tuple[str, int]:
+        """``(sha256, size)`` of ``rel``, streamed in fixed-size chunks."""
+        h = hashlib.sha256()
+        size = 0
+        with self.open(rel) as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                h.update(chunk)
+                size += len(chunk)
+        return h.hexdigest(), size
+
+
+class DirectorySource(EvidenceSource):
+    """An unpacked run output directory."""
+
+    def names(self) -> list[str]:
+        rels = [p.relative_to(self.path).as_posix() for p in self.path.rglob("*") if p.is_file()]
+        return sorted(rels, key=evidence_sort_key)
+
+    def exists(self, rel: str) -> bool:
+        return (self.path / rel).is_file()
+
+    def has_dir(self, rel: str) -> bool:
+        return (self.path / rel).is_dir()
+
+    def list(self, directory: str, suffix: str = "") -> list[str]:
+        return [f"{directory}/{p.name}" for p in sorted((self.path / directory).glob(f"*{suffix}")) if p.is_file()]
+
+    def open(self, rel: str):
+        return open(self.path / rel, "rb")
+
+    def hash(self, rel: str) -> tuple[str, int]:
+        """``(sha256, size)`` of ``rel``; files of ``CHUNK_SIZE`` or more are hashed through mmap."""
+        with self.open(rel) as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < CHUNK_SIZE:
+                return hashlib.sha256(f.read()).hexdigest(), size
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return hashlib.sha256(mapped).hexdigest(), size
+
+    def describe(self, rel: str) -> str:
+        return str(self.path / rel)
+
+
+class BundleSource(EvidenceSource):
+    """Members of a ``bundle.zip``, read without extraction.
+
+    Member CRCs are checked by :mod:`zipfile` as each member is read to the end.
+    """
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        try:
+            self._zip = zipfile.ZipFile(self.path)
+        except zipfile.BadZipFile as e:
+            raise SystemExit(f"Not a readable evidence bundle: {self.path} ({e})") from None
+        self._names = sorted((i.filename for i in self._zip.infolist() if not i.is_dir()), key=evidence_sort_key)
+        self._members = set(self._names)
+
+    def close(self) -> None:
+        self._zip.close()
+
+    def names(self) -> list[str]:
+        return list(self._names)
+
+    def exists(self, rel: str) -> bool:
+        return rel in self._members
+
+    def open(self, rel: str):
+        if rel not in self._members:
+            raise FileNotFoundError(f"{self.describe(rel)} not found")
+        return self._zip.open(rel)
+
+    def describe(self, rel: str) -> str:
+        return f"{self.path}!{rel}"
+
+
+def is_bundle(path: Path) -> bool:
+    return Path(path).is_file() and zipfile.is_zipfile(path)
+
+
+def open_evidence(path: Path) -> EvidenceSource:
+    """Evidence source for a run directory or a ``bundle.zip``."""
+    path = Path(path)
+    if path.is_dir():
+        return DirectorySource(path)
+    if is_bundle(path):
+        return BundleSource(path)
+    raise SystemExit(f"Not an evidence directory or bundle.zip: {path}")
+
+
+def discover_evidence(patterns: list[str]) -> list[Path]:
+    """Run directories and bundles under each path or glob pattern, sorted and de-duplicated.
+
+    A run directory is any directory with a ``cases/`` subdirectory. A
+    ``bundle.zip`` inside a run directory is not listed separately.
+    """
+    found = set()
+    for pattern in patterns:
+        matches = glob.glob(pattern) if glob.has_magic(pattern) else [pattern]
+        for match in map(Path, matches):
+            if (match / "cases").is_dir() or is_bundle(match):
+                found.add(match.resolve())
+            elif match.is_dir():
+                found.update(p.parent.resolve() for p in match.rglob("cases") if p.is_dir())
+                found.update(p.resolve() for p in match.rglob("bundle.zip")
+                             if not (p.parent / "cases").is_dir() and is_bundle(p))
+    return sorted(found)
@@ -0,0 +1,482 @@
+"""HTTP transport for the CTS runner.
+
+The runner talks to a SUT through :class:`HttpTransport`, which keeps one
+pooled keep-alive ``requests.Session`` per SUT ``base_url`` instead of opening
+a fresh TCP/TLS connection for every test case. Connection handling is
+configured from the optional ``connection`` block of the SUT YAML::
+
+    connection:
+      pool_size: 10           # connections kept per host
+      keep_alive: true        # false sends "Connection: close" on every request
+      tls_session_reuse: true # resume TLS sessions when a new connection is opened
+
+Every request reports whether it rode an existing connection (and, for new
+TLS connections, whether the TLS session was resumed) so run evidence can
+separate cold-connect latency from query latency.
+
+:class:`AsyncHttpTransport` is the asyncio counterpart used by
+``--transport async``. It is built on ``httpx`` (optional; ``httpx[http2]``
+for HTTP/2 multiplexing) and lets one process keep many requests in flight
+without a thread per request.
+
+Both transports accept an optional :class:`cts.capture.BodyCapture`. With one,
+the response body is streamed into it (hashed as it arrives, spilled to disk
+past the inline limit) instead of being read into memory in one piece.
+
+The connection info also carries ``timings_ns``: monotonic nanoseconds spent
+in each phase of the request (see :data:`PHASES`). Phases that did not happen
+(connection setup on a reused connection) are 0; phases a transport cannot
+tell apart are None. :class:`HttpTransport` times connection setup through
+urllib3's public ``connect()``, so its ``connect`` covers name resolution,
+TCP connect and TLS handshake, with ``dns`` and ``tls`` None. httpx resolves
+names inside its TCP connect, so under the async transport ``dns`` is None and
+``connect`` includes resolution, while ``tls`` is reported on its own. Requests
+sent through a SOCKS proxy bypass the tracked connections: their connection
+phases and ``reused`` are None.
+"""
+
+from __future__ import annotations
+
+import json
+import ssl
+import threading
+import time
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.poolmanager import ProxyManager
+
+from cts.capture import CHUNK_SIZE, CapturedResponse
+
+DEFAULT_TIMEOUT = 20
+
+CONNECTION_DEFAULTS = {
+    "pool_size": 10,
+    "keep_alive": True,
+    "tls_session_reuse": True,
+}
+
+# Request phases reported in ``timings_ns``, in the order they happen
+PHASES = ("dns", "connect", "tls", "request_write", "ttfb", "body_download")
+
+# Per-thread record of what happened at the socket level during the current
+# request. requests is blocking, so a request starts and finishes on one thread.
+_tracking = threading.local()
+
+
+def _add_timing(phase: str, ns: int) -> None:
+    timings = getattr(_tracking, "timings", None)
+    if timings is not None:
+        timings[phase] += ns
+
+
+def _connection_ns() -> int:
+    timings = getattr(_tracking, "timings", None)
+    return timings["connect"] if timings is not None else 0
+
+
+def connection_settings(sut: dict, min_pool_size: int = 1) -> dict:
+    """Return the effective connection settings for a SUT config."""
+    settings = {**CONNECTION_DEFAULTS, **(sut.get("connection") or {})}
+    if not isinstance(settings["pool_size"], int) or settings["pool_size"] < 1:
+        raise SystemExit("sut.connection.pool_size must be a positive integer")
+    if "pool_size" not in (sut.get("connection") or {}):
+        settings["pool_size"] = max(settings["pool_size"], min_pool_size)
+    settings["keep_alive"] = bool(settings["keep_alive"])
+    settings["tls_session_reuse"] = bool(settings["tls_session_reuse"])
+    return settings
+
+
+class _ResumingSSLContext(ssl.SSLContext):
+    """Client SSL context that offers the last TLS session seen for a host."""
+
+    def __init__(self, protocol=ssl.PROTOCOL_TLS_CLIENT):
+        # ssl.SSLContext does all of its setup in __new__
+        self.minimum_version = ssl.TLSVersion.TLSv1_2
+        self._sessions = {}
+        self._sessions_lock = threading.Lock()
+
+    @staticmethod
+    def _key(host) -> str | None:
+        return host.decode("idna") if isinstance(host, bytes) else host
+
+    def remember(self, host: str | None, session) -> None:
+        if host and session is not None:
+            with self._sessions_lock:
+                self._sessions[self._key(host)] = session
+
+    def _session_for(self, server_hostname):
+        if not server_hostname:
+            return None
+        with self._sessions_lock:
+            return self._sessions.get(self._key(server_hostname))
+
+    def wrap_socket(self, sock, server_side=False, do_handshake_on_connect=True,
+                    suppress_ragged_eofs=True, server_hostname=None, session=None):
+        if session is None:
+            session = self._session_for(server_hostname)
+        return super().wrap_socket(sock, server_side, do_handshake_on_connect,
+                                   suppress_ragged_eofs, server_hostname, session)
+
+    def wrap_bio(self, incoming, outgoing, server_side=False, server_hostname=None, session=None):
+        # asyncio/anyio TLS goes through wrap_bio rather than wrap_socket
+        if session is None:
+            session = self._session_for(server_hostname)
+        return super().wrap_bio(incoming, outgoing, server_side, server_hostname, session)
+
+
+def _resuming_ssl_context(alpn: list[str] | None = None) -> _ResumingSSLContext:
+    ctx = _ResumingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    ctx.load_verify_locations(requests.certs.where())
+    if alpn:
+        ctx.set_alpn_protocols(alpn)
+    return ctx
+
+
+class _TimedConnectionMixin:
+    """Times connection setup, request write and time to first byte on a urllib3 connection."""
+
+    def connect(self) -> None:
+        # urllib3 resolves, connects and (for HTTPS) handshakes in one call, so
+        # the blocking transport reports all of it as ``connect``
+        started = time.perf_counter_ns()
+        super().connect()
+        _add_timing("connect", time.perf_counter_ns() - started)
+        _tracking.opened = True
+
+    def request(self, *args, **kwargs):
+        # http.client connects lazily on the first send; that time is already
+        # booked to the connection phases and is not part of the write
+        started, connecting = time.perf_counter_ns(), _connection_ns()
+        super().request(*args, **kwargs)
+        _add_timing("request_write", time.perf_counter_ns() - started - (_connection_ns() - connecting))
+
+    def getresponse(self, *args, **kwargs):
+        started = time.perf_counter_ns()
+        resp = super().getresponse(*args, **kwargs)
+        _add_timing("ttfb", time.perf_counter_ns() - started)
+        return resp
+
+
+class _TrackedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TrackedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    def connect(self) -> None:
+        super().connect()
+        _tracking.tls_session_reused = getattr(self.sock, "session_reused", None)
+
+    def getresponse(self, *args, **kwargs):
+        sock = self.sock
+        resp = super().getresponse(*args, **kwargs)
+        # TLS 1.3 tickets arrive after the handshake, so capture the session
+        # once the server has answered (the socket may already be closed).
+        if isinstance(self.ssl_context, _ResumingSSLContext) and sock is not None:
+            self.ssl_context.remember(self.server_hostname or self.host, getattr(sock, "session", None))
+        return resp
+
+
+class _TrackedPoolMixin:
+    def urlopen(self, *args, **kwargs):
+        _tracking.tracked = True
+        return super().urlopen(*args, **kwargs)
+
+
+class _TrackedHTTPConnectionPool(_TrackedPoolMixin, HTTPConnectionPool):
+    ConnectionCls = _TrackedHTTPConnection
+
+
+class _TrackedHTTPSConnectionPool(_TrackedPoolMixin, HTTPSConnectionPool):
+    ConnectionCls = _TrackedHTTPSConnection
+
+
+_TRACKED_POOLS = {"http": _TrackedHTTPConnectionPool, "https": _TrackedHTTPSConnectionPool}
+
+
+class _TrackedHTTPAdapter(HTTPAdapter):
+    """Sends direct and HTTP(S)-proxied requests through the tracked connection pools."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _TRACKED_POOLS
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        if type(manager) is ProxyManager:  # SOCKS managers bring their own connection classes
+            manager.pool_classes_by_scheme = _TRACKED_POOLS
+        return manager
+
+
+class HttpTransport:
+    """Blocking HTTP transport with one pooled session per SUT base_url."""
+
+    kind = "requests"
+    is_async = False
+
+    def __init__(self, settings: dict | None = None, timeout: float = DEFAULT_TIMEOUT):
+        self.settings = {**CONNECTION_DEFAULTS, **(settings or {})}
+        self.timeout = timeout
+        self._sessions: dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "connections_opened": 0, "connections_reused": 0, "tls_sessions_resumed": 0}
+
+    def _new_session(self) -> requests.Session:
+        pool_size = self.settings["pool_size"]
+        pool_kwargs: dict[str, Any] = {}
+        if self.settings["tls_session_reuse"]:
+            pool_kwargs["ssl_context"] = _resuming_ssl_context()
+        adapter = _TrackedHTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        adapter.init_poolmanager(1, pool_size, **pool_kwargs)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        if not self.settings["keep_alive"]:
+            session.headers["Connection"] = "close"
+        return session
+
+    def session_for(self, base_url: str) -> requests.Session:
+        key = base_url.rstrip("/")
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._sessions[key] = self._new_session()
+            return session
+
+    def request(self, base_url: str, method: str, path: str, headers: dict, body,
+                capture=None) -> tuple[requests.Response, dict]:
+        """Send one request; return ``(response, connection_info)``.
+
+        With ``capture`` the body is streamed into it; a spilled body comes
+        back as a :class:`cts.capture.CapturedResponse`.
+        """
+        session = self.session_for(base_url)
+        _tracking.opened = _tracking.tracked = False
+        _tracking.tls_session_reused = None
+        _tracking.timings = timings = {**dict.fromkeys(PHASES, 0), "dns": None, "tls": None}
+        # Always stream, so that reading the body is timed on its own
+        resp = session.request(method, base_url.rstrip("/") + path, headers=headers, json=body, timeout=self.timeout,
+                               stream=True)
+        started = time.perf_counter_ns()
+        if capture is not None:
+            resp = _drain(resp, capture)
+        else:
+            resp.content  # reads the body and releases the connection
+        timings["body_download"] = time.perf_counter_ns() - started
+        if not _tracking.tracked:
+            # Sent through connections this transport cannot observe (a SOCKS proxy)
+            timings.update(connect=None, request_write=None, ttfb=None)
+        info = {"reused": not _tracking.opened if _tracking.tracked else None}
+        if _tracking.opened and _tracking.tls_session_reused is not None:
+            info["tls_session_reused"] = bool(_tracking.tls_session_reused)
+        with self._lock:
+            self._stats["requests"] += 1
+            if info["reused"] is not None:
+                self._stats["connections_reused" if info["reused"] else "connections_opened"] += 1
+            if info.get("tls_session_reused"):
+                self._stats["tls_sessions_resumed"] += 1
+        info["timings_ns"] = timings
+        return resp, info
+
+    def describe(self) -> dict:
+        """Transport settings and connection counters for run evidence."""
+        with self._lock:
+            return {"kind": self.kind, **self.settings, "stats": dict(self._stats)}
+
+    def close(self) -> None:
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+def _drain(resp: requests.Response, capture):
+    """Stream a ``stream=True`` response into ``capture`` and release the connection."""
+    try:
+        for chunk in resp.iter_content(CHUNK_SIZE):
+            capture.write(chunk)
+        capture.finish()
+    except BaseException:
+        capture.abort()
+        raise
+    finally:
+        resp.close()
+    if capture.spilled:
+        return CapturedResponse(resp.status_code, resp.headers, capture, resp.encoding)
+    # Under the inline limit: hand back the ordinary Response, so text/json
+    # decoding is exactly what requests would have done without streaming.
+    resp._content = capture.content()
+    return resp
+
+
+class _BufferedResponse:
+    """Transport-neutral response exposing the subset of requests.Response the runner uses."""
+
+    def __init__(self, status_code: int, headers: dict, content: bytes, encoding: str | None):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.text = content.decode(encoding or "utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.text)
+
+
+def _raw_headers(raw: list[tuple[bytes, bytes]]) -> dict:
+    """Header dict with wire casing, folding repeats the way urllib3 does."""
+    headers: dict[str, str] = {}
+    for name, value in raw:
+        k, v = name.decode("latin-1"), value.decode("latin-1")
+        headers[k] = f"{headers[k]}, {v}" if k in headers else v
+    return headers
+
+
+def _trace_timings(phase_ns: dict[str, int], body_ns: int) -> dict:
+    """Map httpcore trace steps (``http11.send_request_headers`` etc.) onto :data:`PHASES`."""
+    def total(*suffixes: str) -> int:
+        return sum(ns for step, ns in phase_ns.items() if step.endswith(suffixes))
+
+    return {
+        "dns": None,
+        "connect": phase_ns.get("connection.connect_tcp", 0),
+        "tls": phase_ns.get("connection.start_tls", 0),
+        "request_write": total(".send_request_headers", ".send_request_body"),
+        "ttfb": total(".receive_response_headers"),
+        "body_download": body_ns,
+    }
+
+
+class AsyncHttpTransport:
+    """asyncio HTTP transport (httpx) with one client per SUT base_url.
+
+    ``max_in_flight`` bounds the number of concurrent requests across all
+    clients. The httpx client is created lazily so that it binds to the
+    running event loop; call :meth:`aclose` from that loop when done.
+    """
+
+    kind = "httpx-async"
+    is_async = True
+
+    def __init__(self, settings: dict | None = None, max_in_flight: int = 1, http2: bool = False,
+                 timeout: float = DEFAULT_TIMEOUT):
+        try:
+            import httpx
+        except ImportError:
+            raise SystemExit("--transport async requires httpx (pip install 'httpx[http2]')")
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                raise SystemExit("--http2 requires the h2 package (pip install 'httpx[http2]')")
+        self._httpx = httpx
+        self.settings = {**CONNECTION_DEFAULTS, **(settings or {})}
+        self.max_in_flight = max_in_flight
+        self.http2 = http2
+        self.timeout = timeout
+        self._clients: dict = {}
+        self._semaphore = None
+        self._stats = {"requests": 0, "connections_opened": 0, "connections_reused": 0, "tls_sessions_resumed": 0}
+
+    def _client_for(self, base_url: str):
+        key = base_url.rstrip("/")
+        entry = self._clients.get(key)
+        if entry is None:
+            httpx = self._httpx
+            pool_size = self.settings["pool_size"]
+            limits = httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size if self.settings["keep_alive"] else 0,
+            )
+            ssl_context = None
+            if self.settings["tls_session_reuse"]:
+                ssl_context = _resuming_ssl_context(["h2", "http/1.1"] if self.http2 else ["http/1.1"])
+            headers = {"Connection": "close"} if not self.settings["keep_alive"] and not self.http2 else None
+            client = httpx.AsyncClient(
+                http2=self.http2, limits=limits, verify=ssl_context or True, headers=headers,
+                timeout=self.timeout, follow_redirects=True,
+            )
+            entry = self._clients[key] = (client, ssl_context)
+        return entry
+
+    async def request(self, base_url: str, method: str, path: str, headers: dict, body,
+                      capture=None) -> tuple[_BufferedResponse, dict]:
+        """Send one request; return ``(response, connection_info)``.
+
+        With ``capture`` the body is streamed into it; a spilled body comes
+        back as a :class:`cts.capture.CapturedResponse`.
+        """
+        import asyncio
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        client, ssl_context = self._client_for(base_url)
+        seen: dict = {"opened": False, "tls": None}
+        started_ns: dict[str, int] = {}
+        phase_ns: dict[str, int] = {}
+
+        async def trace(event: str, info: dict) -> None:
+            now = time.perf_counter_ns()
+            step, _, stage = event.rpartition(".")
+            if stage == "started":
+                started_ns[step] = now
+            elif step in started_ns:
+                phase_ns[step] = phase_ns.get(step, 0) + now - started_ns.pop(step)
+            if event == "connection.connect_tcp.complete":
+                seen["opened"] = True
+            elif event == "connection.start_tls.complete":
+                ssl_object = info["return_value"].get_extra_info("ssl_object")
+                seen["tls"] = getattr(ssl_object, "session_reused", None)
+                seen["ssl_object"] = ssl_object
+
+        async with self._semaphore:
+            async with client.stream(
+                method, base_url.rstrip("/") + path, headers=headers, json=body,
+                extensions={"trace": trace},
+            ) as resp:
+                body_started = time.perf_counter_ns()
+                if capture is None:
+                    content = await resp.aread()
+                else:
+                    try:
+                        async for chunk in resp.aiter_bytes(CHUNK_SIZE):
+                            capture.write(chunk)
+                        capture.finish()
+                    except BaseException:
+                        capture.abort()
+                        raise
+                    content = None if capture.spilled else capture.content()
+                body_ns = time.perf_counter_ns() - body_started
+        ssl_object = seen.get("ssl_object")
+        if ssl_object is not None and ssl_context is not None:
+            ssl_context.remember(ssl_object.server_hostname, ssl_object.session)
+
+        info = {"reused": not seen["opened"]}
+        if seen["opened"] and seen["tls"] is not None:
+            info["tls_session_reused"] = bool(seen["tls"])
+        if self.http2:
+            info["http_version"] = resp.http_version
+        info["timings_ns"] = _trace_timings(phase_ns, body_ns)
+        self._stats["requests"] += 1
+        self._stats["connections_reused" if info["reused"] else "connections_opened"] += 1
+        if info.get("tls_session_reused"):
+            self._stats["tls_sessions_resumed"] += 1
+        resp_headers = _raw_headers(resp.headers.raw)
+        if content is None:
+            return CapturedResponse(resp.status_code, resp_headers, capture, resp.encoding), info
+        return _BufferedResponse(resp.status_code, resp_headers, content, resp.encoding), info
+
+    def describe(self) -> dict:
+        """Transport settings and connection counters for run evidence."""
+        return {
+            "kind": self.kind, **self.settings,
+            "max_in_flight": self.max_in_flight, "http2": self.http2,
+            "stats": dict(self._stats),
+        }
+
+    async def aclose(self) -> None:
+        for client, _ in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
@@ -0,0 +1,246 @@
+"""Integrity verification of an evidence set, unpacked or as ``bundle.zip``.
+
+:func:`verify_evidence` recomputes the SHA-256 of every artifact listed in
+``manifest.json``, ``checksums.json`` and the ``bundle_descriptor.json``
+artifact index (the latter two when the evidence set has them) and compares
+it with the recorded digest. Artifacts are read through :mod:`cts.source`, so
+a bundle is verified member by member straight from the archive: each member
+is decompressed and hashed in chunks and never written to disk. Files of an
+unpacked run are hashed through mmap.
+
+Each artifact is hashed once even when several indexes list it.
+
+Given an Ed25519 public key, ``manifest.sig`` (and ``manifest-merkle.sig``)
+are checked against the signed files. Without a key, present signatures are
+reported as unverified rather than failing.
+
+:func:`verify_many` verifies many evidence sets on a process pool, one set
+per task, for audits of whole archives.
+
+:func:`verify_artifact` checks single artifacts of a run written with
+``evidence.manifest_mode: merkle`` against ``manifest-merkle.json``: only the
+artifact and its inclusion proof are read and hashed (see :mod:`cts.merkle`).
+Given a public key, ``manifest-merkle.sig`` must verify over the root before
+any proof is trusted.
+"""
+
+from __future__ import annotations
+
+import base64
+import multiprocessing
+import time
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from cts.merkle import PROOFS_NAME, ROOT_NAME, ROOT_SIG_NAME, find_proof, leaf_hash, root_from_proof
+from cts.plan import process_pool
+from cts.source import BundleSource, EvidenceSource, open_evidence
+
+# Signature files and the document each one signs.
+SIGNED_FILES = (("manifest.sig", "manifest.json"), (ROOT_SIG_NAME, ROOT_NAME))
+# DER prefix of an Ed25519 SubjectPublicKeyInfo (RFC 8410); the raw key follows.
+_ED25519_SPKI_PREFIX = bytes.fromhex("302a300506032b6570032100")
+
+
+@dataclass
+class VerificationReport:
+    source: str
+    checked: int = 0
+    bytes_hashed: int = 0
+    seconds: float = 0.0
+    missing: list[str] = field(default_factory=list)
+    mismatched: list[tuple[str, str, str]] = field(default_factory=list)  # (path, expected, actual)
+    errors: list[str] = field(default_factory=list)
+    signatures: list[tuple[str, str]] = field(default_factory=list)  # (signature file, "valid" | "unverified")
+
+    @property
+    def ok(self) -> bool:
+        return not (self.missing or self.mismatched or self.errors)
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_hashed / self.seconds if self.seconds > 0 else 0.0
+
+
+def load_public_key(path: Path) -> bytes:
+    """Raw 32-byte Ed25519 public key from a PEM, raw or base64 key file."""
+    data = Path(path).read_bytes()
+    if b"-----BEGIN" in data:
+        lines = [line for line in data.decode("ascii").splitlines() if line and not line.startswith("-----")]
+        der = base64.b64decode("".join(lines))
+        if not der.startswith(_ED25519_SPKI_PREFIX) or len(der) != len(_ED25519_SPKI_PREFIX) + 32:
+            raise SystemExit(f"Not an Ed25519 public key: {path}")
+        return der[len(_ED25519_SPKI_PREFIX):]
+    if len(data) == 32:
+        return data
+    try:
+        key = base64.b64decode(data.strip(), validate=True)
+    except ValueError:
+        key = b""
+    if len(key) != 32:
+        raise SystemExit(f"Not an Ed25519 public key (PEM, 32 raw bytes or base64): {path}")
+    return key
+
+
+def _verify_signature(source: EvidenceSource, report: VerificationReport, public_key: bytes | None,
+                      sig_name: str, signed_name: str) -> bool:
+    """Check one present signature file; records the outcome and returns False if it failed."""
+    if public_key is None:
+        report.signatures.append((sig_name, "unverified"))
+        return True
+    from nacl.exceptions import BadSignatureError
+    from nacl.signing import VerifyKey
+
+    if not source.exists(signed_name):
+        report.errors.append(f"{sig_name}: {signed_name} not found")
+        return False
+    try:
+        VerifyKey(public_key).verify(source.read_bytes(signed_name), source.read_bytes(sig_name))
+    except BadSignatureError:
+        report.errors.append(f"{sig_name}: signature over {signed_name} does not verify with the public key")
+        return False
+    report.signatures.append((sig_name, "valid"))
+    return True
+
+
+def _verify_signatures(source: EvidenceSource, report: VerificationReport,
+                       public_key: bytes | None, require_signature: bool) -> None:
+    if require_signature and not source.exists("manifest.sig"):
+        report.errors.append("manifest.sig not found")
+    for sig_name, signed_name in SIGNED_FILES:
+        if source.exists(sig_name):
+            _verify_signature(source, report, public_key, sig_name, signed_name)
+
+
+def _expected_digests(source: EvidenceSource, report: VerificationReport) -> dict[str, list[tuple[str, str]]]:
+    """``{path: [(index name, expected sha256), ...]}`` from manifest.json, checksums.json and the descriptor."""
+    expected: dict[str, list[tuple[str, str]]] = {}
+    if not source.exists("manifest.json"):
+        report.errors.append("manifest.json not found")
+    else:
+        for rel, digest in source.read_json("manifest.json").get("hashes", {}).items():
+            expected.setdefault(rel, []).append(("manifest.json", digest))
+    if source.exists("checksums.json"):
+        for entry in source.read_json("checksums.json").get("entries", []):
+            if isinstance(source, BundleSource) and entry["path"] == source.path.name:
+                continue  # a bundle cannot contain its own digest
+            expected.setdefault(entry["path"], []).append(("checksums.json", entry["sha256"]))
+    if source.exists("bundle_descriptor.json"):
+        for entry in source.read_json("bundle_descriptor.json").get("artifact_index", []):
+            if not entry.get("sha256") or not entry.get("path"):
+                continue
+            if isinstance(source, BundleSource) and entry["path"] == source.path.name:
+                continue
+            expected.setdefault(entry["path"], []).append(("bundle_descriptor.json", entry["sha256"]))
+    return expected
+
+
+def verify_source(source: EvidenceSource, public_key: bytes | None = None,
+                  require_signature: bool = False) -> VerificationReport:
+    """Verify every indexed artifact, and the signatures, of an open evidence source."""
+    report = VerificationReport(source=str(source.path))
+    started = time.perf_counter()
+    _verify_signatures(source, report, public_key, require_signature)
+    for rel, recorded in _expected_digests(source, report).items():
+        if not source.exists(rel):
+            report.missing.append(rel)
+            continue
+        try:
+            actual, size = source.hash(rel)
+        except zipfile.BadZipFile as e:  # CRC failure inside a bundle
+            report.errors.append(f"{source.describe(rel)}: {e}")
+            continue
+        report.checked += 1
+        report.bytes_hashed += size
+        for index, digest in recorded:
+            if digest.lower() != actual:
+                report.mismatched.append((f"{rel} ({index})", digest, actual))
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def verify_evidence(path: Path, public_key: bytes | None = None,
+                    require_signature: bool = False) -> VerificationReport:
+    """Verify the run directory or ``bundle.zip`` at ``path``."""
+    with open_evidence(path) as source:
+        return verify_source(source, public_key, require_signature)
+
+
+def _verify_task(path: str, public_key: bytes | None, require_signature: bool) -> VerificationReport:
+    """Worker entry point: verify one evidence set, reporting unreadable ones as errors."""
+    try:
+        return verify_evidence(Path(path), public_key, require_signature)
+    except SystemExit as e:
+        return VerificationReport(source=path, errors=[str(e)])
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+        return VerificationReport(source=path, errors=[f"{type(e).__name__}: {e}"])
+
+
+def verify_many(paths: list[Path], workers: int | None = None, public_key: bytes | None = None,
+                require_signature: bool = False) -> tuple[list[VerificationReport], float]:
+    """Verify each evidence set in ``paths`` on a process pool; returns ``(reports in order, wall seconds)``."""
+    started = time.perf_counter()
+    workers = workers or min(len(paths), multiprocessing.cpu_count()) or 1
+    if workers == 1:
+        reports = [_verify_task(str(p), public_key, require_signature) for p in paths]
+    else:
+        chunksize = max(1, len(paths) // (workers * 8))
+        with process_pool(workers) as pool:
+            reports = list(pool.map(_verify_task, map(str, paths), [public_key] * len(paths),
+                                    [require_signature] * len(paths), chunksize=chunksize))
+    return reports, time.perf_counter() - started
+
+
+def verify_artifacts_in(source: EvidenceSource, rels: list[str], public_key: bytes | None = None,
+                        require_signature: bool = False) -> VerificationReport:
+    """Verify ``rels`` of an open evidence source against its Merkle root.
+
+    With ``public_key`` (or ``require_signature``) the root must carry a valid
+    ``manifest-merkle.sig``; otherwise no proof is checked, since an unsigned
+    root can be rewritten together with the artifact and its proof.
+    """
+    report = VerificationReport(source=str(source.path))
+    started = time.perf_counter()
+    if not source.exists(ROOT_NAME):
+        report.errors.append(f"{ROOT_NAME} not found (run not written with evidence.manifest_mode: merkle)")
+        return report
+    if source.exists(ROOT_SIG_NAME):
+        if not _verify_signature(source, report, public_key, ROOT_SIG_NAME, ROOT_NAME):
+            return report
+    elif public_key is not None or require_signature:
+        report.errors.append(f"{ROOT_SIG_NAME} not found; the Merkle root is not signed")
+        return report
+    root = source.read_json(ROOT_NAME)
+    proofs_name = root.get("proofs", PROOFS_NAME)
+    for rel in rels:
+        if not source.exists(proofs_name):
+            report.errors.append(f"{proofs_name} not found")
+            break
+        with source.open(proofs_name) as f:
+            entry = find_proof(f, rel)
+        if entry is None:
+            report.errors.append(f"{rel}: no inclusion proof in {proofs_name}")
+            continue
+        if not source.exists(rel):
+            report.missing.append(rel)
+            continue
+        actual, size = source.hash(rel)
+        report.checked += 1
+        report.bytes_hashed += size
+        if entry["sha256"].lower() != actual:
+            report.mismatched.append((f"{rel} ({proofs_name})", entry["sha256"], actual))
+        implied = root_from_proof(leaf_hash(rel, actual), entry["index"], root["tree_size"],
+                                  [bytes.fromhex(h) for h in entry["proof"]])
+        if implied is None or implied.hex() != root["root"]:
+            report.mismatched.append((f"{rel} ({ROOT_NAME})", root["root"],
+                                      implied.hex() if implied is not None else "malformed proof"))
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def verify_artifact(path: Path, rels: list[str], public_key: bytes | None = None,
+                    require_signature: bool = False) -> VerificationReport:
+    """Verify single artifacts of the run directory or ``bundle.zip`` at ``path`` by inclusion proof."""
+    with open_evidence(path) as source:
+        return verify_artifacts_in(source, rels, public_key, require_signature)
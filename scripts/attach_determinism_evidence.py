@@ -7,9 +7,15 @@ import argparse
 import hashlib
 import json
 import shutil
-import zipfile
+import sys
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from cts.bundle import COMPRESSION_LEVELS, DEFAULT_COMPRESSION, BundleBuilder
+
 
 def sha256(path: Path) -> str:
     return hashlib.sha256(path.read_bytes()).hexdigest()
@@ -20,6 +26,8 @@ def main() -> int:
     parser.add_argument("--run-dir", required=True, type=Path)
     parser.add_argument("--report", required=True, type=Path)
     parser.add_argument("--policy", required=True, type=Path)
+    parser.add_argument("--bundle-compression", choices=list(COMPRESSION_LEVELS), default=DEFAULT_COMPRESSION,
+                        help="bundle.zip compression policy (match the profile's evidence.bundle_compression)")
     args = parser.parse_args()
 
     run_dir = args.run_dir
@@ -73,10 +81,8 @@ def main() -> int:
     bundle = run_dir / "bundle.zip"
     if bundle.exists():
         bundle.unlink()
-    with zipfile.ZipFile(bundle, "w", compression=zipfile.ZIP_DEFLATED) as archive:
-        for path in sorted(run_dir.rglob("*")):
-            if path.is_file() and path != bundle:
-                archive.write(path, arcname=str(path.relative_to(run_dir)))
+    members = [str(path.relative_to(run_dir)) for path in sorted(run_dir.rglob("*")) if path.is_file() and path != bundle]
+    BundleBuilder(args.bundle_compression).finish(bundle, members, root=run_dir)
 
     bundle_hash = sha256(bundle)
     descriptor = json.loads(descriptor_path.read_text(encoding="utf-8"))
@@ -94,6 +100,8 @@ def main() -> int:
     checksums = json.loads(checksums_path.read_text(encoding="utf-8"))
     entries = {item["path"]: item["sha256"] for item in checksums.get("entries", [])}
     entries["bundle.zip"] = bundle_hash
+    # The descriptor was rewritten above to index the new bundle
+    entries[descriptor_path.name] = sha256(descriptor_path)
     checksums["entries"] = [{"path": p, "sha256": entries[p]} for p in sorted(entries)]
     checksums_path.write_text(json.dumps(checksums, indent=2, sort_keys=True) + "\n", encoding="utf-8")
     print(f"Attached determinism evidence to {run_dir}")
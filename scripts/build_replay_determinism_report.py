@@ -1,5 +1,9 @@
 #!/usr/bin/env python3
-"""Build an auditable determinism report from a source CTS run and its replay."""
+"""Build an auditable determinism report from a source CTS run and its replay.
+
+``--source`` may be the run output directory or its ``bundle.zip``; bundle
+members are read in place without extraction.
+"""
 
 from __future__ import annotations
 
@@ -13,8 +17,9 @@ ROOT = Path(__file__).resolve().parent.parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from jsonschema import validate
 from cts.determinism import classify_differences, diff_documents, semantic_sha256, summarize_differences
+from cts.schemas import shared_registry
+from cts.source import EvidenceSource, open_evidence
 
 
 def load_json(path: Path):
@@ -25,15 +30,15 @@ def sha256_file(path: Path) -> str:
     return hashlib.sha256(path.read_bytes()).hexdigest()
 
 
-def build_case_projection(source_dir: Path, replay_report: dict) -> tuple[dict, dict]:
-    original_verdicts = {item["test_case_id"]: item for item in load_json(source_dir / "verdicts.json")}
+def build_case_projection(source: EvidenceSource, replay_report: dict) -> tuple[dict, dict]:
+    original_verdicts = {item["test_case_id"]: item for item in source.read_json("verdicts.json")}
     replay_verdicts = {item["test_case_id"]: item for item in replay_report.get("verdicts", [])}
 
     original_cases = {}
     replay_cases = {}
-    for case_path in sorted((source_dir / "cases").glob("*.json")):
-        tc_id = case_path.stem
-        case = load_json(case_path)
+    for case_path in source.list("cases", ".json"):
+        tc_id = Path(case_path).stem
+        case = source.read_json(case_path)
         response = case.get("response", {})
         common = {
             "request": {
@@ -45,6 +50,8 @@ def build_case_projection(source_dir: Path, replay_report: dict) -> tuple[dict,
                 "status": response.get("status"),
                 "json": response.get("json"),
                 "text": response.get("text", ""),
+                # Spilled bodies are compared by digest rather than loaded
+                **({"body_sha256": response["body_file"]["sha256"]} if response.get("body_file") else {}),
             },
             "elapsed_ms": case.get("elapsed_ms", 0),
         }
@@ -81,16 +88,17 @@ def semantic_projection(document: dict) -> dict:
 
 def main() -> int:
     parser = argparse.ArgumentParser()
-    parser.add_argument("--source", required=True, type=Path)
+    parser.add_argument("--source", required=True, type=Path, help="Source run directory or its bundle.zip")
     parser.add_argument("--replay-report", required=True, type=Path)
     parser.add_argument("--policy", default=ROOT / "policies/replay-determinism.v1.json", type=Path)
     parser.add_argument("--out", required=True, type=Path)
     args = parser.parse_args()
 
-    source_run = load_json(args.source / "run.json")
     replay_report = load_json(args.replay_report)
     policy = load_json(args.policy)
-    original_cases, replay_cases = build_case_projection(args.source, replay_report)
+    with open_evidence(args.source) as source:
+        source_run = source.read_json("run.json")
+        original_cases, replay_cases = build_case_projection(source, replay_report)
 
     original = {
         "run": {
@@ -123,8 +131,9 @@ def main() -> int:
     classified = classify_differences(diff_documents(original, replay), policy)
     summary = summarize_differences(classified)
     prohibited = summary["prohibited_difference_count"]
-    original_semantic = semantic_projection(original)
-    replay_semantic = semantic_projection(replay)
+    # Streamed hashes: neither projection is serialized in full
+    original_sha256 = semantic_sha256(semantic_projection(original))
+    replay_sha256 = semantic_sha256(semantic_projection(replay))
 
     report = {
         "report_version": "1.0.0",
@@ -135,19 +144,18 @@ def main() -> int:
         },
         "source": {
             "run_id": source_run.get("test_run_id"),
-            "semantic_sha256": semantic_sha256(original_semantic),
+            "semantic_sha256": original_sha256,
         },
         "replay": {
             "run_id": replay_report.get("replay_run_id"),
-            "semantic_sha256": semantic_sha256(replay_semantic),
+            "semantic_sha256": replay_sha256,
         },
         "deterministic": prohibited == 0,
         "summary": summary,
         "differences": classified,
     }
 
-    schema = load_json(ROOT / "schemas/evidence/replay-determinism-report.schema.json")
-    validate(instance=report, schema=schema)
+    shared_registry().validate(report, "schemas/evidence/replay-determinism-report.schema.json")
     args.out.parent.mkdir(parents=True, exist_ok=True)
     args.out.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
     print(f"Determinism {'PASSED' if report['deterministic'] else 'FAILED'}: {summary}")
@@ -10,19 +10,22 @@ Notes:
 
 import argparse
 import json
+import sys
 from pathlib import Path
 
-from jsonschema import validate as js_validate
-
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from cts.schemas import shared_registry
+
 SCHEMAS = ROOT / "schemas" / "dedi"
 
 def load_json(p: Path):
     return json.loads(p.read_text(encoding="utf-8"))
 
 def validate_json(doc, schema_path: Path):
-    schema = load_json(schema_path)
-    js_validate(instance=doc, schema=schema)
+    shared_registry().validate(doc, schema_path)
 
 def main():
     ap = argparse.ArgumentParser()
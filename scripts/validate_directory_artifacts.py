@@ -9,7 +9,7 @@ Why this exists:
 
 This script performs:
 - JSON parse validation
-- JSON Schema validation
+- JSON Schema validation (status feeds are validated incrementally, event by event)
 - Optional consistency checks between entry/status feed
 
 It does NOT perform signature verification. Signature verification is profile-specific and is handled by
@@ -18,19 +18,23 @@ directory operator tooling or assessment procedures.
 
 import argparse
 import json
+import sys
 from pathlib import Path
 
-from jsonschema import validate as js_validate
-
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from cts.feeds import FeedValidator
+from cts.schemas import shared_registry
+
 SCHEMAS = ROOT / "schemas"
 
 def load_json(p: Path):
     return json.loads(p.read_text(encoding="utf-8"))
 
 def validate_json(doc, schema_path: Path):
-    schema = load_json(schema_path)
-    js_validate(instance=doc, schema=schema)
+    shared_registry().validate(doc, schema_path)
 def validate_identity_anchor(entry: dict):
     """Lightweight checks for optional identity anchoring metadata.
 
@@ -67,8 +71,8 @@ def main():
         doc = load_json(Path(args.entry))
         validate_json(doc, SCHEMAS / "authoritative-directory-entry.schema.json")
         print("[OK] entry schema: authoritative-directory-entry")
-    validate_identity_anchor(doc)
-    print("[OK] entry identity_anchor checks")
+        validate_identity_anchor(doc)
+        print("[OK] entry identity_anchor checks")
 
     if args.manifest:
         doc = load_json(Path(args.manifest))
@@ -76,9 +80,15 @@ def main():
         print("[OK] manifest schema: directory-publication-manifest")
 
     if args.status:
-        doc = load_json(Path(args.status))
-        validate_json(doc, SCHEMAS / "directory-status-feed.schema.json")
-        print("[OK] status schema: directory-status-feed")
+        # Status feeds can be very large: validate events one at a time
+        report = FeedValidator.for_kind("directory").validate(Path(args.status))
+        for e in report.errors:
+            where = f"event {e.index}" if e.index is not None else "feed"
+            print(f"[FAIL] status {where} {e.pointer or '/'}: {e.message}")
+        if not report.valid:
+            raise SystemExit(f"Directory status feed invalid: {report.error_count} error(s) in {report.entries} event(s)")
+        print(f"[OK] status schema: directory-status-feed ({report.entries} events, "
+              f"{report.entries_per_second:,.0f} events/s)")
 
     print("Directory artifact validation PASSED.")
     return 0
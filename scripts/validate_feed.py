@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Stream-validate a lifecycle, directory or GRID status feed.
+
+The feed's entries/events array is parsed and validated one element at a time
+(see cts/feeds.py), so memory stays flat regardless of feed size. Errors are
+reported per entry with the entry index and a JSON Pointer; the summary line
+includes throughput in entries/second.
+
+Exit status is 0 for a valid feed and 1 otherwise.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from cts.feeds import DEFAULT_MAX_ERRORS, FEEDS, FeedValidator
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("feed", type=Path, help="Path to the feed JSON file")
+    ap.add_argument("--kind", required=True, choices=sorted(FEEDS), help="Feed type (selects the schema)")
+    ap.add_argument("--max-errors", type=int, default=DEFAULT_MAX_ERRORS,
+                    help=f"Stop recording individual errors after this many (default: {DEFAULT_MAX_ERRORS}); "
+                         "all errors are still counted")
+    ap.add_argument("--json", dest="json_out", type=Path, default=None,
+                    help="Also write the full report (errors, counts, throughput) as JSON")
+    ap.add_argument("--progress", action="store_true", help="Print throughput every 100,000 entries")
+    args = ap.parse_args(argv)
+
+    if not args.feed.is_file():
+        raise SystemExit(f"Feed not found: {args.feed}")
+
+    def progress(report):
+        print(f"... {report.entries} entries, {report.entries_per_second:,.0f} entries/s, "
+              f"{report.bytes_per_second / 1e6:,.1f} MB/s", file=sys.stderr)
+
+    report = FeedValidator.for_kind(args.kind).validate(
+        args.feed, max_errors=args.max_errors, on_progress=progress if args.progress else None)
+
+    for e in report.errors:
+        where = f"entry {e.index}" if e.index is not None else "feed"
+        print(f"[FAIL] {where} {e.pointer or '/'}: {e.message}")
+    if report.error_count > len(report.errors):
+        print(f"... {report.error_count - len(report.errors)} more error(s) not shown")
+    if args.json_out:
+        args.json_out.write_text(json.dumps(report.to_json(), indent=2) + "\n", encoding="utf-8")
+
+    status = "PASSED" if report.valid else "FAILED"
+    print(f"{args.kind} feed validation {status}: {report.entries} entries, {report.invalid_entries} invalid, "
+          f"{report.error_count} error(s); {report.entries_per_second:,.0f} entries/s "
+          f"({report.bytes_per_second / 1e6:,.1f} MB/s over {report.seconds:.2f} s)")
+    return 0 if report.valid else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,11 +1,11 @@
 #!/usr/bin/env python3
 from pathlib import Path
-import json, yaml
-from jsonschema import Draft202012Validator
+import sys, yaml
 root=Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+from cts.schemas import shared_registry
 doc=yaml.safe_load((root/'PROJECT-STATUS.yaml').read_text())
-schema=json.loads((root/'schemas/project-status.schema.json').read_text())
-errors=sorted(Draft202012Validator(schema).iter_errors(doc), key=lambda e:list(e.path))
+errors=sorted(shared_registry().iter_errors(doc, 'schemas/project-status.schema.json'), key=lambda e:list(e.path))
 if errors:
     for e in errors: print(f"PROJECT-STATUS.yaml:{'/'.join(map(str,e.path))}: {e.message}")
     raise SystemExit(1)
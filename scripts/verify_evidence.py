@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Verify the artifact hashes and signatures of CTS evidence directories or bundles.
+
+Every artifact listed in manifest.json, checksums.json and the
+bundle_descriptor.json artifact index is re-hashed and compared with its
+recorded SHA-256. A bundle.zip is verified in place: members are streamed out
+of the archive and hashed without being extracted (see cts/verify.py). With
+--public-key, manifest.sig (and manifest-merkle.sig) must verify as Ed25519
+signatures over the files they sign.
+
+Any number of run directories, bundles, directory trees or glob patterns may
+be given; the evidence sets found are verified in parallel worker processes
+and the summary reports throughput in GB/s and bundles/s.
+
+With --artifact, only the named artifacts are checked, against the Merkle
+root in manifest-merkle.json (runs written with evidence.manifest_mode:
+merkle): each costs one artifact hash plus log2(n) proof hashes. With
+--public-key, manifest-merkle.sig must verify over the root first.
+
+Exit status is 0 when every evidence set verifies and 1 otherwise.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from cts.merkle import ROOT_SIG_NAME
+from cts.source import discover_evidence
+from cts.verify import load_public_key, verify_artifact, verify_many
+
+
+def print_failures(report) -> None:
+    for rel in report.missing:
+        print(f"[FAIL] missing: {rel}")
+    for rel, expected, actual in report.mismatched:
+        print(f"[FAIL] mismatch: {rel}\n       expected {expected}\n       got      {actual}")
+    for error in report.errors:
+        print(f"[FAIL] {error}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("evidence", nargs="+",
+                    help="Run output directories, bundle.zip files, directory trees or glob patterns")
+    ap.add_argument("--artifact", action="append", default=[], metavar="PATH",
+                    help="Verify only this artifact (e.g. cases/TC-AUTHZ-001.json) by its Merkle inclusion proof; "
+                         "repeatable, single evidence set only")
+    ap.add_argument("--public-key", type=Path, default=None,
+                    help="Ed25519 public key (PEM, raw 32 bytes or base64) for manifest.sig and manifest-merkle.sig")
+    ap.add_argument("--require-signature", action="store_true",
+                    help="Fail evidence sets without manifest.sig (with --artifact: without manifest-merkle.sig)")
+    ap.add_argument("--workers", type=int, default=None,
+                    help="Number of parallel worker processes (default: min(evidence sets, CPU count))")
+    ap.add_argument("--json", type=Path, default=None, help="Write per-evidence-set results to this JSON file")
+    args = ap.parse_args(argv)
+
+    public_key = load_public_key(args.public_key) if args.public_key else None
+    if args.artifact:
+        if len(args.evidence) != 1:
+            raise SystemExit("--artifact takes exactly one evidence directory or bundle.zip")
+        report = verify_artifact(Path(args.evidence[0]), args.artifact, public_key, args.require_signature)
+        print_failures(report)
+        status = "PASSED" if report.ok else "FAILED"
+        signed = "signed " if dict(report.signatures).get(ROOT_SIG_NAME) == "valid" else ""
+        print(f"Inclusion proof verification {status}: {report.checked} artifact(s) against "
+              f"the {signed}Merkle root of {report.source}")
+        return 0 if report.ok else 1
+
+    if args.workers is not None and args.workers < 1:
+        raise SystemExit("--workers must be >= 1")
+    paths = discover_evidence(args.evidence)
+    if not paths:
+        raise SystemExit("No run directories (with a cases/ subdirectory) or bundles found under: "
+                         + ", ".join(args.evidence))
+
+    reports, seconds = verify_many(paths, args.workers, public_key, args.require_signature)
+    for report in reports:
+        signatures = ", ".join(f"{name} {state}" for name, state in report.signatures)
+        print(f"[{'OK' if report.ok else 'FAIL'}] {report.source}: {report.checked} artifact(s), "
+              f"{report.bytes_hashed / 1e6:,.1f} MB" + (f"; {signatures}" if signatures else ""))
+        print_failures(report)
+
+    failed = sum(1 for r in reports if not r.ok)
+    total_bytes = sum(r.bytes_hashed for r in reports)
+    per_second = 1 / seconds if seconds > 0 else 0.0
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps({
+            "evidence_sets": len(reports),
+            "failed": failed,
+            "bytes_hashed": total_bytes,
+            "seconds": seconds,
+            "results": [
+                {"source": r.source, "ok": r.ok, "checked": r.checked, "bytes_hashed": r.bytes_hashed,
+                 "seconds": r.seconds, "missing": r.missing,
+                 "mismatched": [{"path": p, "expected": e, "actual": a} for p, e, a in r.mismatched],
+                 "errors": r.errors, "signatures": dict(r.signatures)}
+                for r in reports
+            ],
+        }, indent=2), encoding="utf-8")
+
+    status = "PASSED" if failed == 0 else "FAILED"
+    print(f"Evidence verification {status}: {len(reports) - failed}/{len(reports)} evidence set(s) verified, "
+          f"{total_bytes / 1e9:,.3f} GB in {seconds:.2f} s "
+          f"({total_bytes * per_second / 1e9:,.2f} GB/s, {len(reports) * per_second:,.1f} bundles/s)")
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,66 @@
+"""Offline fixture runs for the suites that need a finished evidence set."""
+
+from __future__ import annotations
+
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from cts import run as cts_run
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PROFILE = ROOT / "profiles/baseline.yaml"
+FIXTURE_SET = ROOT / "fixtures/baseline.fixture-set.json"
+GENERATED_AT = "2026-01-15T00:00:00Z"
+
+
+def temp_dir(test: unittest.TestCase) -> Path:
+    """A temporary directory removed when ``test`` finishes."""
+    tmp = tempfile.TemporaryDirectory()
+    test.addCleanup(tmp.cleanup)
+    return Path(tmp.name)
+
+
+def write_sut(path: Path, base_url: str = "http://127.0.0.1:9", **fields: str) -> Path:
+    """Write a SUT file; the default base_url is never dialled because fixture runs stay offline."""
+    lines = [f"base_url: {base_url}", *(f"{key}: {value}" for key, value in fields.items())]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def write_signing_setup(directory: Path, manifest_mode: str | None = None) -> tuple[Path, Path, bytes]:
+    """The baseline profile with manifest signing on, and a SUT holding a fresh key.
+
+    Returns ``(profile path, SUT path, raw public key)``.
+    """
+    from nacl.encoding import Base64Encoder
+    from nacl.signing import SigningKey
+
+    key = SigningKey.generate()
+    profile = BASELINE_PROFILE.read_text(encoding="utf-8").replace("sign_manifest: false", "sign_manifest: true")
+    if manifest_mode is not None:
+        profile += f"  manifest_mode: {manifest_mode}\n"
+    (directory / "profile.yaml").write_text(profile, encoding="utf-8")
+    sut = write_sut(directory / "sut.yaml", signing_key_b64=key.encode(Base64Encoder).decode())
+    return directory / "profile.yaml", sut, key.verify_key.encode()
+
+
+def fixture_argv(sut: Path, profile: Path = BASELINE_PROFILE, generated_at: str = GENERATED_AT) -> list[str]:
+    """Runner arguments for a fixture-set run without the plan cache (``--out`` not included)."""
+    return ["--profile", str(profile), "--sut", str(sut), "--fixture-set", str(FIXTURE_SET),
+            "--generated-at", generated_at, "--no-plan-cache"]
+
+
+def run_quietly(argv: list[str]):
+    """``cts.run.main(argv)`` with its progress output discarded."""
+    with redirect_stdout(StringIO()):
+        return cts_run.main(argv)
+
+
+def fixture_run(out: Path, sut: Path, *extra: str, profile: Path = BASELINE_PROFILE,
+                generated_at: str = GENERATED_AT) -> Path:
+    """Write a fixture run's evidence set to ``out``; returns ``out``."""
+    run_quietly([*fixture_argv(sut, profile, generated_at), "--out", str(out), *extra])
+    return out
@@ -0,0 +1,124 @@
+import hashlib
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+from cts import bundle as cts_bundle
+from cts.bundle import BUNDLE_MEMBER_DATE_TIME, COMPRESSION_LEVELS, BundleBuilder, bundle_compression
+
+MEMBERS = {
+    "bundle_descriptor.json": b'{"artifacts": {}}\n',
+    "cases/TC-A.json": b'{"id": "TC-A", "status": "PASS"}' * 200,
+    "cases/TC-B.json": bytes(range(256)) * 64,
+    "run.json": b"{}",
+}
+
+
+def _zipfile_bundle(dest: Path) -> None:
+    with zipfile.ZipFile(dest, "w", compression=zipfile.ZIP_DEFLATED) as z:
+        for name, data in MEMBERS.items():
+            info = zipfile.ZipInfo(name, date_time=BUNDLE_MEMBER_DATE_TIME)
+            info.external_attr = 0o644 << 16
+            z.writestr(info, data, compress_type=zipfile.ZIP_DEFLATED)
+
+
+def _build(dest: Path, compression: str = "default", workers: int | None = None) -> tuple[str, int]:
+    builder = BundleBuilder(compression, workers=workers)
+    for name, data in reversed(MEMBERS.items()):  # arrival order must not matter
+        builder.add(name, data)
+    return builder.finish(dest, list(MEMBERS))
+
+
+class BundleBuilderTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+
+    def test_default_policy_matches_zipfile_output(self):
+        _zipfile_bundle(self.tmp / "ref.zip")
+        digest, size = _build(self.tmp / "bundle.zip")
+        ref = (self.tmp / "ref.zip").read_bytes()
+        self.assertEqual((self.tmp / "bundle.zip").read_bytes(), ref)
+        self.assertEqual((digest, size), (hashlib.sha256(ref).hexdigest(), len(ref)))
+
+    def test_every_policy_round_trips_and_is_reproducible(self):
+        for policy in COMPRESSION_LEVELS:
+            with self.subTest(policy=policy):
+                first = _build(self.tmp / f"{policy}-1.zip", policy, workers=1)
+                second = _build(self.tmp / f"{policy}-2.zip", policy, workers=4)
+                self.assertEqual(first, second)
+                with zipfile.ZipFile(self.tmp / f"{policy}-1.zip") as z:
+                    self.assertIsNone(z.testzip())
+                    self.assertEqual(z.namelist(), list(MEMBERS))
+                    for name, data in MEMBERS.items():
+                        self.assertEqual(z.read(name), data)
+                        expected = zipfile.ZIP_STORED if policy == "stored" else zipfile.ZIP_DEFLATED
+                        self.assertEqual(z.getinfo(name).compress_type, expected)
+
+    def test_unadded_members_are_read_from_root(self):
+        for name, data in MEMBERS.items():
+            (self.tmp / name).parent.mkdir(parents=True, exist_ok=True)
+            (self.tmp / name).write_bytes(data)
+        _zipfile_bundle(self.tmp / "ref.zip")
+        BundleBuilder().finish(self.tmp / "bundle.zip", list(MEMBERS), root=self.tmp)
+        self.assertEqual((self.tmp / "bundle.zip").read_bytes(), (self.tmp / "ref.zip").read_bytes())
+
+    def test_members_read_from_root_are_compressed_a_bounded_window_ahead(self):
+        names = [f"cases/TC-{i:03d}.json" for i in range(50)]
+        (self.tmp / "cases").mkdir()
+        for name in names:
+            (self.tmp / name).write_bytes(name.encode() * 100)
+        expected = {name: (self.tmp / name).read_bytes() for name in names}
+        compressed = []
+        real = cts_bundle._compress
+
+        def counting(name, chunks, level):
+            compressed.append(name)
+            return real(name, chunks, level)
+
+        builder = BundleBuilder(workers=2)
+        with mock.patch.object(cts_bundle, "_compress", counting):
+            members = builder._in_order(names, self.tmp)
+            first = next(members)
+            self.assertEqual(first.name, names[0])
+            self.assertLessEqual(len(compressed), 2 * 2 + 1)
+            members.close()
+            builder.close()
+            BundleBuilder(workers=2).finish(self.tmp / "bundle.zip", names, root=self.tmp)
+        with zipfile.ZipFile(self.tmp / "bundle.zip") as z:
+            self.assertEqual(z.namelist(), names)
+            for name, data in expected.items():
+                self.assertEqual(z.read(name), data)
+
+    def test_re_added_member_replaces_and_releases_the_earlier_one(self):
+        compressed = []
+        real = cts_bundle._compress
+
+        def recording(name, chunks, level):
+            compressed.append(real(name, chunks, level))
+            return compressed[-1]
+
+        builder = BundleBuilder(workers=1)
+        with mock.patch.object(cts_bundle, "_compress", recording):
+            builder.add("run.json", b'{"stale": true}')
+            builder._members["run.json"].result()
+            for name, data in MEMBERS.items():
+                builder.add(name, data)
+            builder.finish(self.tmp / "bundle.zip", list(MEMBERS))
+        replaced = compressed[0]
+        self.assertTrue(replaced.data.closed)
+        with zipfile.ZipFile(self.tmp / "bundle.zip") as z:
+            self.assertEqual(z.read("run.json"), MEMBERS["run.json"])
+
+    def test_profile_policy_validation(self):
+        self.assertEqual(bundle_compression({}), "default")
+        self.assertEqual(bundle_compression({"evidence": {"bundle_compression": "fast"}}), "fast")
+        with self.assertRaises(SystemExit):
+            bundle_compression({"evidence": {"bundle_compression": "zstd"}})
+
+
+if __name__ == "__main__":
+    unittest.main()
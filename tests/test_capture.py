@@ -0,0 +1,201 @@
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib.util import find_spec
+from pathlib import Path
+from unittest import mock
+
+from cts.capture import BodyCapture, CapturedResponse, ResponseCapture, inline_limit, load_body_json
+from cts.transport import AsyncHttpTransport, HttpTransport
+
+FEED = json.dumps({"entries": [{"entity_id": f"did:example:{i}", "status": "active"} for i in range(5000)]}).encode()
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(FEED)))
+        self.end_headers()
+        self.wfile.write(FEED)
+
+    def log_message(self, *args):
+        pass
+
+
+class BodyCaptureTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.out = Path(tmp.name)
+        (self.out / "cases").mkdir()
+
+    def test_small_body_stays_in_memory_and_clears_stale_spill(self):
+        capture = ResponseCapture(self.out, limit=16).for_case("TC-A")
+        capture.path.write_bytes(b"stale")
+        capture.write(b'{"ok": true}')
+        capture.finish()
+        self.assertFalse(capture.spilled)
+        self.assertEqual(capture.content(), b'{"ok": true}')
+        self.assertFalse(capture.path.exists())
+
+    def test_large_body_spills_with_streamed_digest(self):
+        capture = ResponseCapture(self.out, limit=1024).for_case("TC-LIFE-001")
+        for i in range(0, len(FEED), 1000):
+            capture.write(FEED[i:i + 1000])
+        capture.finish()
+        self.assertTrue(capture.spilled)
+        self.assertEqual(capture.path.read_bytes(), FEED)
+        self.assertEqual(capture.reference(), {"path": "cases/TC-LIFE-001.body",
+                                               "sha256": hashlib.sha256(FEED).hexdigest(), "size": len(FEED)})
+        self.assertEqual(load_body_json(capture.path, capture.reference()), json.loads(FEED))
+        with self.assertRaises(SystemExit):
+            load_body_json(capture.path, {"sha256": "0" * 64})
+
+    def test_abort_leaves_no_partial_file(self):
+        capture = BodyCapture(self.out / "cases/x.body", "cases/x.body", limit=0)
+        capture.write(b"partial")
+        capture.abort()
+        self.assertEqual(list((self.out / "cases").iterdir()), [])
+
+    def test_inline_limit_validation(self):
+        self.assertEqual(inline_limit({"evidence": {"inline_response_bytes": 0}}), 0)
+        with self.assertRaises(SystemExit):
+            inline_limit({"evidence": {"inline_response_bytes": -1}})
+
+    def test_http_transport_streams_into_capture(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _FeedHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        transport = HttpTransport()
+        self.addCleanup(transport.close)
+
+        resp, info = transport.request(base_url, "GET", "/feed", {}, None,
+                                       capture=ResponseCapture(self.out, limit=1024).for_case("TC-LIFE-001"))
+        self.assertFalse(info["reused"])
+        self.assertGreater(info["timings_ns"]["connect"], 0)
+        self.assertIsInstance(resp, CapturedResponse)
+        self.assertEqual(resp.body_file["sha256"], hashlib.sha256(FEED).hexdigest())
+        self.assertEqual(resp.json(), json.loads(FEED))
+
+        resp, info = transport.request(base_url, "GET", "/feed", {}, None,
+                                       capture=ResponseCapture(self.out, limit=len(FEED)).for_case("TC-SMALL"))
+        self.assertTrue(info["reused"])
+        timings = info["timings_ns"]
+        self.assertEqual(list(timings), ["dns", "connect", "tls", "request_write", "ttfb", "body_download"])
+        self.assertEqual((timings["dns"], timings["connect"], timings["tls"]), (None, 0, None))
+        self.assertTrue(all(timings[phase] > 0 for phase in ("request_write", "ttfb", "body_download")))
+        self.assertEqual(resp.content, FEED)
+        self.assertEqual(resp.json(), json.loads(FEED))
+
+
+class HttpTransportTimingTests(unittest.TestCase):
+    def setUp(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _FeedHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.address = f"127.0.0.1:{server.server_address[1]}"
+        self.transport = HttpTransport()
+        self.addCleanup(self.transport.close)
+
+    def _timed(self, base_url: str) -> tuple[dict, int]:
+        started = time.perf_counter_ns()
+        _, info = self.transport.request(base_url, "GET", "/feed", {}, None)
+        return info, time.perf_counter_ns() - started
+
+    def test_phases_account_for_the_request(self):
+        for reused in (False, True):
+            with self.subTest(reused=reused):
+                info, wall = self._timed(f"http://{self.address}")
+                timings = info["timings_ns"]
+                self.assertEqual(info["reused"], reused)
+                self.assertEqual((timings["dns"], timings["tls"]), (None, None))
+                self.assertEqual(timings["connect"] == 0, reused)
+                measured = [timings[phase] for phase in ("connect", "request_write", "ttfb", "body_download")]
+                self.assertTrue(all(ns >= 0 for ns in measured))
+                self.assertLessEqual(sum(measured), wall)
+        self.assertEqual(self.transport.describe()["stats"]["connections_opened"], 1)
+
+    def test_requests_through_an_http_proxy_are_timed(self):
+        # The stub server answers the proxied absolute-URI request itself
+        with mock.patch.dict(os.environ, {"HTTP_PROXY": f"http://{self.address}", "NO_PROXY": ""}):
+            info, _ = self._timed("http://sut.example")
+        self.assertFalse(info["reused"])
+        self.assertGreater(info["timings_ns"]["connect"], 0)
+        self.assertGreater(info["timings_ns"]["ttfb"], 0)
+        self.assertEqual(self.transport.describe()["stats"]["connections_opened"], 1)
+
+
+@unittest.skipUnless(shutil.which("openssl"), "needs the openssl CLI to make a throwaway certificate")
+class TlsReuseTests(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        tmp = Path(tmp_dir.name)
+        self.cert = tmp / "cert.pem"
+        subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                        "-subj", "/CN=localhost", "-addext", "subjectAltName=DNS:localhost",
+                        "-keyout", str(tmp / "key.pem"), "-out", str(self.cert)], check=True, capture_output=True)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(self.cert, tmp / "key.pem")
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _FeedHandler)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        # A hostname rather than the IP, so the client sends SNI and keys its sessions by it
+        self.base_url = f"https://localhost:{server.server_address[1]}"
+
+    def _two_requests(self, keep_alive: bool) -> tuple[list[dict], dict]:
+        transport = HttpTransport({"keep_alive": keep_alive})
+        self.addCleanup(transport.close)
+        with mock.patch("requests.certs.where", return_value=str(self.cert)):
+            infos = [transport.request(self.base_url, "GET", "/feed", {}, None)[1] for _ in range(2)]
+        return infos, transport.describe()["stats"]
+
+    def test_second_connection_resumes_the_tls_session(self):
+        (first, second), stats = self._two_requests(keep_alive=False)
+        self.assertEqual((first["reused"], first["tls_session_reused"]), (False, False))
+        self.assertEqual((second["reused"], second["tls_session_reused"]), (False, True))
+        self.assertEqual((stats["connections_opened"], stats["tls_sessions_resumed"]), (2, 1))
+
+    def test_pooled_connection_is_reused(self):
+        (first, second), stats = self._two_requests(keep_alive=True)
+        self.assertEqual((first["reused"], first["tls_session_reused"]), (False, False))
+        self.assertTrue(second["reused"])
+        self.assertNotIn("tls_session_reused", second)
+        self.assertEqual((stats["connections_opened"], stats["connections_reused"]), (1, 1))
+
+    @unittest.skipUnless(find_spec("httpx"), "--transport async needs httpx")
+    def test_async_transport_resumes_the_tls_session(self):
+        async def drive():
+            transport = AsyncHttpTransport({"keep_alive": False})
+            try:
+                return [(await transport.request(self.base_url, "GET", "/feed", {}, None))[1]
+                        for _ in range(2)], transport.describe()["stats"]
+            finally:
+                await transport.aclose()
+
+        with mock.patch("requests.certs.where", return_value=str(self.cert)):
+            (first, second), stats = asyncio.run(drive())
+        self.assertEqual((first["reused"], first["tls_session_reused"]), (False, False))
+        self.assertEqual((second["reused"], second["tls_session_reused"]), (False, True))
+        self.assertEqual((stats["connections_opened"], stats["tls_sessions_resumed"]), (2, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import json
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from cts import corpus
+from tests.fixture_runs import ROOT, fixture_run, temp_dir, write_sut
+
+
+class CorpusReplayTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = temp_dir(self)
+        self.archive = self.tmp / "archive"
+        for night, target in (("2026-01-14", "registry-a"), ("2026-01-15", "registry-a"), ("2026-01-15", "registry-b")):
+            sut = write_sut(self.tmp / f"{target}.yaml")
+            fixture_run(self.archive / night / target, sut, "--target-id", target,
+                        generated_at=f"{night}T00:00:00Z")
+
+    def _flip(self, run_dir: Path, index: int) -> str:
+        """Rewrite one archived verdict so that replay disagrees with it."""
+        path = run_dir / "verdicts.json"
+        verdicts = json.loads(path.read_text(encoding="utf-8"))
+        applicable = [v for v in verdicts if v["result"] in ("PASS", "FAIL")]
+        applicable[index]["result"] = "FAIL" if applicable[index]["result"] == "PASS" else "PASS"
+        path.write_text(json.dumps(verdicts), encoding="utf-8")
+        return applicable[index]["test_case_id"]
+
+    def _corpus(self, *runs: str) -> tuple[int, dict]:
+        out = self.tmp / "drift"
+        with redirect_stdout(StringIO()):
+            status = corpus.main([*runs, "--profile", str(ROOT / "profiles/baseline.yaml"), "--out", str(out),
+                                  "--workers", "2", "--generated-at", "2026-02-01T00:00:00Z", "--no-plan-cache"])
+        return status, json.loads((out / "corpus-drift-report.json").read_text(encoding="utf-8"))
+
+    def test_unchanged_archive_has_no_drift(self):
+        status, report = self._corpus(str(self.archive))
+        self.assertEqual(status, 0)
+        self.assertEqual(report["totals"]["replayed"], 3)
+        self.assertEqual(report["totals"]["verdict_flips"], 0)
+        self.assertEqual([r["replay_dir"] for r in report["runs"]],
+                         ["runs/2026-01-14/registry-a", "runs/2026-01-15/registry-a", "runs/2026-01-15/registry-b"])
+        self.assertTrue((self.tmp / "drift/runs/2026-01-15/registry-b/replay-report.json").is_file())
+
+    def test_flips_are_aggregated_per_test_case_and_target(self):
+        flipped = self._flip(self.archive / "2026-01-14/registry-a", 0)
+        self.assertEqual(self._flip(self.archive / "2026-01-15/registry-a", 0), flipped)
+        other = self._flip(self.archive / "2026-01-15/registry-b", 1)
+
+        status, report = self._corpus(str(self.archive / "*" / "registry-*"))
+        self.assertEqual(status, 1)
+        self.assertEqual(report["totals"]["verdict_flips"], 3)
+        self.assertEqual(report["by_test_case"][flipped]["verdict_flips"], 2)
+        self.assertEqual(report["by_test_case"][flipped]["runs"],
+                         ["runs/2026-01-14/registry-a", "runs/2026-01-15/registry-a"])
+        self.assertEqual(report["by_target"]["registry-a"]["test_cases"], {flipped: 2})
+        self.assertEqual(report["by_target"]["registry-b"]["test_cases"], {other: 1})
+
+    def test_missing_runs_are_rejected(self):
+        with self.assertRaises(SystemExit):
+            corpus.main([str(self.tmp / "nowhere"), "--profile", str(ROOT / "profiles/baseline.yaml"),
+                         "--out", str(self.tmp / "drift")])
+
+
+if __name__ == "__main__":
+    unittest.main()
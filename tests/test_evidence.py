@@ -0,0 +1,34 @@
+import hashlib
+import tempfile
+import unittest
+from pathlib import Path
+
+from cts.evidence import CHUNK_SIZE, EvidenceWriter
+
+
+class EvidenceWriterTests(unittest.TestCase):
+    def test_digests_recorded_while_writing(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = EvidenceWriter(Path(tmp))
+            data = b"x" * (CHUNK_SIZE * 2 + 17)
+            digest = writer.write_bytes("cases/big.json", data)
+            self.assertEqual(digest, hashlib.sha256(data).hexdigest())
+            self.assertEqual(writer.size("cases/big.json"), len(data))
+            self.assertEqual((Path(tmp) / "cases/big.json").read_bytes(), data)
+
+    def test_files_follow_rglob_order_and_include_preexisting(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp)
+            (out / "cases-report.json").write_text("{}", encoding="utf-8")
+            writer = EvidenceWriter(out)
+            for rel in ("run.json", "cases/TC-B.json", "cases/TC-A.json", "manifest.sig"):
+                writer.write_text(rel, rel)
+            expected = [str(p.relative_to(out)) for p in sorted(out.rglob("*")) if p.is_file()]
+            self.assertEqual(writer.files(), expected)
+            self.assertNotIn("manifest.sig", writer.files(exclude_names=("manifest.sig",)))
+            self.assertEqual(writer.digest("cases-report.json"), hashlib.sha256(b"{}").hexdigest())
+            self.assertIsNone(writer.digest("missing.json"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import json
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+from cts.feeds import FEEDS, FeedStream, FeedValidator, _compile_check
+from cts.schemas import SchemaRegistry, shared_registry
+
+
+def _entry(rng: random.Random, i: int) -> dict:
+    entry = {"entry_id": f"did:example:{i}-é", "state": rng.choice(["active", "revoked", "unknown"]),
+             "effective_at": "2026-01-15T00:00:00Z"}
+    if rng.random() < 0.1:
+        del entry["effective_at"]
+    if rng.random() < 0.1:
+        entry["evidence_refs"] = ["ref", rng.randint(0, 10 ** 9)]
+    if rng.random() < 0.05:
+        entry["unexpected"] = 1.5e10
+    return entry
+
+
+class FeedValidatorTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+
+    def _write(self, text: str) -> Path:
+        path = self.tmp / "feed.json"
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def test_matches_full_document_validation(self):
+        rng = random.Random(7)
+        validator = FeedValidator.for_kind("lifecycle")
+        schema = FEEDS["lifecycle"][0]
+        for trial in range(60):
+            doc = {"feed_id": "feed-1", "directory_id": "dir-1", "generated_at": "2026-01-15T00:00:00Z",
+                   "entries": [_entry(rng, i) for i in range(rng.randint(0, 30))]}
+            if rng.random() < 0.2:
+                del doc["directory_id"]
+            text = json.dumps(doc, indent=rng.choice([None, 2]), ensure_ascii=rng.random() < 0.5)
+            report = validator.validate(self._write(text), chunk_size=rng.choice([1, 5, 64, 1 << 20]))
+            with self.subTest(trial=trial):
+                self.assertEqual(report.entries, len(doc["entries"]))
+                self.assertEqual(report.valid, not list(shared_registry().iter_errors(doc, schema)))
+                item_schema = shared_registry().schema(schema)["properties"]["entries"]["items"]
+                item_validator = shared_registry().validator(schema).evolve(schema=item_schema)
+                bad = {i for i, e in enumerate(doc["entries"]) if list(item_validator.iter_errors(e))}
+                self.assertEqual({e.index for e in report.errors if e.index is not None}, bad)
+
+    def test_errors_carry_index_and_pointer(self):
+        doc = {"directory_id": "d", "generated_at": "2026-01-15T00:00:00Z",
+               "events": [{"event_id": "1", "type": "issued", "entry_id": "e", "at": "2026-01-15T00:00:00Z"},
+                          {"event_id": "2", "type": "exploded", "entry_id": "e", "at": "2026-01-15T00:00:00Z"}]}
+        report = FeedValidator.for_kind("directory").validate(self._write(json.dumps(doc)))
+        self.assertEqual(report.invalid_entries, 1)
+        self.assertEqual([(e.index, e.pointer) for e in report.errors], [(1, "/events/1/type")])
+        self.assertGreater(report.entries_per_second, 0)
+
+    def test_malformed_json_is_reported(self):
+        validator = FeedValidator.for_kind("grid")
+        for text in ('{"entries": [', '{"entries": [{"registrar_id": "r"} {}]}', '[]', '{"entries": []} trailing'):
+            with self.subTest(text=text):
+                report = validator.validate(self._write(text), chunk_size=3)
+                self.assertFalse(report.valid)
+                self.assertIsNone(report.errors[-1].index)
+
+    def test_stream_keeps_envelope_and_splits_tokens_across_chunks(self):
+        path = self._write('{"n": 12345678, "entries": [1.25e3, true, "é漢", null], "tail": [false]}')
+        with open(path, "rb") as f:
+            stream = FeedStream(f, "entries", chunk_size=1)
+            self.assertEqual(list(stream), [(0, 1250.0), (1, True), (2, "é漢"), (3, None)])
+        self.assertEqual(stream.envelope, {"n": 12345678, "entries": [], "tail": [False]})
+
+    def test_array_count_keywords_are_checked(self):
+        schemas = self.tmp / "schemas"
+        schemas.mkdir()
+        (schemas / "feed.schema.json").write_text(json.dumps({
+            "$schema": "https://json-schema.org/draft/2020-12/schema", "type": "object",
+            "properties": {"items": {"type": "array", "minItems": 2, "items": {"type": "integer"}}},
+        }), encoding="utf-8")
+        validator = FeedValidator(schemas / "feed.schema.json", "items", registry=SchemaRegistry(schemas))
+        report = validator.validate(self._write('{"items": [1]}'))
+        self.assertEqual([e.pointer for e in report.errors], ["/items"])
+
+    def test_fast_path_falls_back_for_unsupported_keywords(self):
+        self.assertIsNotNone(_compile_check({"type": "object", "properties": {"a": {"enum": ["x"]}}}))
+        self.assertIsNone(_compile_check({"type": "object", "properties": {"a": {"$ref": "#/x"}}}))
+        self.assertIsNone(_compile_check({"enum": [1, True]}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from cts import fleet
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class FleetTests(unittest.TestCase):
+    def test_target_dirs_are_unique(self):
+        self.assertEqual(
+            fleet._target_dirs(["a/sut.yaml", "b/sut.yaml", "c/other.yaml"]),
+            ["sut", "sut-2", "other"],
+        )
+        self.assertEqual(fleet._target_dirs(["a/sut.yaml", "b/sut.yaml", "c/sut-2.yaml"]),
+                         ["sut", "sut-2", "sut-2-2"])
+        self.assertEqual(fleet._target_dirs(["c/sut-2.yaml", "a/sut.yaml", "b/sut.yaml"]),
+                         ["sut-2", "sut", "sut-3"])
+
+    def test_managed_flags_are_rejected_in_every_form(self):
+        base = ["--profile", str(ROOT / "profiles/baseline.yaml"), "--sut", "a.yaml", "--out", "fleet", "--"]
+        for passthrough in (["--out", "x"], ["--out=x"], ["--ou=x"], ["--profile=p.yaml"], ["--sut=b.yaml"],
+                            ["--profile-runner"]):
+            with self.assertRaises(SystemExit, msg=passthrough):
+                fleet.main(base + passthrough)
+
+    def test_fixture_fleet_writes_one_directory_per_target(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            suts = []
+            for name in ("registry-a", "registry-b"):
+                p = tmp / f"{name}.yaml"
+                p.write_text(f"base_url: http://127.0.0.1:9\ntarget_id: {name}\n", encoding="utf-8")
+                suts.append(str(p))
+            argv = ["--profile", str(ROOT / "profiles/baseline.yaml"), "--out", str(tmp / "fleet"),
+                    "--workers", "2", "--generated-at", "2026-01-15T00:00:00Z"]
+            for s in suts:
+                argv += ["--sut", s]
+            argv += ["--", "--fixture-set", str(ROOT / "fixtures/baseline.fixture-set.json"), "--run-id", "fleet-test"]
+            with redirect_stdout(StringIO()):
+                self.assertEqual(fleet.main(argv), 0)
+
+            summary = json.loads((tmp / "fleet/fleet-summary.json").read_text(encoding="utf-8"))
+            self.assertEqual(summary["totals"]["completed"], 2)
+            self.assertEqual([t["target_id"] for t in summary["targets"]], ["registry-a", "registry-b"])
+            for t in summary["targets"]:
+                self.assertTrue((tmp / "fleet" / t["out_dir"] / "manifest.json").is_file())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import json
+import shutil
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from cts import history
+from tests.fixture_runs import fixture_run, temp_dir, write_sut
+
+
+class RunHistoryTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = temp_dir(self)
+        first = fixture_run(self.tmp / "archive" / "day1", write_sut(self.tmp / "sut.yaml"), "--run-id", "run-1")
+        # A later run of the same target in which TC-HTTP-001 regressed
+        second = self.tmp / "archive" / "day2"
+        shutil.copytree(first, second)
+        run = json.loads((second / "run.json").read_text(encoding="utf-8"))
+        run.update(test_run_id="run-2", started_at="2026-01-16T00:00:00Z")
+        (second / "run.json").write_text(json.dumps(run), encoding="utf-8")
+        verdicts = json.loads((second / "verdicts.json").read_text(encoding="utf-8"))
+        for verdict in verdicts:
+            verdict["elapsed_ms"] = 7
+            if verdict["test_case_id"] == "TC-HTTP-001":
+                verdict["result"] = "FAIL"
+        (second / "verdicts.json").write_text(json.dumps(verdicts), encoding="utf-8")
+        self.db = self.tmp / "history.sqlite"
+
+    def ingest(self):
+        conn = history.connect(self.db)
+        self.addCleanup(conn.close)
+        return conn, history.ingest(conn, history.discover_evidence([str(self.tmp / "archive")]))
+
+    def test_ingest_is_idempotent_by_run_id(self):
+        conn, stats = self.ingest()
+        self.assertEqual((stats["ingested"], stats["skipped"], stats["errors"]), (2, 0, []))
+        _, stats = self.ingest()
+        self.assertEqual((stats["ingested"], stats["skipped"]), (0, 2))
+
+        # Another copy of an indexed run adds nothing
+        shutil.copytree(self.tmp / "archive" / "day1", self.tmp / "archive" / "copy")
+        _, stats = self.ingest()
+        self.assertEqual((stats["ingested"], stats["skipped"]), (0, 3))
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0], 2)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0], 26)
+        self.assertGreater(conn.execute("SELECT COUNT(*) FROM artifacts").fetchone()[0], 0)
+
+    def test_unreadable_sources_are_reported_and_the_rest_indexed(self):
+        broken = self.tmp / "broken"
+        broken.mkdir()
+        bundle = (self.tmp / "archive" / "day1" / "bundle.zip").read_bytes()
+        (broken / "bundle.zip").write_bytes(bundle.replace(b"PK\x03\x04", b"PX\x03\x04"))  # bad member headers
+        malformed = self.tmp / "malformed"
+        shutil.copytree(self.tmp / "archive" / "day1", malformed)
+        (malformed / "verdicts.json").write_text("7", encoding="utf-8")
+        conn = history.connect(self.db)
+        self.addCleanup(conn.close)
+        paths = [broken / "bundle.zip", malformed, *history.discover_evidence([str(self.tmp / "archive")])]
+        stats = history.ingest(conn, paths)
+        self.assertEqual(stats["ingested"], 2)
+        self.assertEqual([e.split(": ")[1] for e in stats["errors"]], ["BadZipFile", "TypeError"])
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0], 2)
+
+    def test_trend_and_regression_queries(self):
+        conn, _ = self.ingest()
+        self.assertEqual([r["test_run_id"] for r in history.last_pass(conn, "TC-HTTP-001")], ["run-1"])
+        trend = history.latency_trend(conn, "/recognition")
+        self.assertEqual([(r["test_run_id"], r["max_ms"]) for r in trend], [("run-1", 0), ("run-2", 7)])
+        self.assertEqual([(r["test_case_id"], r["previous_run_id"], r["test_run_id"])
+                          for r in history.regressions(conn)], [("TC-HTTP-001", "run-1", "run-2")])
+
+    def test_sql_subcommand_is_read_only(self):
+        self.ingest()
+        with redirect_stdout(StringIO()) as out:
+            history.main(["sql", "SELECT COUNT(*) AS runs FROM runs", "--db", str(self.db), "--json"])
+        self.assertEqual(json.loads(out.getvalue()), [{"runs": 2}])
+        with self.assertRaises(SystemExit):
+            history.main(["sql", "DELETE FROM runs", "--db", str(self.db)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import gc
+import json
+import warnings
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from cts import run as cts_run
+from cts.journal import JOURNAL_NAME, read_journal
+from tests.fixture_runs import ROOT, fixture_argv, run_quietly, temp_dir, write_sut
+
+
+class _Killed(Exception):
+    pass
+
+
+class ResumeTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = temp_dir(self)
+        self.sut = write_sut(self.tmp / "sut.yaml")
+        self.profile = ROOT / "profiles/baseline.yaml"
+
+    def _run(self, *extra: str) -> None:
+        run_quietly([*fixture_argv(self.sut, self.profile), "--run-id", "journal-test", *extra])
+
+    def _interrupted_run(self, out: Path, after: int, resume: bool = False) -> list[str]:
+        """Run (or resume) until ``after`` cases have finished, then die as if killed; returns their ids."""
+        real, calls = cts_run.execute_case, []
+
+        def dying(tc, ctx):
+            if len(calls) == after:
+                raise _Killed()
+            calls.append(tc["id"])
+            return real(tc, ctx)
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", ResourceWarning)
+            with mock.patch.object(cts_run, "execute_case", side_effect=dying):
+                with self.assertRaises(_Killed):
+                    self._run("--resume" if resume else "--out", str(out))
+            gc.collect()
+        # The journal stays on disk for --resume, but its handle is closed
+        self.assertFalse([w for w in caught if issubclass(w.category, ResourceWarning)])
+        return calls
+
+    def test_resume_completes_identical_evidence(self):
+        clean, resumed = self.tmp / "a" / "out", self.tmp / "b" / "out"
+        self._run("--out", str(clean))
+        self.assertFalse((clean / JOURNAL_NAME).exists())
+
+        self._interrupted_run(resumed, after=3)
+        self.assertFalse((resumed / "run.json").exists())
+        header, cases = read_journal(resumed)
+        self.assertEqual(header["run"]["test_run_id"], "journal-test")
+        self.assertEqual(len(cases), 3)
+
+        executed = []
+        real = cts_run.execute_case
+        with mock.patch.object(cts_run, "execute_case", side_effect=lambda tc, ctx: executed.append(tc["id"]) or real(tc, ctx)):
+            self._run("--resume", str(resumed))
+        self.assertFalse(set(cases) & set(executed))
+        self.assertFalse((resumed / JOURNAL_NAME).exists())
+        for name in ("manifest.json", "verdicts.json", "checksums.json", "bundle.zip"):
+            self.assertEqual((resumed / name).read_bytes(), (clean / name).read_bytes(), name)
+
+    def test_tampered_case_is_executed_again(self):
+        out = self.tmp / "out"
+        self._interrupted_run(out, after=2)
+        _, cases = read_journal(out)
+        victim = sorted(cases)[0]
+        (out / cases[victim]["path"]).write_text("{}", encoding="utf-8")
+        # A torn final line (killed mid-append) is ignored
+        with open(out / JOURNAL_NAME, "a", encoding="utf-8") as f:
+            f.write('{"type": "case", "test_ca')
+
+        # Killed again while resuming: the records appended after the torn line stay readable
+        executed = self._interrupted_run(out, after=2, resume=True)
+        _, resumed_cases = read_journal(out)
+        self.assertTrue(set(executed) <= set(resumed_cases))
+
+        real = cts_run.execute_case
+        with mock.patch.object(cts_run, "execute_case", side_effect=lambda tc, ctx: executed.append(tc["id"]) or real(tc, ctx)):
+            self._run("--resume", str(out))
+        self.assertIn(victim, executed)
+        self.assertEqual(len(executed), len(set(executed)))
+        manifest = json.loads((out / "manifest.json").read_text(encoding="utf-8"))
+        self.assertNotEqual(json.loads((out / cases[victim]["path"]).read_text(encoding="utf-8")), {})
+        self.assertNotIn(JOURNAL_NAME, manifest["hashes"])
+
+    def test_resume_rejects_a_different_plan(self):
+        out = self.tmp / "out"
+        self._interrupted_run(out, after=1)
+        self.profile = ROOT / "profiles/smoke.yaml"
+        with self.assertRaises(SystemExit) as ctx:
+            self._run("--resume", str(out))
+        self.assertIn("changed since the interrupted run", str(ctx.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from cts.jsonpath import compile_json_path, json_path_get
+
+DOC = {
+    "a": {"b": {"c": 1}},
+    "key.with.dots": {"a": "dotted"},
+    "items": [{"id": "x", "tags": [1, 2]}, {"id": None}, {"other": True}, "scalar", {"id": "y", "tags": []}],
+    "empty": [],
+}
+
+
+class JsonPathTests(unittest.TestCase):
+    def test_accessors(self):
+        cases = [
+            ("$", DOC),
+            ("$.a.b.c", 1),
+            ("$.a.missing.c", None),
+            ("$.items[0].id", "x"),
+            ("$.items[9].id", None),
+            ("$.items[-1]", None),
+            ('$["key.with.dots"].a', "dotted"),
+            ("$['key.with.dots'].a", "dotted"),
+            ("$.items[*].id", ["x", "y"]),
+            ("$.items[*].tags[*]", [[1, 2], []]),
+            ("$.items[*].tags[*].x", []),
+            ("$.empty[*]", []),
+            ("$.a[*]", None),
+        ]
+        for path, expected in cases:
+            with self.subTest(path=path):
+                self.assertEqual(json_path_get(DOC, path), expected)
+
+    def test_invalid_paths(self):
+        for path in ("a.b", "$[0", "$x", "$[z]"):
+            with self.subTest(path=path), self.assertRaises(ValueError):
+                json_path_get(DOC, path)
+
+    def test_compiled_once(self):
+        self.assertIs(compile_json_path("$.items[*].id"), compile_json_path("$.items[*].id"))
+
+
+if __name__ == "__main__":
+    unittest.main()
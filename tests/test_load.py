@@ -0,0 +1,103 @@
+import asyncio
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cts.load import LatencyHistogram, run_load, run_load_async, select_load_tests
+from cts.transport import AsyncHttpTransport, HttpTransport
+
+TESTS = [
+    {"id": "TC-OK", "method": "GET", "path": "/ok", "expect": {"status": 200}},
+    {"id": "TC-MISSING", "method": "GET", "path": "/missing", "expect": {"status": 200}},
+]
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200 if self.path == "/ok" else 404)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _prepare(tc, ctx):
+    return {}, None
+
+
+class LatencyHistogramTests(unittest.TestCase):
+    def test_percentiles_within_bucket_precision(self):
+        hist = LatencyHistogram()
+        for ms in range(1, 1001):
+            hist.record(ms / 1000.0)
+        summary = hist.summary()
+        self.assertEqual(summary["count"], 1000)
+        self.assertAlmostEqual(summary["p50"], 500.0, delta=5.0)
+        self.assertAlmostEqual(summary["p99"], 990.0, delta=10.0)
+        self.assertEqual(summary["max"], 1000.0)
+        self.assertLessEqual(summary["p99.9"], summary["max"])
+
+    def test_serial_cases_are_excluded_by_default(self):
+        tests = [{"id": "A"}, {"id": "B", "serial": True}, {"id": "C", "profiles": ["enterprise"]}]
+        selected = select_load_tests(tests, {"id": "baseline"}, None)
+        self.assertEqual([tc["id"] for tc in selected], ["A"])
+        with self.assertRaises(SystemExit):
+            select_load_tests(tests, {"id": "baseline"}, ["B"])
+
+
+class RunLoadTests(unittest.TestCase):
+    def setUp(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def assertReport(self, report, mode, rps):
+        self.assertEqual(report["mode"], mode)
+        self.assertEqual(report["target_rps"], rps)
+        self.assertEqual(report["coordinated_omission_corrected"], bool(rps))
+        self.assertEqual(report["test_case_ids"], ["TC-OK", "TC-MISSING"])
+        summary = report["summary"]
+        self.assertGreaterEqual(summary["requests"], 2)
+        self.assertEqual(report["latency_ms"]["count"], summary["requests"])
+        self.assertEqual(sum(b["count"] for b in report["histogram_ms"]), summary["requests"])
+        self.assertEqual(sum(t["completed"] for t in report["throughput_timeline"]), summary["requests"])
+        self.assertEqual(sum(report["status_counts"].values()), summary["requests"])
+        self.assertEqual(report["status_counts"]["404"], summary["errors"])
+        self.assertEqual(report["error_breakdown"], {"unexpected_status:404": summary["errors"]})
+        self.assertEqual(sorted(report["per_test"]), ["TC-MISSING", "TC-OK"])
+        self.assertLessEqual(report["latency_ms"]["p50"], report["latency_ms"]["max"])
+
+    def test_open_and_closed_loop_reports(self):
+        transport = HttpTransport()
+        self.addCleanup(transport.close)
+        ctx = {"transport": transport, "base_url": self.base_url}
+        report = run_load(TESTS, ctx, _prepare, duration=0.3, rps=40, concurrency=2)
+        self.assertReport(report, "open_loop", 40)
+        self.assertEqual(report["summary"]["requests"], 12)
+        self.assertEqual(report["summary"]["errors"], 6)
+        self.assertReport(run_load(TESTS, ctx, _prepare, duration=0.2, concurrency=2), "closed_loop", None)
+
+    def test_async_open_loop_report(self):
+        async def drive():
+            transport = AsyncHttpTransport()
+            try:
+                return await run_load_async(TESTS, {"transport": transport, "base_url": self.base_url}, _prepare,
+                                            duration=0.3, rps=40, concurrency=2)
+            finally:
+                await transport.aclose()
+
+        report = asyncio.run(drive())
+        self.assertReport(report, "open_loop", 40)
+        self.assertEqual(report["summary"]["requests"], 12)
+
+
+if __name__ == "__main__":
+    unittest.main()
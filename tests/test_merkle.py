@@ -0,0 +1,93 @@
+import hashlib
+import json
+import unittest
+
+from cts.merkle import MerkleTree, build_merkle_manifest, node_hash, root_from_proof
+from cts.verify import verify_artifact, verify_evidence
+from tests.fixture_runs import fixture_run, temp_dir, write_signing_setup
+
+
+def rfc9162_root(leaves):
+    """MTH(D[n]) exactly as written in RFC 9162 section 2.1.1."""
+    if not leaves:
+        return hashlib.sha256(b"").digest()
+    if len(leaves) == 1:
+        return leaves[0]
+    k = 1
+    while k * 2 < len(leaves):
+        k *= 2
+    return node_hash(rfc9162_root(leaves[:k]), rfc9162_root(leaves[k:]))
+
+
+class MerkleTreeTests(unittest.TestCase):
+    def test_roots_and_proofs_match_the_rfc_definition(self):
+        for size in range(0, 40):
+            leaves = [hashlib.sha256(str(i).encode()).digest() for i in range(size)]
+            tree = MerkleTree(leaves)
+            self.assertEqual(tree.root, rfc9162_root(leaves), size)
+            for index in range(size):
+                proof = tree.proof(index)
+                self.assertLessEqual(len(proof), max(size - 1, 0).bit_length())
+                self.assertEqual(root_from_proof(leaves[index], index, size, proof), tree.root)
+                if size > 1:
+                    self.assertNotEqual(root_from_proof(leaves[index], (index + 1) % size, size, proof), tree.root)
+                self.assertIsNone(root_from_proof(leaves[index], index, size, proof + [b"\0" * 32]))
+
+
+class MerkleManifestRunTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = temp_dir(self)
+        profile, sut, self.public_key = write_signing_setup(self.tmp, manifest_mode="merkle")
+        self.run_dir = fixture_run(self.tmp / "run", sut, profile=profile)
+
+    def test_root_covers_every_manifest_artifact(self):
+        root = json.loads((self.run_dir / "manifest-merkle.json").read_text(encoding="utf-8"))
+        manifest = json.loads((self.run_dir / "manifest.json").read_text(encoding="utf-8"))
+        proofs = [json.loads(line) for line in (self.run_dir / "manifest-proofs.jsonl").read_text().splitlines()]
+        self.assertEqual([p["path"] for p in proofs],
+                         [rel for rel in manifest["hashes"] if not rel.startswith("manifest-")])
+        self.assertEqual(root["tree_size"], len(proofs))
+        self.assertTrue(verify_evidence(self.run_dir).ok)
+
+    def test_single_case_is_verified_from_the_bundle_by_proof(self):
+        rel = "cases/TC-AUTHZ-001.json"
+        report = verify_artifact(self.run_dir / "bundle.zip", [rel])
+        self.assertTrue(report.ok, report)
+        self.assertEqual(report.checked, 1)
+
+        case = self.run_dir / rel
+        case.write_bytes(case.read_bytes() + b"\n")
+        report = verify_artifact(self.run_dir, [rel])
+        self.assertEqual([m[0] for m in report.mismatched],
+                         [f"{rel} (manifest-proofs.jsonl)", f"{rel} (manifest-merkle.json)"])
+
+    def test_rewritten_root_fails_the_signature_check(self):
+        rel = "cases/TC-AUTHZ-001.json"
+        report = verify_artifact(self.run_dir, [rel], self.public_key)
+        self.assertTrue(report.ok, report)
+        self.assertEqual(report.signatures, [("manifest-merkle.sig", "valid")])
+
+        # Tamper with the artifact, then rebuild its proof and the root to match
+        case = self.run_dir / rel
+        case.write_bytes(case.read_bytes() + b"\n")
+        root = json.loads((self.run_dir / "manifest-merkle.json").read_text(encoding="utf-8"))
+        proofs = [json.loads(line) for line in (self.run_dir / "manifest-proofs.jsonl").read_text().splitlines()]
+        hashes = {p["path"]: p["sha256"] for p in proofs}
+        hashes[rel] = hashlib.sha256(case.read_bytes()).hexdigest()
+        root_bytes, proofs_bytes = build_merkle_manifest(root["generated_at"], hashes)
+        (self.run_dir / "manifest-merkle.json").write_bytes(root_bytes)
+        (self.run_dir / "manifest-proofs.jsonl").write_bytes(proofs_bytes)
+
+        self.assertTrue(verify_artifact(self.run_dir, [rel]).ok)
+        report = verify_artifact(self.run_dir, [rel], self.public_key)
+        self.assertFalse(report.ok)
+        self.assertEqual(report.checked, 0)
+        self.assertIn("manifest-merkle.sig", report.errors[0])
+
+        (self.run_dir / "manifest-merkle.sig").unlink()
+        self.assertFalse(verify_artifact(self.run_dir, [rel], self.public_key).ok)
+        self.assertFalse(verify_artifact(self.run_dir, [rel], require_signature=True).ok)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from cts.plan import CACHE_DIR_ENV, load_plan
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class PlanCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = mock.patch.dict(os.environ, {CACHE_DIR_ENV: self.tmp.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_cached_plan_matches_compiled_plan(self):
+        profile = ROOT / "profiles/high_assurance.yaml"
+        compiled = load_plan(profile)
+        self.assertEqual(len(list(Path(self.tmp.name).glob("plan-*.json"))), 1)
+        with mock.patch("yaml.safe_load", side_effect=AssertionError("cache miss")):
+            cached = load_plan(profile)
+        self.assertEqual(cached.sha256, compiled.sha256)
+        self.assertEqual(dict(cached.profile), dict(compiled.profile))
+        self.assertEqual([json.dumps(dict(c)) for c in cached.cases], [json.dumps(dict(c)) for c in compiled.cases])
+        self.assertEqual([c.expectations for c in cached.cases], [c.expectations for c in compiled.cases])
+        self.assertEqual([c.applicable for c in cached.cases], [c.applicable for c in compiled.cases])
+
+    def test_key_follows_inputs(self):
+        profile = Path(self.tmp.name) / "profile.yaml"
+        profile.write_text("id: baseline\n", encoding="utf-8")
+        first = load_plan(profile)
+        profile.write_text("id: enterprise\n", encoding="utf-8")
+        second = load_plan(profile)
+        self.assertNotEqual(first.sha256, second.sha256)
+        self.assertEqual(second.profile["id"], "enterprise")
+
+    def test_plans_json_cannot_reproduce_are_not_cached(self):
+        profile = Path(self.tmp.name) / "profile.yaml"
+        for text in ("id: baseline\nreviewed: 2026-01-15\n", "id: baseline\nlimits: {1: 2}\n"):
+            with self.subTest(profile=text):
+                profile.write_text(text, encoding="utf-8")
+                first = load_plan(profile)
+                self.assertEqual(list(Path(self.tmp.name).glob("plan-*.json")), [])
+                self.assertEqual(dict(load_plan(profile).profile), dict(first.profile))
+
+    def test_identifier_binding_leaves_plan_untouched(self):
+        plan = load_plan(ROOT / "profiles/baseline.yaml", use_cache=False)
+        ids = {"authority_id": "did:example:a", "entity_id": "did:example:e",
+               "subject_authority_id": "did:example:s", "action": "act"}
+        bound = plan.with_identifiers(ids)
+        case = next(c for c in bound.cases if c.body and "authority_id" in c.body)
+        self.assertEqual(case.body["authority_id"], "did:example:a")
+        self.assertNotEqual(plan.by_id[case.id].body["authority_id"], "did:example:a")
+        self.assertEqual(list(Path(self.tmp.name).iterdir()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
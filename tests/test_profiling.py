@@ -0,0 +1,46 @@
+import json
+import unittest
+
+from cts import run as cts_run
+from cts.profiling import phase
+from tests.fixture_runs import fixture_argv, fixture_run, temp_dir, write_sut
+
+
+class RunnerProfileTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = temp_dir(self)
+        self.sut = write_sut(self.tmp / "sut.yaml")
+
+    def test_profile_is_written_beside_the_evidence(self):
+        fixture_run(self.tmp / "run", self.sut, "--run-id", "run-1", "--profile-runner")
+        profile_dir = self.tmp / "run.runner-profile"
+        self.assertEqual(sorted(p.name for p in profile_dir.iterdir()),
+                         ["runner-resources.json", "runner-trace.json", "runner.pstats"])
+
+        resources = json.loads((profile_dir / "runner-resources.json").read_text(encoding="utf-8"))
+        names = [p["name"] for p in resources["phases"]]
+        for name in ("load_plan", "cases", "reports", "manifest", "bundle"):
+            self.assertIn(name, names)
+        self.assertGreater(resources["total"]["cpu_ns"], 0)
+        trace = json.loads((profile_dir / "runner-trace.json").read_text(encoding="utf-8"))
+        self.assertEqual(sorted(e["name"] for e in trace["traceEvents"] if e["ph"] == "X"), sorted(names))
+
+        manifest = json.loads((self.tmp / "run" / "manifest.json").read_text(encoding="utf-8"))
+        self.assertFalse([rel for rel in manifest["hashes"] if "runner" in rel])
+        # Profiling leaves the evidence itself untouched
+        fixture_run(self.tmp / "plain" / "run", self.sut, "--run-id", "run-1")
+        self.assertEqual((self.tmp / "plain" / "run" / "bundle.zip").read_bytes(),
+                         (self.tmp / "run" / "bundle.zip").read_bytes())
+
+    def test_profile_directory_inside_out_is_refused(self):
+        with self.assertRaises(SystemExit):
+            cts_run.main([*fixture_argv(self.sut), "--out", str(self.tmp / "run"),
+                          "--profile-runner", str(self.tmp / "run" / "profile")])
+
+    def test_phase_is_a_no_op_without_a_profiler(self):
+        with phase("cases"):
+            pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,12 @@
+import fnmatch
+import hashlib
 import json
 import unittest
 from pathlib import Path
 
 from cts.determinism import classify_differences, diff_documents, semantic_sha256, summarize_differences
+from cts.canonical import canonical_sha256, iter_canonical_json
+from cts.determinism import PointerMatcher
 
 ROOT = Path(__file__).resolve().parent.parent
 POLICY = json.loads((ROOT / "policies/replay-determinism.v1.json").read_text(encoding="utf-8"))
@@ -37,5 +41,79 @@ class ReplayDeterminismTests(unittest.TestCase):
         self.assertTrue(all(not d["permitted"] for d in classified))
 
 
+class CanonicalHashTests(unittest.TestCase):
+    def test_streamed_digest_matches_one_shot_encoding(self):
+        doc = {
+            "run": {"tool": {"name": "trqp-cts"}, "é": "𝄞", "n": [1, 1.5, -0.0, 2 ** 70, True, None, float("nan")]},
+            "cases": {f"TC-{i:04d}": {"result": "PASS", "z": [i, {"b": 1, "a": [[]]}], "a": {}} for i in range(300)},
+        }
+        expected = json.dumps(doc, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        for budget in (0, 1, 16, 100_000):
+            with self.subTest(node_budget=budget):
+                self.assertEqual("".join(iter_canonical_json(doc, budget)), expected)
+                self.assertEqual(canonical_sha256(doc, budget), hashlib.sha256(expected.encode("utf-8")).hexdigest())
+
+    def test_circular_documents_are_rejected(self):
+        doc = {"cases": [1, 2]}
+        doc["cases"].append(doc)
+        with self.assertRaises(ValueError):
+            canonical_sha256(doc, node_budget=1)
+
+
+class PointerMatcherTests(unittest.TestCase):
+    def test_classification_records_the_matching_rule(self):
+        original = {"run": {"test_run_id": "run-a"}, "cases": {"TC-1": {"elapsed_ms": 14, "result": "PASS"}}}
+        replay = {"run": {"test_run_id": "run-b"}, "cases": {"TC-1": {"elapsed_ms": 0, "result": "FAIL"}}}
+        classified = classify_differences(diff_documents(original, replay), POLICY)
+        self.assertEqual(
+            [(d["pointer"], d["matched_rule"]) for d in classified],
+            [("/cases/TC-1/elapsed_ms", "/cases/*/elapsed_ms"), ("/cases/TC-1/result", None),
+             ("/run/test_run_id", "/run/test_run_id")],
+        )
+
+    def test_first_matching_pattern_in_policy_order_wins(self):
+        patterns = ["/a/*/c", "*/c", "/a/b/c", "/a/b*", "/q/[xy]?", "/a/b/*"]
+        matcher = PointerMatcher(patterns)
+        for pointer in ["/a/b/c", "/a/x/y/c", "/c", "/a/b", "/a/bb/d", "/a/b/d", "/q/xz", "/q/zz", "/", "", "/a~1b/c"]:
+            with self.subTest(pointer=pointer):
+                expected = next((p for p in patterns if fnmatch.fnmatchcase(pointer, p)), None)
+                self.assertEqual(matcher.match(pointer), expected)
+
+
+class DiffEngineTests(unittest.TestCase):
+    def test_differences_are_reported_in_document_order(self):
+        body = {"entries": [{"id": i, "tags": ["a", "b"]} for i in range(50)]}
+        original = {"cases": {"TC-1": {"response": body, "elapsed_ms": 3}, "TC-2": {"result": "PASS", "x": [1, 2]}},
+                    "run": {"id": "a"}}
+        replay = json.loads(json.dumps(original))
+        replay["cases"]["TC-1"]["elapsed_ms"] = 0
+        replay["cases"]["TC-1"]["response"]["entries"][7]["tags"].append("c")
+        replay["cases"]["TC-2"]["x"] = [1]
+        replay["cases"]["TC-2"]["added"] = True
+        replay["run"]["id/~"] = "b"
+        self.assertEqual([d["pointer"] for d in diff_documents(original, replay)], [
+            "/cases/TC-1/elapsed_ms",
+            "/cases/TC-1/response/entries/7/tags/2",
+            "/cases/TC-2/added",
+            "/cases/TC-2/x/1",
+            "/run/id~1~0",
+        ])
+
+    def test_equal_but_differently_typed_values_still_differ(self):
+        original = {"a": [1, {"b": 1.0}], "c": True}
+        replay = {"a": [1, {"b": 1}], "c": 1}
+        self.assertEqual([d["pointer"] for d in diff_documents(original, replay)], ["/a/1/b", "/c"])
+
+    def test_nan_is_reported_even_in_shared_subtrees(self):
+        shared = {"value": float("nan")}
+        self.assertEqual([d["pointer"] for d in diff_documents({"x": shared}, {"x": shared})], ["/x/value"])
+
+    def test_deep_documents_do_not_hit_the_recursion_limit(self):
+        original, replay = 1, 2
+        for _ in range(5000):
+            original, replay = {"a": original}, {"a": replay}
+        self.assertEqual(len(diff_documents(original, replay)), 1)
+
+
 if __name__ == "__main__":
     unittest.main()
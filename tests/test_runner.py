@@ -0,0 +1,235 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+from importlib.util import find_spec
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from cts import run as cts_run
+from cts.plan import compile_plan, load_plan
+from cts.transport import _BufferedResponse
+from tests.fixture_runs import BASELINE_PROFILE, GENERATED_AT, fixture_run, run_quietly, temp_dir, write_sut
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _suite(profile_id: str = "baseline"):
+    tests = cts_run.load_yaml(ROOT / "tests/core_tests.yaml")["tests"]
+    return compile_plan(tests, {"id": profile_id}).with_identifiers(cts_run.resolve_identifiers({})).cases
+
+
+def _fixture_ctx(profile_id: str = "baseline") -> dict:
+    return {
+        "profile": {"id": profile_id},
+        "sut": {"base_url": "http://127.0.0.1:9", "default_headers": {"Accept": "application/json"}},
+        "base_url": "http://127.0.0.1:9",
+        "fixture_set": cts_run.load_fixture_set(ROOT / "fixtures/baseline.fixture-set.json"),
+        "generated_at": "2026-01-15T00:00:00Z",
+    }
+
+
+def _without_timing(results):
+    return [({k: v for k, v in case.items() if k not in ("elapsed_ms", "timings_ns")},
+             {k: v for k, v in verdict.items() if k != "elapsed_ms"}) for case, verdict in results]
+
+
+class ConcurrentExecutionTests(unittest.TestCase):
+    def test_concurrent_results_match_serial(self):
+        tests = _suite()
+        ctx = _fixture_ctx()
+        serial = cts_run.run_cases(tests, ctx, concurrency=1)
+        parallel = cts_run.run_cases(tests, ctx, concurrency=8)
+        self.assertEqual(_without_timing(serial), _without_timing(parallel))
+
+    def test_serial_case_runs_alone(self):
+        tests = [{"id": "A"}, {"id": "B"}, {"id": "SER", "serial": True}, {"id": "C"}]
+        lock = threading.Lock()
+        in_flight = []
+        seen = {}
+
+        def fake_execute(tc, ctx):
+            with lock:
+                in_flight.append(tc["id"])
+                seen[tc["id"]] = list(in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight.remove(tc["id"])
+            return {"id": tc["id"]}, {"test_case_id": tc["id"], "result": "PASS"}
+
+        with mock.patch.object(cts_run, "execute_case", side_effect=fake_execute):
+            results = cts_run.run_cases(tests, {}, concurrency=4)
+
+        self.assertEqual([v["test_case_id"] for _, v in results], ["A", "B", "SER", "C"])
+        self.assertEqual(seen["SER"], ["SER"])
+
+
+class _FixtureBackedTransport:
+    """Serves fixture bodies by path so live-mode code paths run without a SUT."""
+
+    def __init__(self):
+        fixtures = cts_run.load_fixture_set(ROOT / "fixtures/baseline.fixture-set.json")["fixtures"]
+        self.by_path = {}
+        for tc in cts_run.load_yaml(ROOT / "tests/core_tests.yaml")["tests"]:
+            entry = fixtures.get(tc["id"], {"status": 404, "body": {"error": "not_found"}})
+            self.by_path.setdefault(tc["path"], entry)
+
+    def _respond(self, path):
+        entry = self.by_path[path]
+        return _BufferedResponse(entry.get("status", 200), dict(entry.get("headers") or {}),
+                                 json.dumps(entry.get("body")).encode("utf-8"), None), {"reused": True}
+
+    def request(self, base_url, method, path, headers, body):
+        return self._respond(path)
+
+    async def arequest(self, base_url, method, path, headers, body):
+        await asyncio.sleep(0)
+        return self._respond(path)
+
+    async def aclose(self):
+        pass
+
+
+class AsyncTransportTests(unittest.TestCase):
+    def test_async_pipeline_matches_threaded(self):
+        tests = _suite()
+        transport = _FixtureBackedTransport()
+        ctx = {**_fixture_ctx(), "fixture_set": None, "transport": transport}
+        threaded = cts_run.run_cases(tests, ctx, concurrency=4)
+
+        async_transport = _FixtureBackedTransport()
+        async_transport.request = async_transport.arequest
+        async_ctx = {**ctx, "transport": async_transport}
+        via_async = asyncio.run(cts_run.run_cases_async(tests, async_ctx))
+        self.assertEqual(_without_timing(threaded), _without_timing(via_async))
+
+    def test_live_cases_record_phase_timings(self):
+        tests = _suite()
+        live = cts_run.run_cases(tests, {**_fixture_ctx(), "fixture_set": None, "transport": _FixtureBackedTransport()})
+        timed = [case["timings_ns"] for case, verdict in live if verdict["result"] != "NOT_APPLICABLE"]
+        self.assertTrue(timed)
+        for timings in timed:
+            self.assertEqual(list(timings), ["json_parse", "assertions", "round_trip"])
+            self.assertGreaterEqual(timings["round_trip"], 0)
+        fixture = cts_run.run_cases(tests, _fixture_ctx())
+        self.assertFalse(any("timings_ns" in case for case, _ in fixture))
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    """Answers every path with the fixture the suite's case for it expects."""
+
+    protocol_version = "HTTP/1.1"
+    by_path: dict = {}
+
+    def _answer(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        entry = self.by_path.get(self.path.split("?")[0], {"status": 404, "body": {"error": "not_found"}})
+        body = json.dumps(entry.get("body")).encode("utf-8")
+        self.send_response(entry.get("status", 200))
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = _answer
+
+    def log_message(self, *args):
+        pass
+
+
+def _live_run(test: unittest.TestCase, *extra: str) -> Path:
+    """A live Baseline run against a loopback server answering with the fixture set; returns its output."""
+    _FixtureHandler.by_path = _FixtureBackedTransport().by_path
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    test.addCleanup(server.server_close)
+    test.addCleanup(server.shutdown)
+    tmp = temp_dir(test)
+    sut = write_sut(tmp / "sut.yaml", base_url=f"http://127.0.0.1:{server.server_address[1]}")
+    out = tmp / "run"
+    run_quietly(["--profile", str(BASELINE_PROFILE), "--sut", str(sut), "--generated-at", GENERATED_AT,
+                 "--no-plan-cache", "--out", str(out), *extra])
+    return out
+
+
+def _transport(out: Path) -> dict:
+    return json.loads((out / "run.json").read_text(encoding="utf-8"))["transport"]
+
+
+def _verdicts(out: Path) -> list[dict]:
+    verdicts = json.loads((out / "verdicts.json").read_text(encoding="utf-8"))
+    return [{k: v for k, v in verdict.items() if k != "elapsed_ms"} for verdict in verdicts]
+
+
+class LiveRunEvidenceTests(unittest.TestCase):
+    def test_case_write_time_is_indexed_not_reported(self):
+        out = _live_run(self)
+
+        for name in ("verdicts.json", "cts-report.json"):
+            self.assertNotIn("evidence_write_ns", (out / name).read_text(encoding="utf-8"), name)
+        descriptor = json.loads((out / "bundle_descriptor.json").read_text(encoding="utf-8"))
+        case_entries = [e for e in descriptor["artifact_index"] if e["kind"] == "cts_case_file"]
+        timed = [e for e in case_entries
+                 if "timings_ns" in json.loads((out / e["path"]).read_text(encoding="utf-8"))]
+        self.assertTrue(timed)
+        self.assertTrue(all(e["evidence_write_ns"] > 0 for e in timed))
+
+
+@unittest.skipUnless(find_spec("httpx"), "--transport async needs httpx")
+class AsyncTransportLiveTests(unittest.TestCase):
+    def test_async_runs_match_the_blocking_transport(self):
+        blocking = _live_run(self)
+        expected, requests_sent = _verdicts(blocking), _transport(blocking)["stats"]["requests"]
+        for extra in (("--transport", "async"), ("--transport", "async", "--http2")):
+            with self.subTest(extra=extra):
+                if "--http2" in extra and not find_spec("h2"):
+                    self.skipTest("--http2 needs h2")
+                out = _live_run(self, *extra)
+                self.assertEqual(_verdicts(out), expected)
+                transport = _transport(out)
+                self.assertEqual((transport["kind"], transport["http2"]), ("httpx-async", "--http2" in extra))
+                self.assertEqual(transport["stats"]["requests"], requests_sent)
+                self.assertGreaterEqual(transport["stats"]["connections_opened"], 1)
+                case = json.loads((out / "cases" / f"{expected[0]['test_case_id']}.json").read_text(encoding="utf-8"))
+                self.assertGreater(case["timings_ns"]["ttfb"], 0)
+
+
+class ParallelReplayTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = temp_dir(self)
+        self.source = fixture_run(self.tmp / "run", write_sut(self.tmp / "sut.yaml"))
+        # A case the current suite no longer has, and an original verdict that will differ
+        (self.source / "cases/TC-GONE-001.json").write_text('{"response": {"status": 200}}', encoding="utf-8")
+        verdicts = json.loads((self.source / "verdicts.json").read_text(encoding="utf-8"))
+        verdicts[0]["result"] = "FAIL" if verdicts[0]["result"] == "PASS" else "PASS"
+        (self.source / "verdicts.json").write_text(json.dumps(verdicts), encoding="utf-8")
+        self.plan = load_plan(ROOT / "profiles/baseline.yaml", use_cache=False)
+
+    def _replay(self, name: str, workers: int) -> dict:
+        out = self.tmp / name
+        with redirect_stdout(StringIO()):
+            try:
+                cts_run.run_replay(self.source, out, self.plan, "2026-01-15T00:00:00Z", workers=workers)
+            except SystemExit:
+                pass  # failing verdicts exit 1 after the report is written
+        report = json.loads((out / "replay-report.json").read_text(encoding="utf-8"))
+        del report["replay_run_id"]
+        return report
+
+    def test_parallel_report_matches_serial(self):
+        serial = self._replay("serial", workers=1)
+        self.assertEqual(serial["summary"]["STALE"], 1)
+        self.assertEqual(serial["summary"]["verdict_diffs"], 1)
+        self.assertEqual(self._replay("parallel", workers=3), serial)
+
+        timings = json.loads((self.tmp / "parallel/replay-timings.json").read_text(encoding="utf-8"))
+        self.assertEqual(timings["workers"], 3)
+        self.assertEqual(set(timings["phases_seconds"]), {"discover", "read", "evaluate", "report"})
+
+
+if __name__ == "__main__":
+    unittest.main()
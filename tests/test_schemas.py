@@ -0,0 +1,48 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from jsonschema import ValidationError
+
+from cts.schemas import SchemaRegistry, shared_registry
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class SchemaRegistryTests(unittest.TestCase):
+    def test_relative_ref_resolves_against_schema_location(self):
+        registry = SchemaRegistry()
+        registry.validate({"error": "not_found", "message": "no such entity"}, "schemas/error.schema.json")
+        with self.assertRaises(ValidationError) as cm:
+            registry.validate({"error": "nope"}, "schemas/error.schema.json")
+        self.assertIn("'message' is a required property", str(cm.exception))
+
+    def test_relative_ref_resolves_against_relative_id(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "defs").mkdir()
+            (root / "defs/name.schema.json").write_text(json.dumps({"type": "string", "minLength": 2}))
+            (root / "entry.schema.json").write_text(json.dumps({
+                "$schema": "https://json-schema.org/draft/2020-12/schema",
+                "$id": "entry.schema.json",
+                "properties": {"name": {"$ref": "defs/name.schema.json"}},
+            }))
+            registry = SchemaRegistry(root)
+            registry.validate({"name": "ok"}, root / "entry.schema.json")
+            with self.assertRaises(ValidationError):
+                registry.validate({"name": "x"}, root / "entry.schema.json")
+            self.assertEqual(registry.schema(root / "entry.schema.json")["$id"], "entry.schema.json")
+
+    def test_validators_are_compiled_once(self):
+        registry = SchemaRegistry()
+        first = registry.validator("schemas/authz_response.schema.json")
+        self.assertIs(first, registry.validator(ROOT / "schemas/authz_response.schema.json"))
+        self.assertEqual(registry.compile_all(), len(list((ROOT / "schemas").rglob("*.json"))))
+
+    def test_shared_registry_is_process_wide(self):
+        self.assertIs(shared_registry(), shared_registry())
+
+
+if __name__ == "__main__":
+    unittest.main()
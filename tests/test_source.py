@@ -0,0 +1,103 @@
+import base64
+import json
+import unittest
+import zipfile
+from contextlib import redirect_stdout
+from io import StringIO
+
+from cts import run as cts_run
+from cts.plan import load_plan
+from cts.source import BundleSource, DirectorySource, EvidenceSource, open_evidence
+from cts.verify import load_public_key, verify_evidence, verify_many
+from tests.fixture_runs import ROOT, fixture_run, temp_dir, write_signing_setup, write_sut
+
+
+class EvidenceSourceTests(unittest.TestCase):
+    def test_readers_must_implement_the_whole_interface(self):
+        class Partial(EvidenceSource):
+            def names(self):
+                return []
+
+        with self.assertRaises(TypeError):
+            Partial(ROOT)
+
+
+class BundleSourceTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = temp_dir(self)
+        self.run_dir = fixture_run(self.tmp / "run", write_sut(self.tmp / "sut.yaml"))
+        self.bundle = self.run_dir / "bundle.zip"
+
+    def test_bundle_members_match_directory(self):
+        with DirectorySource(self.run_dir) as directory, open_evidence(self.bundle) as bundle:
+            self.assertIsInstance(bundle, BundleSource)
+            cases = directory.list("cases", ".json")
+            self.assertEqual(bundle.list("cases", ".json"), cases)
+            for rel in cases:
+                self.assertEqual(bundle.hash(rel), directory.hash(rel))
+            self.assertEqual(bundle.read_json("run.json"), directory.read_json("run.json"))
+            self.assertFalse(bundle.exists("bundle.zip"))
+
+    def test_replay_from_bundle_matches_directory(self):
+        plan = load_plan(ROOT / "profiles/baseline.yaml", use_cache=False)
+        reports = []
+        for source, name in ((self.run_dir, "from-dir"), (self.bundle, "from-zip")):
+            with redirect_stdout(StringIO()):
+                try:
+                    cts_run.run_replay(source, self.tmp / name, plan, "2026-01-15T00:00:00Z")
+                except SystemExit:
+                    pass  # failing verdicts exit 1 after the report is written
+            report = json.loads((self.tmp / name / "replay-report.json").read_text(encoding="utf-8"))
+            reports.append({k: v for k, v in report.items() if k not in ("replay_run_id", "replay_dir")})
+        self.assertEqual(reports[0], reports[1])
+        self.assertEqual(sorted(p.name for p in self.tmp.iterdir()), ["from-dir", "from-zip", "run", "sut.yaml"])
+
+    def test_verify_detects_tampered_member(self):
+        self.assertTrue(verify_evidence(self.bundle).ok)
+        self.assertTrue(verify_evidence(self.run_dir).ok)
+
+        tampered = self.tmp / "tampered.zip"
+        with zipfile.ZipFile(self.bundle) as src, zipfile.ZipFile(tampered, "w") as dst:
+            for info in src.infolist():
+                data = src.read(info)
+                if info.filename == "verdicts.json":
+                    data = data.replace(b'"PASS"', b'"FAIL"', 1)
+                dst.writestr(info, data)
+        report = verify_evidence(tampered)
+        self.assertFalse(report.ok)
+        self.assertEqual([m[0] for m in report.mismatched], ["verdicts.json (manifest.json)"])
+
+
+class BatchVerifyTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = temp_dir(self)
+        profile, sut, self.public_key = write_signing_setup(self.tmp)
+        self.runs = [fixture_run(self.tmp / "archive" / name, sut, profile=profile) for name in ("a", "b")]
+
+    def test_signatures_and_descriptor_index_are_verified(self):
+        report = verify_evidence(self.runs[0] / "bundle.zip", self.public_key, require_signature=True)
+        self.assertTrue(report.ok, report)
+        self.assertEqual(report.signatures, [("manifest.sig", "valid")])
+        self.assertEqual(verify_evidence(self.runs[0]).signatures, [("manifest.sig", "unverified")])
+        self.assertFalse(verify_evidence(self.runs[0], bytes(32)).ok)
+
+        descriptor_path = self.runs[1] / "bundle_descriptor.json"
+        descriptor = json.loads(descriptor_path.read_text(encoding="utf-8"))
+        entry = next(e for e in descriptor["artifact_index"] if e["path"] == "verdicts.json")
+        entry["sha256"] = "0" * 64
+        descriptor_path.write_text(json.dumps(descriptor, indent=2), encoding="utf-8")
+        reports, _ = verify_many(self.runs, workers=2, public_key=self.public_key)
+        self.assertEqual([r.ok for r in reports], [True, False])
+        self.assertIn("verdicts.json (bundle_descriptor.json)", [m[0] for m in reports[1].mismatched])
+
+    def test_public_key_formats(self):
+        der = bytes.fromhex("302a300506032b6570032100") + self.public_key
+        pem = "-----BEGIN PUBLIC KEY-----\n" + base64.b64encode(der).decode() + "\n-----END PUBLIC KEY-----\n"
+        for name, data in (("key.pem", pem.encode()), ("key.b64", base64.b64encode(self.public_key)),
+                           ("key.raw", self.public_key)):
+            (self.tmp / name).write_bytes(data)
+            self.assertEqual(load_public_key(self.tmp / name), self.public_key, name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Cumulative `-X importtime` budget for `import cts.run`; override on slow CI hosts.
+BUDGET_US = int(os.environ.get("CTS_STARTUP_BUDGET_MS", "150")) * 1000
+
+HEAVY = {"requests", "urllib3", "httpx", "nacl", "asyncio"}
+
+
+def _importtime(args: list[str], env: dict) -> dict[str, int]:
+    """Run python -X importtime and return {module: cumulative import microseconds}."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=ROOT, env=env,
+                          capture_output=True, text=True, check=True)
+    out = {}
+    for line in proc.stderr.splitlines():
+        m = re.match(r"import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)$", line)
+        if m:
+            out[m.group(3)] = int(m.group(1))
+    return out
+
+
+class StartupTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.env = {**os.environ, "CTS_PLAN_CACHE_DIR": str(self.tmp / "cache")}
+        sut = self.tmp / "sut.yaml"
+        sut.write_text("base_url: http://127.0.0.1:9\n", encoding="utf-8")
+        self.base = ["cts/run.py", "--profile", "profiles/baseline.yaml", "--sut", str(sut)]
+
+    def test_list_tests_skips_heavy_imports(self):
+        argv = [*self.base, "--out", str(self.tmp / "out"), "--list-tests"]
+        _importtime(argv, self.env)  # warm the plan cache
+        loaded = _importtime(argv, self.env)
+        self.assertFalse((HEAVY | {"yaml", "jsonschema"}) & loaded.keys(), sorted(loaded))
+
+    def test_fixture_run_skips_network_and_signing(self):
+        loaded = _importtime([*self.base, "--out", str(self.tmp / "out"),
+                              "--fixture-set", "fixtures/baseline.fixture-set.json"], self.env)
+        self.assertFalse(HEAVY & loaded.keys(), sorted(loaded))
+
+    def test_import_budget(self):
+        cumulative = _importtime(["-c", "import cts.run"], self.env)["cts.run"]
+        self.assertLess(cumulative, BUDGET_US, f"import cts.run took {cumulative / 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    unittest.main()